@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""Generate many Guardian reports (presets x seeds x overrides) in one process tree.
+
+The git state and environment are captured once and shared by every report,
+modules are imported once (workers are forked from this process and reuse
+their in-memory caches across jobs), and an optional ``--cache_dir`` shares
+simulation outputs between jobs.  Each report folder carries a unique
+``<preset>_s<seed>_v<variant>`` suffix, and ``index_<timestamp>.json`` in
+the output root lists every report of the batch.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+try:  # pragma: no cover
+    from scripts import generate_report as gr
+except ModuleNotFoundError:  # pragma: no cover
+    ROOT = Path(__file__).resolve().parents[1]
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    from scripts import generate_report as gr
+
+
+@dataclass
+class ReportJob:
+    """One report of a batch: a preset, an experimental seed and parameter overrides."""
+
+    preset: str
+    seed: int
+    variant: int = 0
+    overrides: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def label(self) -> str:
+        return f"{self.preset}_s{self.seed}_v{self.variant}"
+
+
+def expand_jobs(
+    presets: Sequence[str],
+    seeds: Sequence[int],
+    overrides: Optional[Sequence[Dict[str, Any]]] = None,
+) -> List[ReportJob]:
+    """Cartesian product of presets, seeds and override sets (``[{}]`` by default)."""
+
+    unknown = sorted(set(presets) - set(gr.PRESETS))
+    if unknown:
+        raise ValueError(f"unknown presets: {unknown}")
+    variants = list(overrides) if overrides else [{}]
+    return [
+        ReportJob(preset=preset, seed=int(seed), variant=k, overrides=dict(variant))
+        for preset, seed, (k, variant) in itertools.product(presets, seeds, enumerate(variants))
+    ]
+
+
+def _job_args(job: ReportJob, options: Dict[str, Any]) -> argparse.Namespace:
+    args = gr._build_parser().parse_args(["--preset", job.preset, "--seed", str(job.seed)])
+    args.overrides = job.overrides
+    for key, value in options.items():
+        setattr(args, key, value)
+    return args
+
+
+def _run_job(job: ReportJob, options: Dict[str, Any], context: gr.RunContext) -> Dict[str, Any]:
+    entry: Dict[str, Any] = {**asdict(job), "label": job.label}
+    try:
+        report_dir = gr.generate_report(_job_args(job, options), context=context, label=job.label)
+    except Exception as exc:  # one failing report must not abort the batch
+        entry.update(status="error", error=f"{type(exc).__name__}: {exc}")
+        return entry
+    guardian = json.loads((report_dir / "guardian.json").read_text(encoding="utf-8"))
+    entry.update(
+        status="ok",
+        report_dir=str(report_dir),
+        guardian_pass={name: bool(metric["pass"]) for name, metric in guardian["metrics"].items()},
+    )
+    return entry
+
+
+def run_batch(
+    jobs: Sequence[ReportJob],
+    outdir: Path,
+    max_workers: Optional[int] = None,
+    results_format: str = "none",
+    cache_dir: Optional[Path] = None,
+    context: Optional[gr.RunContext] = None,
+) -> Path:
+    """Generate every report of ``jobs`` and return the path of the batch index.
+
+    ``max_workers=0`` runs the jobs sequentially in this process.  Figures are
+    rendered in-process by each worker, as the pool already uses the cores.
+    """
+
+    outdir = Path(outdir)
+    outdir.mkdir(parents=True, exist_ok=True)
+    context = context or gr.run_context()
+    options = {
+        "outdir": outdir,
+        "results_format": results_format,
+        "cache_dir": cache_dir,
+        "render_workers": 0,
+    }
+    if max_workers == 0:
+        entries = [_run_job(job, options, context) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            entries = list(pool.map(_run_job, jobs, itertools.repeat(options), itertools.repeat(context)))
+
+    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    index = {
+        "timestamp": timestamp,
+        "git": {"sha": context.git_sha, "short": context.git_short, "clean": context.git_clean},
+        "environment": context.environment,
+        "n_reports": len(entries),
+        "n_failed": sum(entry["status"] != "ok" for entry in entries),
+        "reports": entries,
+    }
+    index_path = outdir / f"index_{timestamp}.json"
+    index_path.write_text(json.dumps(index, indent=2), encoding="utf-8")
+    return index_path
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Generate Guardian reports for presets x seeds x parameter overrides",
+    )
+    parser.add_argument(
+        "--presets",
+        nargs="+",
+        default=["default"],
+        choices=sorted(gr.PRESETS),
+        help="Named parameter presets",
+    )
+    parser.add_argument("--seeds", nargs="+", type=int, required=True, help="Experimental seeds")
+    parser.add_argument(
+        "--overrides",
+        type=Path,
+        help="JSON file with a list of parameter override objects (one report per entry)",
+    )
+    parser.add_argument(
+        "--outdir",
+        type=Path,
+        default=Path("artifacts/reports"),
+        help="Root directory for report artifacts and the batch index",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: one per CPU; 0 runs in-process)",
+    )
+    parser.add_argument(
+        "--results_format",
+        type=str,
+        default="none",
+        choices=["auto", "none", *gr.RESULT_FORMATS],
+        help="Opt-in columnar copy of each report's results (see generate_report.py)",
+    )
+    parser.add_argument(
+        "--cache_dir",
+        type=Path,
+        nargs="?",
+        const=gr.DEFAULT_CACHE_DIR,
+        default=None,
+        help=f"Share simulation outputs through an on-disk cache (default dir: {gr.DEFAULT_CACHE_DIR})",
+    )
+    return parser
+
+
+def main() -> int:
+    args = _build_parser().parse_args()
+    overrides = None
+    if args.overrides:
+        overrides = json.loads(args.overrides.read_text(encoding="utf-8"))
+        if not isinstance(overrides, list):
+            raise SystemExit("--overrides must contain a JSON list of objects")
+    jobs = expand_jobs(args.presets, args.seeds, overrides)
+    index_path = run_batch(
+        jobs,
+        args.outdir,
+        max_workers=args.workers,
+        results_format=args.results_format,
+        cache_dir=args.cache_dir,
+    )
+    index = json.loads(index_path.read_text(encoding="utf-8"))
+    print(json.dumps({"index": str(index_path), "n_reports": index["n_reports"], "n_failed": index["n_failed"]}, indent=2))
+    return 1 if index["n_failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
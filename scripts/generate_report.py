@@ -1,5 +1,10 @@
 #!/usr/bin/env python3
-"""Generate Guardian-compliant simulation reports (Phase 1 standard)."""
+"""Generate Guardian-compliant simulation reports (Phase 1 standard).
+
+matplotlib, scipy.stats and the spectral/Allan analysis modules are imported
+in the code paths that use them, so ``--help`` and argument errors return
+without loading them.
+"""
 
 from __future__ import annotations
 
@@ -9,23 +14,25 @@ import platform
 import subprocess
 import sys
 import textwrap
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Tuple
-
-import matplotlib
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.backends.backend_pdf import PdfPages
-import scipy
-from scipy import signal, stats
+
+if TYPE_CHECKING:  # pragma: no cover
+    import matplotlib.figure
 
 try:  # pragma: no cover - fallback for editable installs
     from simulation.background_effects_simulator import (
         BackgroundConfig,
-        simulate_background_timeseries,
+        simulate_background_pair,
+    )
+    from simulation.result_cache import (
+        DEFAULT_CACHE_DIR,
+        SimulationCache,
+        cached_simulate_background_timeseries,
     )
 except ModuleNotFoundError:  # pragma: no cover
     ROOT = Path(__file__).resolve().parents[1]
@@ -34,17 +41,42 @@ except ModuleNotFoundError:  # pragma: no cover
         sys.path.insert(0, str(SRC))
     from simulation.background_effects_simulator import (
         BackgroundConfig,
-        simulate_background_timeseries,
+        simulate_background_pair,
+    )
+    from simulation.result_cache import (
+        DEFAULT_CACHE_DIR,
+        SimulationCache,
+        cached_simulate_background_timeseries,
     )
 
 try:  # pragma: no cover
+    from scripts.results_io import (
+        FORMATS as RESULT_FORMATS,
+        NPY_DIRNAME,
+        NPZ_FILENAME,
+        resolve_format,
+        write_results,
+    )
+    from scripts.render_pool import FigureTask, minmax_envelope, render_tasks
+    from scripts.report_catalog import record_report
     from scripts.util_hashes import write_manifest
 except ModuleNotFoundError:  # pragma: no cover
     ROOT = Path(__file__).resolve().parents[1]
     if str(ROOT) not in sys.path:
         sys.path.insert(0, str(ROOT))
+    from scripts.results_io import (
+        FORMATS as RESULT_FORMATS,
+        NPY_DIRNAME,
+        NPZ_FILENAME,
+        resolve_format,
+        write_results,
+    )
+    from scripts.render_pool import FigureTask, minmax_envelope, render_tasks
+    from scripts.report_catalog import record_report
     from scripts.util_hashes import write_manifest
 
+PSD_NPERSEG = 4096
+
 PRESETS: Dict[str, Dict[str, Any]] = {
     "default": {
         "T": 300.0,
@@ -79,6 +111,17 @@ PRESETS: Dict[str, Dict[str, Any]] = {
 }
 
 
+def _pyplot():
+    """Import pyplot on first use, with the non-interactive Agg backend."""
+
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
 def _apply_watermark(fig: matplotlib.figure.Figure, text: str = "SIMULATION") -> None:
     fig.text(
         0.99,
@@ -93,29 +136,12 @@ def _apply_watermark(fig: matplotlib.figure.Figure, text: str = "SIMULATION") ->
     )
 
 
-def _welch_psd(y: np.ndarray, dt: float) -> Tuple[np.ndarray, np.ndarray]:
-    freqs, psd = signal.welch(y, fs=1.0 / dt, nperseg=min(len(y), 4096))
-    mask = freqs > 0
-    return freqs[mask], psd[mask]
+def _welch_psd(traces: np.ndarray, dt: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Welch PSDs of all rows of ``traces`` in one batched call (DC bin included)."""
 
+    from simulation.analysis.spectral import welch_psd_batch
 
-def _allan_like(x: np.ndarray, dt_s: float) -> Tuple[np.ndarray, np.ndarray]:
-    if len(x) < 2:
-        taus = np.array([dt_s])
-        allan = np.array([np.nan])
-    else:
-        taus = np.logspace(np.log10(10 * dt_s), np.log10(len(x) * dt_s / 5.0), 30)
-        allan = []
-        for tau in taus:
-            m = max(1, int(tau / dt_s))
-            blocks = len(x) // m
-            if blocks < 2:
-                allan.append(np.nan)
-                continue
-            means = np.mean(x[: blocks * m].reshape(blocks, m), axis=1)
-            allan.append(0.5 * np.mean(np.diff(means) ** 2))
-        allan = np.array(allan)
-    return taus, allan
+    return welch_psd_batch(traces, dt, nperseg=PSD_NPERSEG)
 
 
 def _cohens_d(exp: np.ndarray, null: np.ndarray) -> float:
@@ -133,6 +159,8 @@ def _cohens_d(exp: np.ndarray, null: np.ndarray) -> float:
 def _cohens_d_ci(d: float, n1: int, n2: int, alpha: float = 0.05) -> Tuple[float, float]:
     if np.isnan(d) or n1 < 2 or n2 < 2:
         return float("nan"), float("nan")
+    from scipy import stats
+
     se = np.sqrt((n1 + n2) / (n1 * n2) + (d**2) / (2 * (n1 + n2 - 2)))
     z = stats.norm.ppf(1 - alpha / 2)
     return d - z * se, d + z * se
@@ -161,6 +189,36 @@ def _git_state(repo: Path) -> Tuple[str, str, bool]:
     return sha, short, clean
 
 
+@dataclass(frozen=True)
+class RunContext:
+    """Provenance shared by every report of a process (git state and environment)."""
+
+    git_sha: str
+    git_short: str
+    git_clean: bool
+    environment: Dict[str, Any]
+
+
+def run_context(repo_root: Optional[Path] = None) -> RunContext:
+    """Capture the git state and environment once; batch runs reuse the result."""
+
+    import matplotlib
+    import scipy
+
+    repo_root = repo_root or Path(__file__).resolve().parents[1]
+    git_sha, git_short, git_clean = _git_state(repo_root)
+    environment = {
+        "python": sys.version.replace("\n", " "),
+        "platform": platform.platform(),
+        "packages": {
+            "numpy": np.__version__,
+            "scipy": scipy.__version__,
+            "matplotlib": matplotlib.__version__,
+        },
+    }
+    return RunContext(git_sha, git_short, git_clean, environment)
+
+
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Generate a paired experimental/null simulation report",
@@ -213,6 +271,28 @@ def _build_parser() -> argparse.ArgumentParser:
         default=Path("artifacts/reports"),
         help="Root directory for report artifacts",
     )
+    parser.add_argument(
+        "--results_format",
+        type=str,
+        default="none",
+        choices=["auto", "none", *RESULT_FORMATS],
+        help="Opt-in columnar copy of results.npz next to the always-written results/ npy dir "
+        "(default: none; auto: parquet if pyarrow is installed)",
+    )
+    parser.add_argument(
+        "--cache_dir",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_CACHE_DIR,
+        default=None,
+        help=f"Reuse simulation outputs from an on-disk cache (default dir: {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--render_workers",
+        type=int,
+        default=0,
+        help="Processes for figure rendering (default 0: in-process; N > 0 uses a pool of up to N workers)",
+    )
     return parser
 
 
@@ -221,6 +301,7 @@ def _resolve_params(args: argparse.Namespace) -> Dict[str, Any]:
     if args.params:
         overrides = json.loads(Path(args.params).read_text(encoding="utf-8"))
         params.update(overrides)
+    params.update(getattr(args, "overrides", None) or {})
     for key in [
         "T",
         "rf_rms",
@@ -246,20 +327,30 @@ def _resolve_params(args: argparse.Namespace) -> Dict[str, Any]:
     return params
 
 
-def _run_background(cfg: BackgroundConfig, n_samples: int, dt: float, seed: int) -> Dict[str, Any]:
-    data = simulate_background_timeseries(
-        n_samples=n_samples,
-        dt_s=dt,
-        cfg=cfg,
-        seed=seed,
-    )
-    return data
+def _run_background_pair(
+    cfg: BackgroundConfig,
+    n_samples: int,
+    dt: float,
+    seed: int,
+    null_seed: int,
+    cache: Optional[SimulationCache] = None,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Experimental and null datasets; the null shares arrays instead of copying them."""
+
+    if cache is None:
+        return simulate_background_pair(n_samples, dt, cfg, seed=seed, null_seed=null_seed)
+    experimental = cached_simulate_background_timeseries(n_samples, dt, cfg, seed, cache=cache)
+    null_base = cached_simulate_background_timeseries(n_samples, dt, cfg, null_seed, cache=cache)
+    return experimental, _make_null_variant(null_base)
 
 
 def _make_null_variant(data: Dict[str, Any]) -> Dict[str, Any]:
-    null_data = {key: np.copy(value) if isinstance(value, np.ndarray) else value for key, value in data.items()}
+    """Physics-disabled view of ``data``: zero position and heating, other channels shared."""
+
+    null_data = dict(data)
     if "position" in null_data:
-        null_data["position"] = np.zeros_like(null_data["position"])
+        position = null_data["position"]
+        null_data["position"] = np.broadcast_to(np.zeros((), dtype=position.dtype), position.shape)
     null_data["heating_rate"] = 0.0
     return null_data
 
@@ -278,18 +369,26 @@ def _save_time_series_plot(
     null_counts: np.ndarray,
     signal_wave: np.ndarray,
 ) -> None:
+    # Min/max envelopes keep the drawn extent of every pixel column while
+    # bounding the number of line vertices independently of n_samples.
+    t_env, null_env = minmax_envelope(time_s, null_counts)
+    _, exp_env = minmax_envelope(time_s, exp_counts)
+    _, delta_env = minmax_envelope(time_s, exp_counts - null_counts)
+    _, signal_env = minmax_envelope(time_s, signal_wave)
+
+    plt = _pyplot()
     fig, axes = plt.subplots(3, 1, figsize=(10, 8), sharex=True)
-    axes[0].plot(time_s, null_counts, label="Null", color="#1f77b4")
-    axes[0].plot(time_s, exp_counts, label="Experimental", color="#d62728", alpha=0.8)
+    axes[0].plot(t_env, null_env, label="Null", color="#1f77b4")
+    axes[0].plot(t_env, exp_env, label="Experimental", color="#d62728", alpha=0.8)
     axes[0].set_ylabel("Counts")
     axes[0].legend()
     axes[0].set_title("Detector counts")
 
-    axes[1].plot(time_s, exp_counts - null_counts, color="#2ca02c")
+    axes[1].plot(t_env, delta_env, color="#2ca02c")
     axes[1].set_ylabel("Δ Counts")
     axes[1].set_title("Experimental - Null")
 
-    axes[2].plot(time_s, signal_wave, color="#9467bd")
+    axes[2].plot(t_env, signal_env, color="#9467bd")
     axes[2].set_ylabel("Injected")
     axes[2].set_xlabel("Time [s]")
     axes[2].set_title("Injected signal")
@@ -300,9 +399,14 @@ def _save_time_series_plot(
     plt.close(fig)
 
 
-def _save_psd_plot(path: Path, dt: float, exp_counts: np.ndarray, null_counts: np.ndarray) -> None:
-    exp_freqs, exp_psd = _welch_psd(exp_counts - np.mean(exp_counts), dt)
-    null_freqs, null_psd = _welch_psd(null_counts - np.mean(null_counts), dt)
+def _save_psd_plot(
+    path: Path,
+    exp_freqs: np.ndarray,
+    exp_psd: np.ndarray,
+    null_freqs: np.ndarray,
+    null_psd: np.ndarray,
+) -> None:
+    plt = _pyplot()
     fig, ax = plt.subplots(figsize=(10, 4))
     ax.loglog(null_freqs, null_psd, label="Null")
     ax.loglog(exp_freqs, exp_psd, label="Experimental", alpha=0.8)
@@ -317,12 +421,17 @@ def _save_psd_plot(path: Path, dt: float, exp_counts: np.ndarray, null_counts: n
     plt.close(fig)
 
 
-def _save_allan_plot(path: Path, dt: float, exp_counts: np.ndarray, null_counts: np.ndarray) -> None:
-    taus_e, allan_e = _allan_like(exp_counts, dt)
-    taus_n, allan_n = _allan_like(null_counts, dt)
+def _save_allan_plot(
+    path: Path,
+    exp_taus: np.ndarray,
+    exp_allan: np.ndarray,
+    null_taus: np.ndarray,
+    null_allan: np.ndarray,
+) -> None:
+    plt = _pyplot()
     fig, ax = plt.subplots(figsize=(10, 4))
-    ax.loglog(taus_n, allan_n, label="Null")
-    ax.loglog(taus_e, allan_e, label="Experimental", alpha=0.8)
+    ax.loglog(null_taus, null_allan, label="Null")
+    ax.loglog(exp_taus, exp_allan, label="Experimental", alpha=0.8)
     ax.set_xlabel("Tau [s]")
     ax.set_ylabel("Allan-like var")
     ax.set_title("Allan-like drift")
@@ -353,6 +462,9 @@ def _generate_pdf(report_path: Path, guardian: Dict[str, Any], metadata: Dict[st
         f"  Platform: {metadata['environment']['platform']}",
         f"  Packages: numpy={metadata['environment']['packages']['numpy']}, scipy={metadata['environment']['packages']['scipy']}, matplotlib={metadata['environment']['packages']['matplotlib']}",
     ]
+    plt = _pyplot()
+    from matplotlib.backends.backend_pdf import PdfPages
+
     with PdfPages(report_path) as pdf:
         fig, ax = plt.subplots(figsize=(8.27, 11.69))
         ax.axis("off")
@@ -369,7 +481,78 @@ def _generate_pdf(report_path: Path, guardian: Dict[str, Any], metadata: Dict[st
         plt.close(fig)
 
 
-def generate_report(args: argparse.Namespace) -> Path:
+def _figure_tasks(
+    report_dir: Path,
+    dt: float,
+    results: Dict[str, np.ndarray],
+    spectra: Tuple[np.ndarray, np.ndarray],
+    guardian: Dict[str, Any],
+    metadata: Dict[str, Any],
+) -> Tuple[List[FigureTask], Dict[str, np.ndarray]]:
+    """Precompute the Allan curves and return figure tasks plus their shared arrays.
+
+    ``spectra`` holds the frequency grid and the experimental/null PSD rows.
+    """
+
+    from simulation.analysis.allan import allan_variance
+
+    exp_counts = results["experimental_counts"]
+    null_counts = results["null_counts"]
+    arrays = {key: results[key] for key in ("time_s", "experimental_counts", "null_counts", "signal_wave")}
+    freqs, psd = spectra
+    positive = freqs > 0
+    arrays["exp_freqs"] = arrays["null_freqs"] = freqs[positive]
+    arrays["exp_psd"], arrays["null_psd"] = psd[0, positive], psd[1, positive]
+    exp_allan = allan_variance(exp_counts, dt, overlapping=False)
+    null_allan = allan_variance(null_counts, dt, overlapping=False)
+    arrays["exp_taus"], arrays["exp_allan"] = exp_allan.taus, exp_allan.variance
+    arrays["null_taus"], arrays["null_allan"] = null_allan.taus, null_allan.variance
+
+    tasks = [
+        FigureTask(
+            _save_time_series_plot,
+            report_dir / "detector_time_series.png",
+            arrays={
+                "time_s": "time_s",
+                "exp_counts": "experimental_counts",
+                "null_counts": "null_counts",
+                "signal_wave": "signal_wave",
+            },
+        ),
+        FigureTask(
+            _save_psd_plot,
+            report_dir / "detector_psd.png",
+            arrays={key: key for key in ("exp_freqs", "exp_psd", "null_freqs", "null_psd")},
+        ),
+        FigureTask(
+            _save_allan_plot,
+            report_dir / "detector_allan.png",
+            arrays={key: key for key in ("exp_taus", "exp_allan", "null_taus", "null_allan")},
+        ),
+        FigureTask(
+            _generate_pdf,
+            report_dir / "report.pdf",
+            kwargs={"guardian": guardian, "metadata": metadata},
+        ),
+    ]
+    return tasks, arrays
+
+
+def generate_report(
+    args: argparse.Namespace,
+    context: Optional[RunContext] = None,
+    label: Optional[str] = None,
+) -> Path:
+    """Write one report folder and return its path.
+
+    ``args.overrides`` (a dict) is applied after the ``--params`` file.  A
+    precomputed ``context`` skips the git subprocesses, and ``label`` is
+    appended to the folder name so concurrent reports never collide.
+    """
+
+    from scipy import stats
+    from simulation.analysis.spectral import mains_line_summary
+
     params = _resolve_params(args)
 
     cfg = BackgroundConfig(
@@ -390,9 +573,9 @@ def generate_report(args: argparse.Namespace) -> Path:
     signal_level = float(params["signal_level"])
     signal_freq = float(params["signal_freq"])
 
-    experimental = _run_background(cfg, n_samples, dt, seed)
-    null_base = _run_background(cfg, n_samples, dt, null_seed)
-    null_data = _make_null_variant(null_base)
+    cache_dir = getattr(args, "cache_dir", None)
+    cache = SimulationCache(cache_dir) if cache_dir is not None else None
+    experimental, null_data = _run_background_pair(cfg, n_samples, dt, seed, null_seed, cache)
 
     time_s = np.arange(n_samples, dtype=float) * dt
     exp_counts_raw = experimental["detector_counts"].astype(float)
@@ -410,6 +593,17 @@ def generate_report(args: argparse.Namespace) -> Path:
         / (np.std(null_counts - expected_counts) + 1e-12)
     )
 
+    spectra = _welch_psd(np.stack([experimental_counts, null_counts]), dt)
+    line_power, floor = mains_line_summary(*spectra, mains_hz=float(params["mains"]))
+    spectral = {
+        label: {
+            # Harmonics above Nyquist are nan; JSON has no NaN, so they become null.
+            "mains_line_power": [float(v) if np.isfinite(v) else None for v in line_power[row]],
+            "broadband_floor_per_hz": float(floor[row]),
+        }
+        for row, label in enumerate(("experimental", "null"))
+    }
+
     d = _cohens_d(experimental_counts, null_counts)
     ci_low, ci_high = _cohens_d_ci(d, len(experimental_counts), len(null_counts))
 
@@ -440,28 +634,19 @@ def generate_report(args: argparse.Namespace) -> Path:
         },
     }
 
-    repo_root = Path(__file__).resolve().parents[1]
-    git_sha, git_short, git_clean = _git_state(repo_root)
+    context = context or run_context()
+    git_sha, git_short, git_clean = context.git_sha, context.git_short, context.git_clean
     timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    report_dir = args.outdir / f"{timestamp}_{git_short}"
+    report_name = f"{timestamp}_{git_short}" + (f"_{label}" if label else "")
+    report_dir = args.outdir / report_name
     report_dir.mkdir(parents=True, exist_ok=True)
 
-    environment = {
-        "python": sys.version.replace("\n", " "),
-        "platform": platform.platform(),
-        "packages": {
-            "numpy": np.__version__,
-            "scipy": scipy.__version__,
-            "matplotlib": matplotlib.__version__,
-        },
-    }
-
     metadata = {
         "timestamp": timestamp,
         "preset": args.preset,
         "params": params,
         "git": {"sha": git_sha, "short": git_short, "clean": git_clean},
-        "environment": environment,
+        "environment": context.environment,
         "seeds": {"experimental": seed, "null": null_seed},
         "paths": {"root": str(report_dir)},
     }
@@ -473,34 +658,31 @@ def generate_report(args: argparse.Namespace) -> Path:
         json.dumps(guardian, indent=2), encoding="utf-8"
     )
 
-    np.savez(
-        report_dir / "results.npz",
-        time_s=time_s,
-        experimental_counts=experimental_counts,
-        null_counts=null_counts,
-        signal_wave=signal_wave,
-        experimental_position=experimental["position"],
-        null_position=null_data["position"],
-        experimental_em=experimental["em_pickup"],
-        null_em=null_data["em_pickup"],
-        experimental_surface=experimental["surface_drift"],
-        null_surface=null_data["surface_drift"],
-    )
-
-    _save_time_series_plot(
-        report_dir / "detector_time_series.png",
-        time_s,
-        experimental_counts,
-        null_counts,
-        signal_wave,
-    )
-    _save_psd_plot(report_dir / "detector_psd.png", dt, experimental_counts, null_counts)
-    _save_allan_plot(
-        report_dir / "detector_allan.png",
-        dt,
-        experimental_counts,
-        null_counts,
-    )
+    results = {
+        "time_s": time_s,
+        "experimental_counts": experimental_counts,
+        "null_counts": null_counts,
+        "signal_wave": signal_wave,
+        "experimental_position": experimental["position"],
+        "null_position": null_data["position"],
+        "experimental_em": experimental["em_pickup"],
+        "null_em": null_data["em_pickup"],
+        "experimental_surface": experimental["surface_drift"],
+        "null_surface": null_data["surface_drift"],
+    }
+    np.savez(report_dir / NPZ_FILENAME, **results)
+    results_meta = {
+        "timestamp": timestamp,
+        "preset": args.preset,
+        "git_sha": git_sha,
+        "seeds": metadata["seeds"],
+        "params": params,
+    }
+    # Uncompressed per-array copy for memory-mapped reads (see LazyResults).
+    write_results(report_dir / NPY_DIRNAME, results, metadata=results_meta, fmt="npy")
+    results_format = getattr(args, "results_format", "none")
+    if results_format != "none" and resolve_format(results_format) != "npy":
+        write_results(report_dir / "results", results, metadata=results_meta, fmt=results_format)
 
     code_state_path = report_dir / "code_state.txt"
     code_state_path.write_text(
@@ -516,8 +698,9 @@ def generate_report(args: argparse.Namespace) -> Path:
         encoding="utf-8",
     )
 
-    report_pdf = report_dir / "report.pdf"
-    _generate_pdf(report_pdf, guardian, metadata)
+    tasks, arrays = _figure_tasks(report_dir, dt, results, spectra, guardian, metadata)
+    render_workers: Optional[int] = getattr(args, "render_workers", 0)
+    render_tasks(tasks, arrays, max_workers=render_workers)
 
     manifest_path = write_manifest(report_dir)
 
@@ -525,10 +708,13 @@ def generate_report(args: argparse.Namespace) -> Path:
         "report_dir": str(report_dir),
         "sha256sum": str(manifest_path),
         "metrics": guardian["metrics"],
+        "spectral": spectral,
     }
     (report_dir / "summary.json").write_text(
         json.dumps(summary, indent=2), encoding="utf-8"
     )
+    # Catalogue last, so indexed queries only ever see complete reports.
+    record_report(report_dir, metadata, guardian)
 
     return report_dir
 
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""SQLite catalogue of the Guardian reports under one output root.
+
+``generate_report`` adds one row per finished report to
+``<outdir>/catalog.sqlite`` in a single transaction, so concurrent batch
+workers never leave a partial entry.  Rows record the report folder (relative
+to the root), timestamp, git SHA, preset, seeds and the key Guardian metrics;
+"latest", "latest passing" and "all reports for a preset" are indexed queries
+instead of directory scans.  A new catalogue is backfilled from the report
+folders already on disk, so upgrading a tree never hides older reports;
+``--rebuild`` re-indexes the folders from scratch.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+CATALOG_NAME = "catalog.sqlite"
+# Concurrent batch workers wait for each other's insert rather than failing.
+_BUSY_TIMEOUT_S = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    report_dir TEXT PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    git_sha TEXT,
+    git_clean INTEGER,
+    preset TEXT,
+    seed INTEGER,
+    null_seed INTEGER,
+    p_null REAL,
+    p_effect REAL,
+    effect_claimed INTEGER,
+    snr REAL,
+    cohens_d REAL,
+    passed INTEGER NOT NULL,
+    params TEXT
+);
+CREATE INDEX IF NOT EXISTS reports_by_time ON reports (timestamp, report_dir);
+CREATE INDEX IF NOT EXISTS reports_by_preset ON reports (preset, timestamp, report_dir);
+CREATE INDEX IF NOT EXISTS reports_by_pass ON reports (passed, timestamp, report_dir);
+"""
+
+_COLUMNS = (
+    "report_dir",
+    "timestamp",
+    "git_sha",
+    "git_clean",
+    "preset",
+    "seed",
+    "null_seed",
+    "p_null",
+    "p_effect",
+    "effect_claimed",
+    "snr",
+    "cohens_d",
+    "passed",
+    "params",
+)
+
+
+def guardian_passed(guardian: Mapping[str, Any]) -> bool:
+    """True when the null control is present and every metric passes."""
+
+    metrics = guardian.get("metrics", {})
+    return bool(guardian.get("null_control_present")) and all(
+        bool(metric.get("pass")) for metric in metrics.values()
+    )
+
+
+def catalog_row(report_dir: Path, metadata: Mapping[str, Any], guardian: Mapping[str, Any]) -> Dict[str, Any]:
+    """Catalogue row for one report folder (``report_dir`` stored by name)."""
+
+    metrics = guardian.get("metrics", {})
+    effect = metrics.get("effect", {})
+    seeds = metadata.get("seeds", {})
+    git = metadata.get("git", {})
+    return {
+        "report_dir": Path(report_dir).name,
+        "timestamp": metadata.get("timestamp", ""),
+        "git_sha": git.get("sha"),
+        "git_clean": None if git.get("clean") is None else int(bool(git["clean"])),
+        "preset": metadata.get("preset"),
+        "seed": seeds.get("experimental"),
+        "null_seed": seeds.get("null"),
+        "p_null": metrics.get("null", {}).get("p_value"),
+        "p_effect": effect.get("p_value"),
+        "effect_claimed": int(bool(effect.get("effect_claimed", False))),
+        "snr": metrics.get("snr", {}).get("value"),
+        "cohens_d": effect.get("cohens_d"),
+        "passed": int(guardian_passed(guardian)),
+        "params": json.dumps(metadata.get("params", {}), sort_keys=True),
+    }
+
+
+class ReportCatalog:
+    """Connection to the catalogue of report folders directly under ``root``."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.path = self.root / CATALOG_NAME
+        created = not self.path.exists()
+        self._conn = sqlite3.connect(self.path, timeout=_BUSY_TIMEOUT_S)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+        if created:
+            # Reports written before the catalogue existed; rows added
+            # concurrently by other writers are kept as they are.
+            self._insert(self._scan_rows(), "INSERT OR IGNORE")
+
+    @classmethod
+    def existing(cls, root: Path) -> Optional["ReportCatalog"]:
+        """Open the catalogue of ``root`` if one has been written, else ``None``."""
+
+        return cls(root) if (Path(root) / CATALOG_NAME).exists() else None
+
+    def add(self, report_dir: Path, metadata: Mapping[str, Any], guardian: Mapping[str, Any]) -> None:
+        self.add_rows([catalog_row(report_dir, metadata, guardian)])
+
+    def add_rows(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        """Insert or replace ``rows`` in one transaction."""
+
+        self._insert(rows, "INSERT OR REPLACE")
+
+    def _insert(self, rows: Iterable[Mapping[str, Any]], verb: str) -> None:
+        placeholders = ", ".join(f":{name}" for name in _COLUMNS)
+        with self._conn:
+            self._conn.executemany(
+                f"{verb} INTO reports ({', '.join(_COLUMNS)}) VALUES ({placeholders})",
+                list(rows),
+            )
+
+    def _scan_rows(self) -> List[Dict[str, Any]]:
+        """Catalogue rows for every report folder found under the root."""
+
+        rows = []
+        for guardian_path in sorted(self.root.glob("*/guardian.json")):
+            report_dir = guardian_path.parent
+            metadata_path = report_dir / "metadata.json"
+            metadata = json.loads(metadata_path.read_text(encoding="utf-8")) if metadata_path.exists() else {}
+            metadata.setdefault("timestamp", report_dir.name[:15])
+            guardian = json.loads(guardian_path.read_text(encoding="utf-8"))
+            rows.append(catalog_row(report_dir, metadata, guardian))
+        return rows
+
+    def rebuild(self) -> int:
+        """Replace the catalogue with every report folder found under the root."""
+
+        rows = self._scan_rows()
+        placeholders = ", ".join(f":{name}" for name in _COLUMNS)
+        with self._conn:
+            self._conn.execute("DELETE FROM reports")
+            self._conn.executemany(
+                f"INSERT INTO reports ({', '.join(_COLUMNS)}) VALUES ({placeholders})", rows
+            )
+        return len(rows)
+
+    def query(
+        self,
+        preset: Optional[str] = None,
+        passed: Optional[bool] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Rows newest first, optionally filtered by preset and Guardian outcome.
+
+        Rows whose report folder no longer exists are skipped and pruned.
+        """
+
+        clauses, values = [], []
+        if preset is not None:
+            clauses.append("preset = ?")
+            values.append(preset)
+        if passed is not None:
+            clauses.append("passed = ?")
+            values.append(int(passed))
+        sql = "SELECT * FROM reports"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp DESC, report_dir DESC"
+        rows, missing = [], []
+        for record in self._conn.execute(sql, values):
+            if limit is not None and len(rows) >= limit:
+                break
+            row = dict(record)
+            row["path"] = self.root / row["report_dir"]
+            if row["path"].is_dir():
+                rows.append(row)
+            else:
+                missing.append((row["report_dir"],))
+        if missing:
+            self._prune(missing)
+        return rows
+
+    def _prune(self, report_dirs: List[Tuple[str]]) -> None:
+        """Drop rows of deleted report folders; read-only catalogues are left as they are."""
+
+        try:
+            with self._conn:
+                self._conn.executemany("DELETE FROM reports WHERE report_dir = ?", report_dirs)
+        except sqlite3.OperationalError:
+            pass
+
+    def latest(self, preset: Optional[str] = None, passed: Optional[bool] = None) -> Optional[Path]:
+        """Folder of the newest matching report, or ``None``."""
+
+        rows = self.query(preset=preset, passed=passed, limit=1)
+        return rows[0]["path"] if rows else None
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "ReportCatalog":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def record_report(report_dir: Path, metadata: Mapping[str, Any], guardian: Mapping[str, Any]) -> Path:
+    """Add a finished report to the catalogue of its parent folder."""
+
+    with ReportCatalog(Path(report_dir).parent) as catalog:
+        catalog.add(report_dir, metadata, guardian)
+        return catalog.path
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Query the Guardian report catalogue")
+    parser.add_argument(
+        "root",
+        type=Path,
+        nargs="?",
+        default=Path("artifacts/reports"),
+        help="Root directory containing report folders",
+    )
+    parser.add_argument("--rebuild", action="store_true", help="Re-index every report folder on disk")
+    parser.add_argument("--preset", type=str, help="Only list reports of this preset")
+    parser.add_argument("--passing", action="store_true", help="Only list reports passing every Guardian check")
+    parser.add_argument("--limit", type=int, default=None, help="Maximum number of rows (newest first)")
+    return parser
+
+
+def main() -> int:
+    args = _build_parser().parse_args()
+    with ReportCatalog(args.root) as catalog:
+        if args.rebuild:
+            print(json.dumps({"catalog": str(catalog.path), "n_reports": catalog.rebuild()}, indent=2))
+            return 0
+        rows = catalog.query(preset=args.preset, passed=True if args.passing else None, limit=args.limit)
+    for row in rows:
+        row["path"] = str(row["path"])
+        row["params"] = json.loads(row["params"] or "{}")
+    print(json.dumps(rows, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
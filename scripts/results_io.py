@@ -0,0 +1,265 @@
+"""Columnar storage for simulation and report result arrays.
+
+Results are equal-length 1-D columns (time base, counts, channel traces) plus a
+JSON-serialisable metadata dictionary.  Three on-disk layouts are supported:
+
+``parquet``
+    Compressed columnar file; readers decode only the requested columns.
+``feather``
+    Uncompressed Arrow IPC file; columns are memory-mapped on read.
+``npy``
+    Directory with one ``<column>.npy`` per column plus ``_metadata.json``;
+    columns are opened with ``np.load(mmap_mode="r")``.
+
+Parquet and Feather require the optional ``pyarrow`` dependency; ``auto``
+picks Parquet when it is importable and falls back to the ``npy`` layout.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Union
+
+import numpy as np
+
+FORMATS = ("parquet", "feather", "npy")
+NPY_DIRNAME = "results"
+NPZ_FILENAME = "results.npz"
+METADATA_KEY = b"flyby.metadata"
+NPY_METADATA_FILE = "_metadata.json"
+_SUFFIXES = {"parquet": ".parquet", "feather": ".feather", "npy": ""}
+
+
+def have_pyarrow() -> bool:
+    """Return *True* when the optional ``pyarrow`` dependency is importable."""
+
+    try:
+        import pyarrow  # noqa: F401
+    except ModuleNotFoundError:
+        return False
+    return True
+
+
+def resolve_format(fmt: str) -> str:
+    """Map ``auto`` to a concrete format and check optional dependencies."""
+
+    if fmt == "auto":
+        return "parquet" if have_pyarrow() else "npy"
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown results format {fmt!r}; expected one of {FORMATS}")
+    if fmt != "npy" and not have_pyarrow():
+        raise ModuleNotFoundError(f"Writing {fmt} results requires the optional 'pyarrow' package")
+    return fmt
+
+
+def results_path(base: Path, fmt: str) -> Path:
+    """Return the on-disk path used for *base* in format *fmt*."""
+
+    return base.with_name(base.name + _SUFFIXES[resolve_format(fmt)])
+
+
+def detect_format(path: Path) -> str:
+    """Infer the layout of an existing results path."""
+
+    if path.is_dir():
+        return "npy"
+    if path.suffix == ".parquet":
+        return "parquet"
+    if path.suffix in {".feather", ".arrow"}:
+        return "feather"
+    raise ValueError(f"Cannot infer results format for {path}")
+
+
+def write_results(
+    base: Path,
+    columns: Mapping[str, np.ndarray],
+    metadata: Optional[Mapping[str, Any]] = None,
+    fmt: str = "auto",
+) -> Path:
+    """Write equal-length *columns* next to *base* and return the written path.
+
+    *base* carries no suffix; the format decides whether ``.parquet``,
+    ``.feather`` or a directory named *base* is produced.
+    """
+
+    fmt = resolve_format(fmt)
+    lengths = {np.shape(values)[0] for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError("All result columns must have the same length")
+    meta_json = json.dumps(dict(metadata or {}), default=str)
+    path = results_path(base, fmt)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if fmt == "npy":
+        # Build the directory beside the target and swap it in, so columns of
+        # an earlier write that are absent from this schema cannot linger.
+        tag = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        staging = path.with_name(f".{path.name}.tmp-{tag}")
+        staging.mkdir()
+        schema = {}
+        for name, values in columns.items():
+            arr = np.asarray(values)
+            np.save(staging / f"{name}.npy", arr, allow_pickle=False)
+            schema[name] = arr.dtype.str
+        (staging / NPY_METADATA_FILE).write_text(
+            json.dumps({"columns": schema, "metadata": json.loads(meta_json)}, indent=2),
+            encoding="utf-8",
+        )
+        if path.exists():
+            stale = path.with_name(f".{path.name}.old-{tag}")
+            path.rename(stale)
+            staging.rename(path)
+            shutil.rmtree(stale, ignore_errors=True)
+        else:
+            staging.rename(path)
+        return path
+
+    import pyarrow as pa
+
+    table = pa.table({name: np.asarray(values) for name, values in columns.items()})
+    table = table.replace_schema_metadata({METADATA_KEY: meta_json.encode("utf-8")})
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, path, compression="zstd")
+    else:
+        import pyarrow.feather as feather
+
+        # Uncompressed so readers can memory-map the column buffers directly.
+        feather.write_feather(table, path, compression="uncompressed")
+    return path
+
+
+def read_results(
+    path: Path,
+    columns: Optional[Iterable[str]] = None,
+    memory_map: bool = True,
+) -> Dict[str, np.ndarray]:
+    """Load the selected *columns* (all when *None*) from a results path.
+
+    Only the requested columns are read.  With *memory_map* the ``npy`` and
+    Feather layouts return arrays backed by the page cache instead of copies.
+    """
+
+    path = Path(path)
+    fmt = detect_format(path)
+    wanted = None if columns is None else list(columns)
+
+    if fmt == "npy":
+        names = wanted if wanted is not None else list(read_schema(path))
+        mode = "r" if memory_map else None
+        return {name: np.load(path / f"{name}.npy", mmap_mode=mode) for name in names}
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(path, columns=wanted, memory_map=memory_map)
+    else:
+        import pyarrow.feather as feather
+
+        table = feather.read_table(path, columns=wanted, memory_map=memory_map)
+    return {
+        name: table.column(name).to_numpy(zero_copy_only=False) for name in table.column_names
+    }
+
+
+def read_schema(path: Path) -> Dict[str, str]:
+    """Return ``{column: dtype string}`` without loading any column data."""
+
+    path = Path(path)
+    fmt = detect_format(path)
+    if fmt == "npy":
+        payload = json.loads((path / NPY_METADATA_FILE).read_text(encoding="utf-8"))
+        return dict(payload["columns"])
+    schema = _arrow_schema(path, fmt)
+    return {field.name: np.dtype(field.type.to_pandas_dtype()).str for field in schema}
+
+
+def read_metadata(path: Path) -> Dict[str, Any]:
+    """Return the metadata dictionary stored alongside the columns."""
+
+    path = Path(path)
+    fmt = detect_format(path)
+    if fmt == "npy":
+        payload = json.loads((path / NPY_METADATA_FILE).read_text(encoding="utf-8"))
+        return dict(payload.get("metadata", {}))
+    raw = (_arrow_schema(path, fmt).metadata or {}).get(METADATA_KEY, b"{}")
+    return json.loads(raw.decode("utf-8"))
+
+
+def _arrow_schema(path: Path, fmt: str):
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        return pq.read_schema(path)
+    import pyarrow as pa
+
+    with pa.memory_map(str(path)) as source:
+        return pa.ipc.open_file(source).schema
+
+
+class LazyResults(Mapping[str, np.ndarray]):
+    """Read-only mapping over an ``npy`` results directory.
+
+    Keys match the arrays of the companion ``results.npz``.  Nothing is read
+    on construction; each array is opened with ``np.load(mmap_mode=...)`` on
+    first access and cached, so only the pages actually touched are read.
+    """
+
+    def __init__(self, path: Path, mmap_mode: Optional[str] = "r") -> None:
+        self.path = Path(path)
+        self.mmap_mode = mmap_mode
+        self._schema = read_schema(self.path)
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    @property
+    def files(self) -> List[str]:
+        """Array names, mirroring :attr:`numpy.lib.npyio.NpzFile.files`."""
+
+        return list(self._schema)
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return read_metadata(self.path)
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        if key not in self._schema:
+            raise KeyError(key)
+        if key not in self._arrays:
+            self._arrays[key] = np.load(self.path / f"{key}.npy", mmap_mode=self.mmap_mode)
+        return self._arrays[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._schema)
+
+    def __len__(self) -> int:
+        return len(self._schema)
+
+    def close(self) -> None:
+        """Drop references to opened arrays so their mappings can be released."""
+
+        self._arrays.clear()
+
+    def __enter__(self) -> "LazyResults":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def open_report_results(report_dir: Path) -> Union[LazyResults, Mapping[str, np.ndarray]]:
+    """Open the arrays of a report folder lazily.
+
+    Prefers the memory-mapped ``results/`` directory and falls back to
+    ``results.npz`` for reports written before it existed.
+    """
+
+    report_dir = Path(report_dir)
+    npy_dir = report_dir / NPY_DIRNAME
+    if (npy_dir / NPY_METADATA_FILE).exists():
+        return LazyResults(npy_dir)
+    return np.load(report_dir / NPZ_FILENAME)
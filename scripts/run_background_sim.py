@@ -2,12 +2,22 @@
 """
 Run background-only simulation with user-selected parameters and save plots + a Guardian report.
 
-Outputs (written to artifacts/simulations/<timestamp>_*.{png,json}):
+Outputs (written to artifacts/simulations/<stamp>_*.{png,json}, where <stamp> is
+<timestamp>_s<seed>_<random suffix> so concurrent runs never collide):
   - <stamp>_time_series.png
   - <stamp>_psd.png
   - <stamp>_allan.png
   - <stamp>_guardian_report.json
   - <stamp>_config.json
+  - <stamp>_channels.{parquet,feather} or <stamp>_channels/ (with --results_format or --defer_render)
+
+Use ``--render none|summary|full`` to skip some or all figures, or
+``--defer_render`` to store the raw channels plus a render job and produce the
+figures later with ``--render_pending <outdir> [--render_workers N]``.
+
+matplotlib, the Guardian validators (scipy.stats) and the spectral/Allan
+analysis modules are imported in the code paths that use them, so ``--help``
+and ``--render none`` runs do not pay for loading unused dependencies.
 """
 
 import argparse
@@ -15,23 +25,25 @@ import json
 import textwrap
 import sys
 import time
+import uuid
 from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any, Dict
-
-import matplotlib
+from typing import Any, Dict, List, Tuple
 
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
 import numpy as np
 
 try:
     from simulation.background_effects_simulator import (
+        PRECISIONS,
         BackgroundConfig,
         simulate_background_timeseries,
     )
-    from simulation.guardian_validators.guardian_background_validator import (
-        guardian_check_backgrounds,
+    from simulation.result_cache import (
+        DEFAULT_CACHE_DIR,
+        SimulationCache,
+        cached_simulate_background_timeseries,
     )
 except ModuleNotFoundError:  # pragma: no cover - fallback when package isn't installed
     ROOT = Path(__file__).resolve().parents[1]
@@ -39,16 +51,42 @@ except ModuleNotFoundError:  # pragma: no cover - fallback when package isn't in
     if str(SRC) not in sys.path:
         sys.path.insert(0, str(SRC))
     from simulation.background_effects_simulator import (
+        PRECISIONS,
         BackgroundConfig,
         simulate_background_timeseries,
     )
-    from simulation.guardian_validators.guardian_background_validator import (
-        guardian_check_backgrounds,
+    from simulation.result_cache import (
+        DEFAULT_CACHE_DIR,
+        SimulationCache,
+        cached_simulate_background_timeseries,
     )
 
+try:  # pragma: no cover
+    from scripts.results_io import FORMATS as RESULT_FORMATS, read_results, write_results
+except ModuleNotFoundError:  # pragma: no cover
+    ROOT = Path(__file__).resolve().parents[1]
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    from scripts.results_io import FORMATS as RESULT_FORMATS, read_results, write_results
+
+CHANNELS = ("position", "em_pickup", "surface_drift", "detector_counts")
+PSD_NPERSEG = 4096
+PSD_BLOCK_SIZE = 1 << 20
+
 
 # ---------- plotting helpers ----------
 
+def _pyplot():
+    """Import pyplot on first use, with the non-interactive Agg backend."""
+
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
 def _plot_time_series(
     data: Dict[str, Any],
     show_pos: bool = True,
@@ -57,6 +95,7 @@ def _plot_time_series(
     show_det: bool = True,
     outpath: Path | None = None,
 ) -> None:
+    plt = _pyplot()
     plt.figure(figsize=(10, 4))
     if show_pos:
         plt.plot(data["position"], label="position")
@@ -77,12 +116,12 @@ def _plot_time_series(
 
 
 def _plot_psd_em(data: Dict[str, Any], dt_s: float, outpath: Path | None = None) -> None:
-    from numpy.fft import rfft, rfftfreq
+    from simulation.analysis.spectral import welch_psd
 
-    y = np.asarray(data["em_pickup"])
-    y = y - float(np.mean(y))
-    Y = np.abs(rfft(y)) ** 2
-    f = rfftfreq(len(y), dt_s)
+    plt = _pyplot()
+    # Welch estimate fed in blocks, so memory-mapped channels are streamed from disk.
+    y = data["em_pickup"]
+    f, Y = welch_psd(y, fs=1.0 / dt_s, nperseg=min(len(y), PSD_NPERSEG), block_size=PSD_BLOCK_SIZE)
     # avoid the DC bin for log scale
     f = f[1:]
     Y = Y[1:]
@@ -91,36 +130,21 @@ def _plot_psd_em(data: Dict[str, Any], dt_s: float, outpath: Path | None = None)
     plt.loglog(f, Y)
     plt.title("EM pickup PSD")
     plt.xlabel("Frequency [Hz]")
-    plt.ylabel("Power")
+    plt.ylabel("PSD [1/Hz]")
     plt.tight_layout()
     if outpath is not None:
         plt.savefig(outpath, dpi=180)
     plt.close()
 
 
-def _allan_like(x: np.ndarray, dt_s: float, taus: np.ndarray) -> np.ndarray:
-    out = []
-    for tau in taus:
-        m = max(1, int(tau / dt_s))
-        blocks = len(x) // m
-        if blocks < 2:
-            out.append(np.nan)
-            continue
-        means = np.mean(x[: blocks * m].reshape(blocks, m), axis=1)
-        out.append(0.5 * np.mean(np.diff(means) ** 2))
-    return np.array(out)
-
-
 def _plot_allan_like_surface(
     data: Dict[str, Any], dt_s: float, outpath: Path | None = None
 ) -> None:
-    y = np.asarray(data["surface_drift"])
-    if len(y) < 2:
-        taus = np.array([dt_s])
-        ad = np.array([np.nan])
-    else:
-        taus = np.logspace(np.log10(10 * dt_s), np.log10(len(y) * dt_s / 5.0), 30)
-        ad = _allan_like(y, dt_s, taus)
+    from simulation.analysis.allan import allan_variance
+
+    plt = _pyplot()
+    result = allan_variance(np.asarray(data["surface_drift"]), dt_s, overlapping=False)
+    taus, ad = result.taus, result.variance
 
     plt.figure(figsize=(10, 4))
     plt.loglog(taus, ad)
@@ -154,6 +178,166 @@ def _save_json(obj: Dict[str, Any], outpath: Path) -> None:
         json.dump(_json_compatible(obj), f, indent=2)
 
 
+# ---------- rendering ----------
+
+RENDER_FIGURES: Dict[str, Tuple[str, ...]] = {
+    "none": (),
+    "summary": ("time_series",),
+    "full": ("time_series", "psd", "allan"),
+}
+_FIGURE_TITLES = {
+    "time_series": "Time series",
+    "psd": "EM pickup PSD",
+    "allan": "Surface drift Allan-like variance",
+}
+RENDER_JOB_SUFFIX = "_render_job.json"
+
+
+def _figure_paths(outdir_p: Path, stamp: str, figures: Tuple[str, ...]) -> Dict[str, str]:
+    return {f"{name}_png": str(outdir_p / f"{stamp}_{name}.png") for name in figures}
+
+
+def _render_figures(
+    data: Mapping[str, Any],
+    dt_s: float,
+    outdir_p: Path,
+    stamp: str,
+    figures: Tuple[str, ...],
+    show: Tuple[bool, bool, bool, bool],
+) -> Dict[str, str]:
+    paths = _figure_paths(outdir_p, stamp, figures)
+    if "time_series" in figures:
+        _plot_time_series(data, *show, Path(paths["time_series_png"]))
+    if "psd" in figures:
+        _plot_psd_em(data, dt_s, Path(paths["psd_png"]))
+    if "allan" in figures:
+        _plot_allan_like_surface(data, dt_s, Path(paths["allan_png"]))
+    return paths
+
+
+def _write_overview(
+    outdir_p: Path, stamp: str, report: Dict[str, Any], figures: Tuple[str, ...]
+) -> Path:
+    panels = "".join(
+        f"""
+              <section class=\"panel\">
+                <h2>{_FIGURE_TITLES[name]}</h2>
+                <img src=\"{stamp}_{name}.png\" alt=\"{_FIGURE_TITLES[name]}\" />
+              </section>"""
+        for name in figures
+    )
+    overview_path = outdir_p / f"{stamp}_overview.html"
+    overview_path.write_text(
+        textwrap.dedent(
+            f"""
+            <!DOCTYPE html>
+            <html lang=\"en\">
+            <head>
+              <meta charset=\"utf-8\" />
+              <title>Flyby Background Simulation – {stamp}</title>
+              <style>
+                body {{ font-family: system-ui, sans-serif; margin: 1.5rem; }}
+                img {{ max-width: 100%; height: auto; border: 1px solid #ddd; padding: 0.5rem; background: #fafafa; }}
+                .panel {{ margin-bottom: 2rem; }}
+                pre {{ background: #f5f5f5; padding: 1rem; overflow: auto; }}
+              </style>
+            </head>
+            <body>
+              <h1>Background simulation snapshot – {stamp}</h1>
+              <section class=\"panel\">
+                <h2>Guardian summary</h2>
+                <pre>{json.dumps(_json_compatible(report), indent=2)}</pre>
+              </section>{panels}
+            </body>
+            </html>
+            """
+        ).strip()
+    )
+    return overview_path
+
+
+def _write_channels(
+    outdir_p: Path, stamp: str, data: Dict[str, Any], dt_s: float, fmt: str
+) -> Path:
+    return write_results(
+        outdir_p / f"{stamp}_channels",
+        {name: data[name] for name in CHANNELS},
+        metadata={
+            "timestamp": stamp,
+            "dt_s": dt_s,
+            "heating_rate": data["heating_rate"],
+            "simulation": data.get("metadata", {}),
+        },
+        fmt=fmt,
+    )
+
+
+@dataclass
+class RenderJob:
+    """Everything needed to render a run's figures from its saved channels."""
+
+    stamp: str
+    outdir: str
+    channels_path: str
+    dt_s: float
+    render: str
+    show: Tuple[bool, bool, bool, bool]
+    report: Dict[str, Any]
+
+
+def render_job(job: RenderJob) -> Dict[str, str]:
+    """Render the figures and HTML overview of a deferred job (worker entry point)."""
+
+    outdir_p = Path(job.outdir)
+    figures = RENDER_FIGURES[job.render]
+    data = read_results(Path(job.channels_path), memory_map=True)
+    files = _render_figures(data, job.dt_s, outdir_p, job.stamp, figures, tuple(job.show))
+    files["overview_html"] = str(_write_overview(outdir_p, job.stamp, job.report, figures))
+    return files
+
+
+class DeferredRenderQueue:
+    """Collects render jobs and renders them later in a process pool.
+
+    Each submitted job is also persisted as ``<stamp>_render_job.json`` next
+    to the run outputs, so pending figures can be produced on demand by a
+    separate process via :func:`render_pending`.
+    """
+
+    def __init__(self) -> None:
+        self.jobs: List[RenderJob] = []
+
+    def submit(self, job: RenderJob) -> Path:
+        job_path = Path(job.outdir) / f"{job.stamp}{RENDER_JOB_SUFFIX}"
+        _save_json(asdict(job), job_path)
+        self.jobs.append(job)
+        return job_path
+
+    def run(self, max_workers: int | None = None) -> List[Dict[str, str]]:
+        """Render all queued jobs; ``max_workers=0`` renders in this process."""
+
+        jobs, self.jobs = self.jobs, []
+        if max_workers == 0 or len(jobs) <= 1:
+            results = [render_job(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                results = list(pool.map(render_job, jobs))
+        for job in jobs:
+            (Path(job.outdir) / f"{job.stamp}{RENDER_JOB_SUFFIX}").unlink(missing_ok=True)
+        return results
+
+
+def render_pending(outdir: str, max_workers: int | None = None) -> List[Dict[str, str]]:
+    """Render every job persisted under *outdir* that has not been rendered yet."""
+
+    queue = DeferredRenderQueue()
+    for job_path in sorted(Path(outdir).glob(f"*{RENDER_JOB_SUFFIX}")):
+        payload = json.loads(job_path.read_text(encoding="utf-8"))
+        payload["show"] = tuple(payload["show"])
+        queue.jobs.append(RenderJob(**payload))
+    return queue.run(max_workers=max_workers)
+
+
 # ---------- main ----------
 
 def run_and_save(
@@ -175,8 +359,34 @@ def run_and_save(
     show_surf: bool = True,
     show_det: bool = True,
     disable_physics: bool = False,
+    results_format: str | None = None,
+    render: str = "full",
+    render_queue: "DeferredRenderQueue | None" = None,
+    cache_dir: str | None = None,
+    precision: str = "float64",
 ):
-    stamp = time.strftime("%Y%m%dT%H%M%S")
+    """Simulate, validate and save one background run.
+
+    ``render`` selects the figures: ``"full"`` (time series, PSD, Allan and
+    the HTML overview), ``"summary"`` (time series and overview) or
+    ``"none"`` (JSON outputs only).  With a ``render_queue`` the raw channels
+    are written to disk and the figures are rendered later by
+    :meth:`DeferredRenderQueue.run` or :func:`render_pending`.  With
+    ``cache_dir`` the simulation outputs are reused from a
+    :class:`SimulationCache` when the inputs and simulator code match.
+    ``precision="compact"`` stores float32 analog channels and int16/int32
+    counts (see :class:`BackgroundConfig`).
+    """
+
+    from simulation.guardian_validators.guardian_background_validator import (
+        guardian_check_backgrounds,
+    )
+
+    if render not in RENDER_FIGURES:
+        raise ValueError(f"render must be one of {sorted(RENDER_FIGURES)}")
+    timestamp = time.strftime("%Y%m%dT%H%M%S")
+    # Runs started in the same second (batch scripts, deferred rendering) must not share outputs.
+    stamp = f"{timestamp}_s{seed}_{uuid.uuid4().hex[:8]}"
     outdir_p = Path(outdir)
     outdir_p.mkdir(parents=True, exist_ok=True)
 
@@ -189,11 +399,17 @@ def run_and_save(
         patch_corr_length_um=corr,
         photon_rate_bg_cps=cps,
         readout_integration_ms=tint_ms,
+        precision=precision,
     )
 
-    data = simulate_background_timeseries(
-        n_samples=n_samples, dt_s=dt_s, cfg=cfg, seed=seed
-    )
+    if cache_dir is not None:
+        data = cached_simulate_background_timeseries(
+            n_samples, dt_s, cfg, seed, cache=SimulationCache(cache_dir)
+        )
+    else:
+        data = simulate_background_timeseries(
+            n_samples=n_samples, dt_s=dt_s, cfg=cfg, seed=seed
+        )
     if disable_physics:
         data["position"] = np.zeros_like(data["position"])
         data["heating_rate"] = 0.0
@@ -202,7 +418,8 @@ def run_and_save(
     # save config + report
     _save_json(
         {
-            "timestamp": stamp,
+            "timestamp": timestamp,
+            "stamp": stamp,
             "params": {
                 "T_kelvin": T,
                 "rf_pickup_rms_mV": rf_rms,
@@ -215,74 +432,47 @@ def run_and_save(
                 "n_samples": n_samples,
                 "dt_s": dt_s,
                 "seed": seed,
+                "precision": precision,
             },
             "metadata": data.get("metadata", {}),
         },
         outdir_p / f"{stamp}_config.json",
     )
     _save_json(report, outdir_p / f"{stamp}_guardian_report.json")
-
-    # plots
-    _plot_time_series(
-        data,
-        show_pos,
-        show_em,
-        show_surf,
-        show_det,
-        outdir_p / f"{stamp}_time_series.png",
-    )
-    _plot_psd_em(data, dt_s, outdir_p / f"{stamp}_psd.png")
-    _plot_allan_like_surface(data, dt_s, outdir_p / f"{stamp}_allan.png")
+    channels_path = None
+    if results_format is not None:
+        channels_path = _write_channels(outdir_p, stamp, data, dt_s, results_format)
 
     files = {
         "config": str(outdir_p / f"{stamp}_config.json"),
         "report": str(outdir_p / f"{stamp}_guardian_report.json"),
-        "time_series_png": str(outdir_p / f"{stamp}_time_series.png"),
-        "psd_png": str(outdir_p / f"{stamp}_psd.png"),
-        "allan_png": str(outdir_p / f"{stamp}_allan.png"),
     }
-
-    overview_path = outdir_p / f"{stamp}_overview.html"
-    overview_path.write_text(
-        textwrap.dedent(
-            f"""
-            <!DOCTYPE html>
-            <html lang=\"en\">
-            <head>
-              <meta charset=\"utf-8\" />
-              <title>Flyby Background Simulation – {stamp}</title>
-              <style>
-                body {{ font-family: system-ui, sans-serif; margin: 1.5rem; }}
-                img {{ max-width: 100%; height: auto; border: 1px solid #ddd; padding: 0.5rem; background: #fafafa; }}
-                .panel {{ margin-bottom: 2rem; }}
-                pre {{ background: #f5f5f5; padding: 1rem; overflow: auto; }}
-              </style>
-            </head>
-            <body>
-              <h1>Background simulation snapshot – {stamp}</h1>
-              <section class=\"panel\">
-                <h2>Guardian summary</h2>
-                <pre>{json.dumps(_json_compatible(report), indent=2)}</pre>
-              </section>
-              <section class=\"panel\">
-                <h2>Time series</h2>
-                <img src=\"{Path(files['time_series_png']).name}\" alt=\"Time series plot\" />
-              </section>
-              <section class=\"panel\">
-                <h2>EM pickup PSD</h2>
-                <img src=\"{Path(files['psd_png']).name}\" alt=\"EM pickup PSD\" />
-              </section>
-              <section class=\"panel\">
-                <h2>Surface drift Allan-like variance</h2>
-                <img src=\"{Path(files['allan_png']).name}\" alt=\"Surface drift Allan-like variance\" />
-              </section>
-            </body>
-            </html>
-            """
-        ).strip()
-    )
-
-    files["overview_html"] = str(overview_path)
+    figures = RENDER_FIGURES[render]
+    if render_queue is not None and render != "none":
+        # Persist the raw arrays first; figures are produced later by the queue.
+        if channels_path is None:
+            channels_path = _write_channels(outdir_p, stamp, data, dt_s, "npy")
+        job = RenderJob(
+            stamp=stamp,
+            outdir=str(outdir_p),
+            channels_path=str(channels_path),
+            dt_s=dt_s,
+            render=render,
+            show=(show_pos, show_em, show_surf, show_det),
+            report=_json_compatible(report),
+        )
+        files["render_job"] = str(render_queue.submit(job))
+        files.update(_figure_paths(outdir_p, stamp, figures))
+    elif render != "none":
+        files.update(
+            _render_figures(
+                data, dt_s, outdir_p, stamp, figures, (show_pos, show_em, show_surf, show_det)
+            )
+        )
+        files["overview_html"] = str(_write_overview(outdir_p, stamp, report, figures))
+
+    if channels_path is not None:
+        files["channels"] = str(channels_path)
 
     return report, files
 
@@ -325,6 +515,48 @@ def _build_parser() -> argparse.ArgumentParser:
     p.add_argument(
         "--hide_det", action="store_true", help="Hide detector counts trace"
     )
+    p.add_argument(
+        "--results_format",
+        choices=["auto", *RESULT_FORMATS],
+        help="Also store the raw channel arrays in a columnar file",
+    )
+    p.add_argument(
+        "--render",
+        choices=sorted(RENDER_FIGURES),
+        default="full",
+        help="Figures to produce: none, summary (time series + overview) or full",
+    )
+    p.add_argument(
+        "--defer_render",
+        action="store_true",
+        help="Write raw channels and a render job instead of rendering now",
+    )
+    p.add_argument(
+        "--render_pending",
+        type=str,
+        metavar="OUTDIR",
+        help="Render all deferred jobs found in OUTDIR and exit",
+    )
+    p.add_argument(
+        "--render_workers",
+        type=int,
+        default=None,
+        help="Worker processes for --render_pending (0 renders in-process)",
+    )
+    p.add_argument(
+        "--cache_dir",
+        type=str,
+        nargs="?",
+        const=str(DEFAULT_CACHE_DIR),
+        default=None,
+        help=f"Reuse simulation outputs from an on-disk cache (default dir: {DEFAULT_CACHE_DIR})",
+    )
+    p.add_argument(
+        "--precision",
+        choices=PRECISIONS,
+        default="float64",
+        help="Channel storage: float64, or compact (float32 analog, int16/int32 counts)",
+    )
     p.add_argument(
         "--disable_physics",
         action="store_true",
@@ -335,6 +567,11 @@ def _build_parser() -> argparse.ArgumentParser:
 
 def main() -> None:
     args = _build_parser().parse_args()
+    if args.render_pending:
+        rendered = render_pending(args.render_pending, max_workers=args.render_workers)
+        print("Rendered:", json.dumps(rendered, indent=2))
+        return
+    queue = DeferredRenderQueue() if args.defer_render else None
     report, files = run_and_save(
         T=args.T,
         rf_rms=args.rf_rms,
@@ -353,6 +590,11 @@ def main() -> None:
         show_surf=not args.hide_surf,
         show_det=not args.hide_det,
         disable_physics=args.disable_physics,
+        results_format=args.results_format,
+        render=args.render,
+        render_queue=queue,
+        cache_dir=args.cache_dir,
+        precision=args.precision,
     )
     print("Guardian report:", json.dumps(_json_compatible(report), indent=2))
     print("Files:", json.dumps(_json_compatible(files), indent=2))
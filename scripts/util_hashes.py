@@ -1,11 +1,31 @@
-"""Utility helpers for generating and verifying SHA-256 manifests."""
+"""Utility helpers for generating and verifying SHA-256 manifests.
+
+Files are hashed in a thread pool with large ``readinto`` reads (hashlib
+releases the GIL while digesting, so threads scale with the disks).  A
+sidecar index, ``.sha256_index.json`` next to the manifest, maps each file's
+``(size, mtime_ns, inode)`` to its digest.  It is opt-in: ``write --index``
+reuses digests of unchanged files, and ``verify --fast`` only rehashes files
+whose stat signature changed.  Plain ``write`` and ``verify`` never touch it.
+The index is a cache, not an artifact: it is not listed in the manifest and
+may be deleted at any time.
+"""
 
 from __future__ import annotations
 
 import argparse
 import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_CHUNK_SIZE = 4 << 20
+INDEX_NAME = ".sha256_index.json"
+_INDEX_VERSION = 1
+
+Signature = Tuple[int, int, int]
 
 
 def iter_files(root: Path) -> Iterable[Path]:
@@ -16,29 +36,134 @@ def iter_files(root: Path) -> Iterable[Path]:
             yield path
 
 
-def sha256_file(path: Path) -> str:
+def sha256_file(path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
     """Compute the SHA-256 hash for *path*."""
 
     hasher = hashlib.sha256()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(8192), b""):
-            hasher.update(chunk)
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    with path.open("rb", buffering=0) as handle:
+        while True:
+            n = handle.readinto(buf)
+            if not n:
+                break
+            hasher.update(view[:n])
     return hasher.hexdigest()
 
 
-def write_manifest(root: Path, outfile: Path | None = None) -> Path:
-    """Generate a sha256sum.txt manifest for files under *root*."""
+def file_signature(path: Path) -> Signature:
+    """``(size, mtime_ns, inode)`` used to detect unchanged files."""
+
+    st = path.stat()
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+def hash_files(paths: List[Path], max_workers: Optional[int] = None) -> List[str]:
+    """SHA-256 digests of *paths* (in order), hashed concurrently."""
+
+    if len(paths) <= 1 or max_workers == 1:
+        return [sha256_file(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(sha256_file, paths))
+
+
+class HashIndex:
+    """Sidecar cache of ``relative path -> (signature, digest)`` for one tree.
+
+    Entries whose mtime is not older than the previous index write are not
+    trusted, because a same-size rewrite within one timestamp tick would keep
+    the signature unchanged.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.entries: Dict[str, Tuple[Signature, str]] = {}
+        self._written_ns = 0
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if raw.get("version") != _INDEX_VERSION:
+            return
+        self._written_ns = int(raw.get("written_ns", 0))
+        for rel, (size, mtime_ns, inode, digest) in raw.get("entries", {}).items():
+            self.entries[rel] = ((int(size), int(mtime_ns), int(inode)), digest)
+
+    def lookup(self, rel: str, signature: Signature) -> Optional[str]:
+        entry = self.entries.get(rel)
+        if entry is None or entry[0] != signature or signature[1] >= self._written_ns:
+            return None
+        return entry[1]
+
+    def save(self, entries: Dict[str, Tuple[Signature, str]]) -> None:
+        """Replace the index with *entries*; failures (e.g. read-only trees) are ignored."""
+
+        payload = {
+            "version": _INDEX_VERSION,
+            "written_ns": time.time_ns(),
+            "entries": {rel: [*sig, digest] for rel, (sig, digest) in sorted(entries.items())},
+        }
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_text(json.dumps(payload), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+
+
+def _digests(
+    root: Path,
+    rels: List[str],
+    index: Optional[HashIndex],
+    max_workers: Optional[int],
+    known: Optional[Dict[str, str]] = None,
+) -> Dict[str, Tuple[Signature, str]]:
+    """Digest every existing file in *rels*, reusing index hits that agree with *known*."""
+
+    out: Dict[str, Tuple[Signature, str]] = {}
+    todo: List[Tuple[str, Signature]] = []
+    for rel in rels:
+        path = root / rel
+        try:
+            signature = file_signature(path)
+        except FileNotFoundError:
+            continue
+        cached = index.lookup(rel, signature) if index is not None else None
+        if cached is not None and (known is None or known.get(rel) == cached):
+            out[rel] = (signature, cached)
+        else:
+            todo.append((rel, signature))
+    digests = hash_files([root / rel for rel, _ in todo], max_workers)
+    for (rel, signature), digest in zip(todo, digests):
+        out[rel] = (signature, digest)
+    return out
+
+
+def write_manifest(
+    root: Path,
+    outfile: Path | None = None,
+    max_workers: Optional[int] = None,
+    use_index: bool = False,
+) -> Path:
+    """Generate a sha256sum.txt manifest for files under *root*.
+
+    With ``use_index`` unchanged files are taken from the sidecar index in
+    *root* and the index is written or refreshed afterwards.
+    """
 
     if outfile is None:
         outfile = root / "sha256sum.txt"
-    lines = []
-    for file_path in iter_files(root):
-        if file_path == outfile:
-            continue
-        digest = sha256_file(file_path)
-        rel = file_path.relative_to(root)
-        lines.append(f"{digest}  {rel.as_posix()}\n")
+    rels = [
+        file_path.relative_to(root).as_posix()
+        for file_path in iter_files(root)
+        if file_path != outfile
+    ]
+    index = HashIndex(root / INDEX_NAME) if use_index else None
+    entries = _digests(root, rels, index, max_workers)
+    lines = [f"{entries[rel][1]}  {rel}\n" for rel in rels if rel in entries]
     outfile.write_text("".join(lines), encoding="utf-8")
+    if index is not None:
+        index.save(entries)
     return outfile
 
 
@@ -53,15 +178,25 @@ def read_manifest(manifest: Path) -> Iterable[Tuple[str, Path]]:
         yield digest, manifest.parent / Path(rel)
 
 
-def verify_manifest(manifest: Path) -> bool:
-    """Verify the checksum manifest. Returns *True* when all entries match."""
+def verify_manifest(manifest: Path, fast: bool = False, max_workers: Optional[int] = None) -> bool:
+    """Verify the checksum manifest. Returns *True* when all entries match.
+
+    ``fast`` trusts the sidecar index for files whose ``(size, mtime_ns,
+    inode)`` is unchanged, only rehashes the others and writes the fresh
+    digests back to the index.  Without ``fast`` the tree is only read.
+    """
 
-    for digest, path in read_manifest(manifest):
-        if not path.exists():
-            return False
-        if sha256_file(path) != digest:
-            return False
-    return True
+    root = manifest.parent
+    expected = {
+        path.relative_to(root).as_posix(): digest for digest, path in read_manifest(manifest)
+    }
+    index = HashIndex(root / INDEX_NAME) if fast else None
+    entries = _digests(root, list(expected), index, max_workers, known=expected)
+    if index is not None:
+        index.save({**index.entries, **entries})
+    return len(entries) == len(expected) and all(
+        entries[rel][1] == digest for rel, digest in expected.items()
+    )
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -71,10 +206,25 @@ def _build_parser() -> argparse.ArgumentParser:
     write_p = sub.add_parser("write", help="Create sha256sum.txt for a directory")
     write_p.add_argument("directory", type=Path, help="Target directory")
     write_p.add_argument("--output", type=Path, help="Optional output file path")
+    write_p.add_argument(
+        "--index",
+        action="store_true",
+        help=f"Reuse and update the {INDEX_NAME} stat cache for unchanged files",
+    )
 
     verify_p = sub.add_parser("verify", help="Verify an existing manifest")
     verify_p.add_argument("manifest", type=Path, help="Path to sha256sum.txt")
-
+    verify_p.add_argument(
+        "--fast",
+        action="store_true",
+        help=f"Only rehash files whose size, mtime or inode changed since they were last hashed "
+        f"(reads and updates {INDEX_NAME})",
+    )
+
+    for sub_p in (write_p, verify_p):
+        sub_p.add_argument(
+            "--workers", type=int, default=None, help="Hashing threads (default: Python's pool default)"
+        )
     return parser
 
 
@@ -84,13 +234,15 @@ def main() -> int:
     if args.command == "write":
         directory: Path = args.directory
         directory.mkdir(parents=True, exist_ok=True)
-        manifest = write_manifest(directory, args.output)
+        manifest = write_manifest(
+            directory, args.output, max_workers=args.workers, use_index=args.index
+        )
         print(manifest)
         return 0
 
     if args.command == "verify":
         manifest: Path = args.manifest
-        ok = verify_manifest(manifest)
+        ok = verify_manifest(manifest, fast=args.fast, max_workers=args.workers)
         if not ok:
             return 1
         print("ok")
@@ -7,16 +7,54 @@ import argparse
 import json
 import sys
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
+try:  # pragma: no cover
+    from scripts.report_catalog import ReportCatalog
+except ModuleNotFoundError:  # pragma: no cover
+    ROOT = Path(__file__).resolve().parents[1]
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    from scripts.report_catalog import ReportCatalog
+
+
+def _scan_reports(root: Path, preset: Optional[str] = None) -> List[Path]:
+    """Report folders under *root*, oldest first, for trees without a catalogue."""
 
-def _find_latest_report(root: Path) -> Path:
     candidates = [
         path for path in root.iterdir() if path.is_dir() and (path / "guardian.json").exists()
     ]
-    if not candidates:
+    if preset is not None:
+        candidates = [
+            path
+            for path in candidates
+            if (path / "metadata.json").exists()
+            and json.loads((path / "metadata.json").read_text(encoding="utf-8")).get("preset") == preset
+        ]
+    return sorted(candidates)
+
+
+def _find_reports(root: Path, preset: Optional[str] = None) -> List[Path]:
+    """All report folders under *root* (oldest first), from the catalogue when present."""
+
+    catalog = ReportCatalog.existing(root)
+    if catalog is None:
+        return _scan_reports(root, preset)
+    with catalog:
+        return [row["path"] for row in reversed(catalog.query(preset=preset))]
+
+
+def _find_latest_report(root: Path, preset: Optional[str] = None) -> Path:
+    catalog = ReportCatalog.existing(root)
+    if catalog is not None:
+        with catalog:
+            latest = catalog.latest(preset=preset)
+    else:
+        candidates = _scan_reports(root, preset)
+        latest = candidates[-1] if candidates else None
+    if latest is None:
         raise FileNotFoundError(f"No Guardian report folders found under {root}")
-    return sorted(candidates)[-1]
+    return latest
 
 
 def _load_guardian(path: Path) -> dict:
@@ -65,17 +103,49 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Treat the provided path as the exact report directory",
     )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Validate every report under the root instead of only the latest",
+    )
+    parser.add_argument("--preset", type=str, help="Only consider reports generated with this preset")
     return parser
 
 
+def _validate_all(root: Path, preset: Optional[str] = None) -> int:
+    report_dirs = _find_reports(root, preset)
+    if not report_dirs:
+        raise FileNotFoundError(f"No Guardian report folders found under {root}")
+    n_failed = 0
+    for report_dir in report_dirs:
+        guardian_path = report_dir / "guardian.json"
+        if not guardian_path.exists():
+            errors = [f"{guardian_path} is missing"]
+        else:
+            errors = _validate_guardian(_load_guardian(guardian_path))
+        if errors:
+            n_failed += 1
+            for err in errors:
+                print(f"Guardian veto ({report_dir.name}): {err}", file=sys.stderr)
+    print(f"Guardian validation: {len(report_dirs) - n_failed}/{len(report_dirs)} reports passed under {root}")
+    return 1 if n_failed else 0
+
+
 def main() -> int:
     args = _build_parser().parse_args()
     target = args.path
 
+    if args.all:
+        return _validate_all(target, args.preset)
+
     if args.exact:
         report_dir = target
     else:
-        report_dir = target if (target / "guardian.json").exists() else _find_latest_report(target)
+        report_dir = (
+            target
+            if (target / "guardian.json").exists()
+            else _find_latest_report(target, args.preset)
+        )
 
     guardian_path = report_dir / "guardian.json"
     guardian = _load_guardian(guardian_path)
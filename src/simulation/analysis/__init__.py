@@ -0,0 +1,6 @@
+"""Shared time-series analysis routines for simulation outputs and reports."""
+
+__all__ = [
+    "allan",
+    "spectral",
+]
@@ -0,0 +1,292 @@
+"""Allan and modified Allan variance from cumulative sums.
+
+All estimators work on frequency-like samples ``x`` with spacing ``dt_s``.
+The integrated phase ``S[k] = sum(x[:k])`` is built once; every averaging
+factor ``m`` then reduces to strided differences of ``S`` (and, for the
+modified variance, of its running sum), so each tau costs O(n) without
+reshaping or copying the input.  Leading axes of ``x`` are treated as a batch
+of independent traces.  Compact inputs (float32 or integer samples) are read
+as they are; only the integrated phase is held in float64.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import stats
+
+DEFAULT_N_TAUS = 30
+# Difference terms evaluated per pass; keeps temporaries cache-resident.
+DEFAULT_CHUNK_TERMS = 1 << 16
+
+
+@dataclass(frozen=True)
+class AllanResult:
+    """Allan-type variances per averaging time with equivalent degrees of freedom."""
+
+    taus: np.ndarray
+    m: np.ndarray
+    variance: np.ndarray
+    edf: np.ndarray
+
+    @property
+    def deviation(self) -> np.ndarray:
+        return np.sqrt(self.variance)
+
+    def confidence_interval(self, level: float = 0.683) -> Tuple[np.ndarray, np.ndarray]:
+        """Chi-square confidence bounds on the deviation at the given ``level``."""
+
+        alpha = 1.0 - level
+        edf = np.maximum(self.edf, 1.0)
+        lo = self.variance * edf / stats.chi2.ppf(1.0 - alpha / 2, edf)
+        hi = self.variance * edf / stats.chi2.ppf(alpha / 2, edf)
+        return np.sqrt(lo), np.sqrt(hi)
+
+
+def default_taus(n_samples: int, dt_s: float, n_taus: int = DEFAULT_N_TAUS) -> np.ndarray:
+    """Log-spaced taus from ``10 dt`` to a fifth of the record length."""
+
+    if n_samples < 2:
+        return np.array([dt_s])
+    return np.logspace(np.log10(10 * dt_s), np.log10(n_samples * dt_s / 5.0), n_taus)
+
+
+def averaging_factors(taus: Sequence[float], dt_s: float) -> np.ndarray:
+    """Samples per averaging window, ``max(1, int(tau / dt))`` for each tau."""
+
+    return np.maximum(1, (np.asarray(taus, dtype=np.float64) / dt_s).astype(np.int64))
+
+
+def _integrate(x: np.ndarray) -> np.ndarray:
+    """Zero-prepended cumulative sum of ``x`` minus its mean along the last axis.
+
+    Removing the mean leaves every Allan-type difference unchanged and keeps
+    the running sum small, which preserves precision for long records.
+    """
+
+    out = np.empty(x.shape[:-1] + (x.shape[-1] + 1,), dtype=np.float64)
+    out[..., 0] = 0.0
+    np.subtract(x, np.mean(x, axis=-1, keepdims=True, dtype=np.float64), out=out[..., 1:])
+    np.cumsum(out[..., 1:], axis=-1, out=out[..., 1:])
+    return out
+
+
+def _second_diff(S: np.ndarray, m: int, start: int, stop: int, step: int) -> np.ndarray:
+    """``S[i + 2m] - 2 S[i + m] + S[i]`` for ``i`` in ``range(start, stop, step)``."""
+
+    mid = S[..., start + m : stop + m : step]
+    d = S[..., start + 2 * m : stop + 2 * m : step] - mid
+    d -= mid
+    d += S[..., start:stop:step]
+    return d
+
+
+def _third_diff(SS: np.ndarray, m: int, start: int, stop: int) -> np.ndarray:
+    """``SS[j + 3m] - 3 SS[j + 2m] + 3 SS[j + m] - SS[j]`` for ``j`` in ``range(start, stop)``."""
+
+    d = SS[..., start + 3 * m : stop + 3 * m] - SS[..., start:stop]
+    d -= 3.0 * (SS[..., start + 2 * m : stop + 2 * m] - SS[..., start + m : stop + m])
+    return d
+
+
+def _sum_sq(d: np.ndarray) -> np.ndarray:
+    """Sum of squares along the last axis without a squared temporary."""
+
+    return np.einsum("...i,...i->...", d, d)
+
+
+def _edf(n: int, m: np.ndarray, overlapping: bool, modified: bool) -> np.ndarray:
+    """Approximate equivalent degrees of freedom, assuming white frequency noise.
+
+    Non-overlapping estimates use the exact count of block differences; the
+    overlapping variance uses Howe's white-FM approximation; the modified
+    variance counts approximately independent windows of length ``m``.
+    """
+
+    m = m.astype(np.float64)
+    if modified:
+        edf = (n + 2 - 3 * m) / m
+    elif overlapping:
+        big_n = n + 1.0
+        edf = (3 * (big_n - 1) / (2 * m) - 2 * (big_n - 2) / big_n) * 4 * m**2 / (4 * m**2 + 5)
+    else:
+        edf = np.floor(n / m) - 1
+    return np.where(edf > 0, edf, np.nan)
+
+
+def allan_variance(
+    x: np.ndarray,
+    dt_s: float,
+    taus: Optional[Sequence[float]] = None,
+    overlapping: bool = True,
+    modified: bool = False,
+    chunk_terms: int = DEFAULT_CHUNK_TERMS,
+) -> AllanResult:
+    """Allan (or modified Allan) variance of ``x`` along its last axis.
+
+    ``overlapping=False`` gives the classic estimator over adjacent,
+    non-overlapping block means.  ``modified=True`` gives the (always
+    overlapping) modified Allan variance.  Taus that leave fewer than one
+    difference term yield ``nan``.
+    """
+
+    if modified and not overlapping:
+        raise ValueError("the modified Allan variance is only defined for overlapping windows")
+    x = np.asarray(x)
+    n = x.shape[-1]
+    taus = default_taus(n, dt_s) if taus is None else np.asarray(taus, dtype=np.float64)
+    m_all = averaging_factors(taus, dt_s)
+    S = _integrate(x)
+    SS = _integrate(S) if modified else None
+    variance = np.full(x.shape[:-1] + (m_all.size,), np.nan)
+    for k, m in enumerate(int(v) for v in m_all):
+        if modified:
+            n_terms = n + 2 - 3 * m
+            step = 1
+            norm = 2.0 * m**4
+        elif overlapping:
+            n_terms = n + 1 - 2 * m
+            step = 1
+            norm = 2.0 * m**2
+        else:
+            n_terms = n // m - 1
+            step = m
+            norm = 2.0 * m**2
+        if n_terms < 1:
+            continue
+        total = np.zeros(x.shape[:-1])
+        for lo in range(0, n_terms, chunk_terms):
+            hi = min(lo + chunk_terms, n_terms)
+            if modified:
+                d = _third_diff(SS, m, lo, hi)
+            else:
+                d = _second_diff(S, m, lo * step, hi * step, step)
+            total += _sum_sq(d)
+        variance[..., k] = total / (n_terms * norm)
+    return AllanResult(taus=taus, m=m_all, variance=variance, edf=_edf(n, m_all, overlapping, modified))
+
+
+def allan_deviation(
+    x: np.ndarray,
+    dt_s: float,
+    taus: Optional[Sequence[float]] = None,
+    overlapping: bool = True,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(taus, adev)``; see :func:`allan_variance`."""
+
+    result = allan_variance(x, dt_s, taus, overlapping=overlapping)
+    return result.taus, result.deviation
+
+
+def modified_allan_deviation(
+    x: np.ndarray, dt_s: float, taus: Optional[Sequence[float]] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(taus, mdev)``; see :func:`allan_variance`."""
+
+    result = allan_variance(x, dt_s, taus, modified=True)
+    return result.taus, result.deviation
+
+
+class StreamingAllan:
+    """Allan-type variance accumulated over blocks of samples at fixed taus.
+
+    Only the last ``2m`` (``3m`` for the modified variance) integrated
+    samples of the largest window are retained between blocks, so memory is
+    independent of the record length.  After any sequence of :meth:`update`
+    calls, :meth:`result` matches :func:`allan_variance` on the concatenated
+    samples up to rounding.  Blocks may carry leading batch axes.
+    """
+
+    def __init__(
+        self,
+        dt_s: float,
+        taus: Sequence[float],
+        overlapping: bool = True,
+        modified: bool = False,
+    ) -> None:
+        if modified and not overlapping:
+            raise ValueError("the modified Allan variance is only defined for overlapping windows")
+        self.dt_s = float(dt_s)
+        self.taus = np.asarray(taus, dtype=np.float64)
+        self.m = averaging_factors(self.taus, dt_s)
+        self.overlapping = overlapping
+        self.modified = modified
+        self.n_samples = 0
+        self._keep = (3 if modified else 2) * int(self.m.max()) + 1
+        self._offset: Optional[np.ndarray] = None
+        self._S_tail: Optional[np.ndarray] = None
+        self._SS_tail: Optional[np.ndarray] = None
+        self._sum_sq: Optional[np.ndarray] = None
+        self._count = np.zeros(self.m.size, dtype=np.int64)
+
+    def update(self, block: np.ndarray) -> None:
+        """Add the next ``block`` of samples (last axis is time)."""
+
+        block = np.asarray(block)
+        b = block.shape[-1]
+        if b == 0:
+            return
+        lead = block.shape[:-1]
+        if self._offset is None:
+            # A constant offset cancels in every difference; the first block's
+            # mean keeps the running sums small.
+            self._offset = np.mean(block, axis=-1, keepdims=True, dtype=np.float64)
+            self._S_tail = np.zeros(lead + (1,))
+            self._SS_tail = np.zeros(lead + (2,))
+            self._sum_sq = np.zeros(lead + (self.m.size,))
+        n_old = self.n_samples
+        n_new = n_old + b
+
+        new_S = np.cumsum(block - self._offset, axis=-1)
+        new_S += self._S_tail[..., -1:]
+        S_ext = np.concatenate([self._S_tail, new_S], axis=-1)
+        s0 = n_old + 1 - self._S_tail.shape[-1]
+        if self.modified:
+            new_SS = np.cumsum(new_S, axis=-1)
+            new_SS += self._SS_tail[..., -1:]
+            SS_ext = np.concatenate([self._SS_tail, new_SS], axis=-1)
+            ss0 = n_old + 2 - self._SS_tail.shape[-1]
+
+        for k, m in enumerate(int(v) for v in self.m):
+            if self.modified:
+                # Terms j whose last index j + 3m first becomes available now.
+                lo = max(0, n_old + 2 - 3 * m)
+                hi = n_new + 2 - 3 * m
+                if hi <= lo:
+                    continue
+                d = _third_diff(SS_ext, m, lo - ss0, hi - ss0)
+            else:
+                lo = max(0, n_old + 1 - 2 * m)
+                hi = n_new + 1 - 2 * m
+                step = 1
+                if not self.overlapping:
+                    lo = -(-lo // m) * m
+                    hi = min(hi, (n_new // m - 1) * m)
+                    step = m
+                if hi <= lo:
+                    continue
+                d = _second_diff(S_ext, m, lo - s0, hi - s0, step)
+            self._sum_sq[..., k] += _sum_sq(d)
+            self._count[k] += d.shape[-1]
+
+        self._S_tail = S_ext[..., -self._keep :].copy()
+        if self.modified:
+            self._SS_tail = SS_ext[..., -self._keep :].copy()
+        self.n_samples = n_new
+
+    def result(self) -> AllanResult:
+        """Variances over all samples seen so far (``nan`` where no term exists)."""
+
+        power = 4 if self.modified else 2
+        norm = 2.0 * self.m.astype(np.float64) ** power
+        if self._sum_sq is None:
+            variance = np.full(self.m.size, np.nan)
+        else:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                variance = np.where(self._count > 0, self._sum_sq / (self._count * norm), np.nan)
+        return AllanResult(
+            taus=self.taus,
+            m=self.m,
+            variance=variance,
+            edf=_edf(self.n_samples, self.m, self.overlapping, self.modified),
+        )
@@ -0,0 +1,249 @@
+"""Welch power spectral density estimation over streamed sample blocks.
+
+:class:`WelchAccumulator` reproduces ``scipy.signal.welch`` with its default
+settings (periodic Hann window, half-segment overlap, constant detrend,
+one-sided density scaling, mean averaging) while consuming the input in
+arbitrary blocks.  Samples that belong to a segment not yet complete are
+carried over to the next block, and accumulators over disjoint sets of
+segments can be merged, e.g. after processing a long trace in several
+workers split with :func:`segment_aligned_splits`.
+
+:func:`welch_psd_batch` runs the same estimator over ``(n_traces, n_samples)``
+arrays in trace chunks, and :func:`mains_line_summary` reduces the spectra to
+per-trace mains-line power and broadband floor.
+
+Compact inputs (float32 or integer samples) are not converted up front;
+segments are widened to float64 one batch of ``segments_per_batch`` at a
+time, when they are detrended and windowed.
+"""
+
+from functools import lru_cache
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+from scipy import fft as sp_fft
+from scipy import signal
+
+# Segments transformed per rfft call; bounds the temporary (segments x nperseg) array.
+DEFAULT_SEGMENTS_PER_BATCH = 64
+# Upper bound on the complex spectra held per chunk in welch_psd_batch.
+DEFAULT_CHUNK_BYTES = 64 << 20
+
+
+@lru_cache(maxsize=64)
+def _window(window: Union[str, Tuple], nperseg: int) -> np.ndarray:
+    win = signal.get_window(window, nperseg)
+    win.flags.writeable = False
+    return win
+
+
+@lru_cache(maxsize=64)
+def _frequency_grid(nperseg: int, dt_s: float) -> np.ndarray:
+    freqs = sp_fft.rfftfreq(nperseg, dt_s)
+    freqs.flags.writeable = False
+    return freqs
+
+
+class WelchAccumulator:
+    """Incremental Welch PSD; blocks may carry leading batch axes."""
+
+    def __init__(
+        self,
+        fs: float,
+        nperseg: int,
+        noverlap: Optional[int] = None,
+        window: Union[str, Tuple, np.ndarray] = "hann",
+        detrend: Union[str, bool] = "constant",
+        segments_per_batch: int = DEFAULT_SEGMENTS_PER_BATCH,
+    ) -> None:
+        if noverlap is None:
+            noverlap = nperseg // 2
+        if not 0 <= noverlap < nperseg:
+            raise ValueError("noverlap must satisfy 0 <= noverlap < nperseg")
+        if detrend not in ("constant", False):
+            raise ValueError("detrend must be 'constant' or False")
+        self.fs = float(fs)
+        self.nperseg = int(nperseg)
+        self.noverlap = int(noverlap)
+        self.step = self.nperseg - self.noverlap
+        self.detrend = detrend
+        self.segments_per_batch = int(segments_per_batch)
+        if isinstance(window, np.ndarray):
+            win = np.asarray(window, dtype=np.float64)
+            if win.shape != (self.nperseg,):
+                raise ValueError("window array must have length nperseg")
+        else:
+            win = _window(window, self.nperseg)
+        self.window = win
+        self._scale = 1.0 / (self.fs * float(np.sum(win * win)))
+        self.n_segments = 0
+        self._psd_sum: Optional[np.ndarray] = None
+        self._carry: Optional[np.ndarray] = None
+
+    @property
+    def freqs(self) -> np.ndarray:
+        return _frequency_grid(self.nperseg, 1.0 / self.fs)
+
+    def update(self, block: np.ndarray) -> None:
+        """Consume the next ``block`` of samples (last axis is time)."""
+
+        block = np.asarray(block)
+        buf = block if self._carry is None else np.concatenate([self._carry, block], axis=-1)
+        n = buf.shape[-1]
+        n_seg = 0 if n < self.nperseg else (n - self.nperseg) // self.step + 1
+        if n_seg:
+            frames = np.lib.stride_tricks.sliding_window_view(buf, self.nperseg, axis=-1)
+            for lo in range(0, n_seg, self.segments_per_batch):
+                hi = min(lo + self.segments_per_batch, n_seg)
+                self._accumulate(frames[..., lo * self.step : (hi - 1) * self.step + 1 : self.step, :])
+        # Keep everything from the first segment start not yet consumed.
+        self._carry = buf[..., n_seg * self.step :].copy()
+
+    def _accumulate(self, segments: np.ndarray) -> None:
+        if self.detrend == "constant":
+            segments = segments - np.mean(segments, axis=-1, keepdims=True, dtype=np.float64)
+        spec = sp_fft.rfft(segments * self.window, axis=-1)
+        power = np.sum(spec.real**2 + spec.imag**2, axis=-2)
+        if self._psd_sum is None:
+            self._psd_sum = power
+        else:
+            self._psd_sum += power
+        self.n_segments += segments.shape[-2]
+
+    def merge(self, other: "WelchAccumulator") -> "WelchAccumulator":
+        """Add the segments of ``other`` (same settings) into this accumulator.
+
+        Carried-over samples are not combined: a segment spanning the boundary
+        between the two streams is only counted if one side processed it.
+        """
+
+        if (other.fs, other.nperseg, other.noverlap) != (self.fs, self.nperseg, self.noverlap) or not np.array_equal(
+            other.window, self.window
+        ):
+            raise ValueError("cannot merge Welch accumulators with different settings")
+        if other._psd_sum is not None:
+            self._psd_sum = other._psd_sum.copy() if self._psd_sum is None else self._psd_sum + other._psd_sum
+        self.n_segments += other.n_segments
+        return self
+
+    def result(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(freqs, psd)`` averaged over all complete segments so far."""
+
+        if self._psd_sum is None or self.n_segments == 0:
+            raise ValueError("no complete segment has been accumulated")
+        psd = self._psd_sum * (self._scale / self.n_segments)
+        # One-sided spectrum: fold negative frequencies except DC (and Nyquist).
+        if self.nperseg % 2:
+            psd[..., 1:] *= 2.0
+        else:
+            psd[..., 1:-1] *= 2.0
+        return self.freqs, psd
+
+
+def segment_aligned_splits(
+    n_samples: int, nperseg: int, n_parts: int, noverlap: Optional[int] = None
+) -> List[Tuple[int, int]]:
+    """Sample ranges whose Welch segments partition those of the whole trace.
+
+    Feeding ``x[start:stop]`` of each range to its own accumulator and merging
+    them gives the same PSD as a single pass over ``x``.
+    """
+
+    if noverlap is None:
+        noverlap = nperseg // 2
+    step = nperseg - noverlap
+    n_seg = 0 if n_samples < nperseg else (n_samples - nperseg) // step + 1
+    bounds = np.linspace(0, n_seg, max(1, n_parts) + 1).astype(int)
+    return [
+        (int(lo * step), int((hi - 1) * step + nperseg))
+        for lo, hi in zip(bounds[:-1], bounds[1:])
+        if hi > lo
+    ]
+
+
+def welch_psd(
+    x: np.ndarray,
+    fs: float,
+    nperseg: int,
+    noverlap: Optional[int] = None,
+    block_size: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Welch PSD of an in-memory array, optionally fed to the accumulator in blocks."""
+
+    x = np.asarray(x)
+    acc = WelchAccumulator(fs, nperseg, noverlap)
+    if block_size is None:
+        acc.update(x)
+    else:
+        for start in range(0, x.shape[-1], block_size):
+            acc.update(x[..., start : start + block_size])
+    return acc.result()
+
+
+def welch_psd_batch(
+    x: np.ndarray,
+    dt_s: float,
+    nperseg: int = 4096,
+    noverlap: Optional[int] = None,
+    max_chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Welch PSDs of every trace in ``x`` (shape ``(..., n_samples)``).
+
+    ``nperseg`` is clipped to the trace length as in :func:`welch_psd`.  Traces
+    are processed in chunks sized so that the complex segment spectra of one
+    chunk stay below ``max_chunk_bytes``; windows and frequency grids are
+    cached per ``(nperseg, dt_s)``.
+    """
+
+    x = np.asarray(x)
+    lead = x.shape[:-1]
+    flat = x.reshape(-1, x.shape[-1])
+    nperseg = min(int(nperseg), flat.shape[-1])
+    per_trace = DEFAULT_SEGMENTS_PER_BATCH * (nperseg // 2 + 1) * 16
+    chunk = max(1, int(max_chunk_bytes // per_trace))
+    psd = np.empty((flat.shape[0], nperseg // 2 + 1))
+    for lo in range(0, flat.shape[0], chunk):
+        acc = WelchAccumulator(1.0 / dt_s, nperseg, noverlap)
+        acc.update(flat[lo : lo + chunk])
+        psd[lo : lo + chunk] = acc.result()[1]
+    return _frequency_grid(nperseg, float(dt_s)), psd.reshape(lead + psd.shape[-1:])
+
+
+def mains_line_summary(
+    freqs: np.ndarray,
+    psd: np.ndarray,
+    mains_hz: float,
+    n_harmonics: int = 3,
+    half_width_bins: int = 2,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-trace mains-line power and broadband floor from one-sided PSDs.
+
+    The floor is the median PSD over all bins outside the DC bin and the
+    ``+-half_width_bins`` neighbourhoods of the mains harmonics (the Hann main
+    lobe spans two bins either side).  Line power integrates the PSD minus the
+    floor over each neighbourhood; harmonics above Nyquist give ``nan``.
+    Returns ``(line_power[..., n_harmonics], floor[...])``.
+    """
+
+    freqs = np.asarray(freqs)
+    psd = np.asarray(psd)
+    df = float(freqs[1] - freqs[0])
+    line_mask = np.zeros(freqs.size, dtype=bool)
+    line_mask[0] = True
+    windows: List[Optional[slice]] = []
+    for k in range(1, n_harmonics + 1):
+        f_line = k * mains_hz
+        if f_line > freqs[-1]:
+            windows.append(None)
+            continue
+        centre = int(round(f_line / df))
+        window = slice(max(1, centre - half_width_bins), min(freqs.size, centre + half_width_bins + 1))
+        line_mask[window] = True
+        windows.append(window)
+    floor = np.median(psd[..., ~line_mask], axis=-1)
+    line_power = np.full(psd.shape[:-1] + (n_harmonics,), np.nan)
+    for k, window in enumerate(windows):
+        if window is not None:
+            excess = psd[..., window] - floor[..., None]
+            line_power[..., k] = np.sum(excess, axis=-1) * df
+    return line_power, floor
@@ -5,4 +5,5 @@ __all__ = [
     "em_artifacts",
     "surface_effects",
     "detection_noise",
+    "heating_estimators",
 ]
@@ -1,7 +1,105 @@
 """Electromagnetic artifact models for Guardian background simulations."""
 
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Optional, Sequence, Tuple
+
 import numpy as np
 
+DEFAULT_BLOCK_SIZE = 4096
+# Re-normalise the block rotor every this many blocks to stop rounding drift
+# in the phasor recurrence from leaking into the line amplitude.
+_RENORM_EVERY = 64
+
+
+@dataclass(frozen=True)
+class PickupLine:
+    """A coherent pickup line with relative amplitude and phase [rad]."""
+
+    freq_hz: float
+    amplitude: float = 1.0
+    phase_rad: float = 0.0
+
+
+def mains_harmonic_lines(
+    mains_hz: float, harmonics: Sequence[float] = (1.0,)
+) -> Tuple[PickupLine, ...]:
+    """Return lines at ``n * mains_hz`` with relative amplitudes ``harmonics[n - 1]``."""
+
+    return tuple(
+        PickupLine(freq_hz=(n + 1) * mains_hz, amplitude=float(amp))
+        for n, amp in enumerate(harmonics)
+        if amp != 0.0
+    )
+
+
+@lru_cache(maxsize=256)
+def _phasor_table(
+    freq_hz: float, dt_s: float, block_size: int
+) -> Tuple[np.ndarray, np.ndarray, complex]:
+    """Return ``cos``/``sin`` of ``w dt n`` over one block and the block rotor ``exp(i w dt B)``."""
+
+    phase = 2 * np.pi * freq_hz * dt_s * np.arange(block_size)
+    cos_tab = np.cos(phase)
+    sin_tab = np.sin(phase)
+    cos_tab.flags.writeable = False
+    sin_tab.flags.writeable = False
+    step = complex(np.exp(1j * 2 * np.pi * freq_hz * dt_s * block_size))
+    return cos_tab, sin_tab, step
+
+
+def coherent_pickup(
+    n_samples: int,
+    dt_s: float,
+    lines: Iterable[PickupLine],
+    rng: Optional[np.random.Generator] = None,
+    amp_jitter: float = 0.0,
+    phase_jitter_rad: float = 0.0,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> np.ndarray:
+    """Sum of sinusoidal pickup lines generated block-wise from cached phasor tables.
+
+    Each block is ``Im(r_k * exp(i w dt n))`` with the block rotor ``r_k``
+    advanced by complex multiplication, so no trig is evaluated after the
+    table is built.  With jitter enabled, every block draws a relative
+    amplitude error (std ``amp_jitter``) and the line phase performs a random
+    walk with per-block step std ``phase_jitter_rad``.
+    """
+
+    lines = tuple(lines)
+    jitter = amp_jitter > 0.0 or phase_jitter_rad > 0.0
+    if jitter and rng is None:
+        raise ValueError("rng is required when amplitude or phase jitter is enabled")
+    out = np.zeros(n_samples, dtype=np.float64)
+    if n_samples == 0 or not lines:
+        return out
+    n_blocks = -(-n_samples // block_size)
+    scratch = np.empty(min(block_size, n_samples), dtype=np.float64)
+    for line in lines:
+        cos_tab, sin_tab, step = _phasor_table(float(line.freq_hz), float(dt_s), block_size)
+        rotor = line.amplitude * np.exp(1j * line.phase_rad)
+        if jitter:
+            gains = 1.0 + amp_jitter * rng.normal(0.0, 1.0, size=n_blocks)
+            walk = np.cumsum(phase_jitter_rad * rng.normal(0.0, 1.0, size=n_blocks))
+            block_rot = gains * np.exp(1j * walk)
+        if line.amplitude == 0.0:
+            # Jitter is still drawn above so the RNG stream does not depend on it.
+            continue
+        for k, start in enumerate(range(0, n_samples, block_size)):
+            stop = min(start + block_size, n_samples)
+            m = stop - start
+            r = rotor * block_rot[k] if jitter else rotor
+            # Im(r * (c + i s)) = Im(r) c + Re(r) s
+            buf = scratch[:m]
+            np.multiply(cos_tab[:m], r.imag, out=buf)
+            out[start:stop] += buf
+            np.multiply(sin_tab[:m], r.real, out=buf)
+            out[start:stop] += buf
+            rotor *= step
+            if (k + 1) % _RENORM_EVERY == 0:
+                rotor *= abs(line.amplitude) / abs(rotor)
+    return out
+
 
 def sample_electrode_pickup(
     n_samples: int,
@@ -10,11 +108,38 @@ def sample_electrode_pickup(
     mains_hz: float,
     coupling: float,
     rng: np.random.Generator,
+    harmonics: Sequence[float] = (1.0,),
+    extra_lines: Sequence[PickupLine] = (),
+    amp_jitter: float = 0.0,
+    phase_jitter_rad: float = 0.0,
+    broadband_rel: float = 0.1,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    mains: Optional[np.ndarray] = None,
 ) -> np.ndarray:
-    """Generate a synthetic electrode pickup trace including mains hum and broadband noise."""
+    """Generate a synthetic electrode pickup trace including mains hum and broadband noise.
+
+    ``harmonics`` gives the relative amplitude of each mains harmonic, and
+    ``extra_lines`` adds further coherent lines such as RF drive crosstalk.
+    Without jitter the coherent lines draw no random numbers, so a ``mains``
+    trace from :func:`coherent_pickup` may be passed in and shared between
+    realisations; it is not modified.
+    """
 
-    t = np.arange(n_samples) * dt_s
-    mains = np.sin(2 * np.pi * mains_hz * t)
-    broadband = rng.normal(0.0, 1.0, size=n_samples)
-    signal = mains + 0.1 * broadband
-    return coupling * rms_mV * signal
+    if mains is None:
+        lines = mains_harmonic_lines(mains_hz, harmonics) + tuple(extra_lines)
+        mains = coherent_pickup(
+            n_samples,
+            dt_s,
+            lines,
+            rng=rng,
+            amp_jitter=amp_jitter,
+            phase_jitter_rad=phase_jitter_rad,
+            block_size=block_size,
+        )
+    elif amp_jitter > 0.0 or phase_jitter_rad > 0.0:
+        raise ValueError("a shared mains trace cannot be combined with jitter")
+    signal = rng.normal(0.0, 1.0, size=n_samples)
+    signal *= broadband_rel
+    signal += mains
+    signal *= coupling * rms_mV
+    return signal
@@ -1,7 +1,180 @@
-"""Surface effect proxies for Guardian background simulations."""
+"""Surface effect proxies for Guardian background simulations.
+
+Patch potentials are modelled as a stationary 2-D Gaussian random field over
+the electrode surface with a Gaussian covariance ``exp(-r^2 / (2 l^2))``.  The
+field is generated by FFT convolution of white noise on a periodic grid, and
+each Fourier mode relaxes as an Ornstein-Uhlenbeck process with rate
+``(1 + k^2 l^2) / tau`` so that small patches decorrelate faster than large
+ones.  The grid has a fixed physical pixel size (``DEFAULT_PIXEL_UM`` unless
+given), independent of ``l``: a longer correlation length concentrates the
+variance in the slow long-wavelength modes, so the drift seen by the ion
+decorrelates more slowly.
+"""
+
+from functools import lru_cache
+from typing import Optional, Tuple
 
 import numpy as np
 
+DEFAULT_GRID_SHAPE: Tuple[int, int] = (64, 64)
+# 64 x 12.5 um = 800 um electrode extent.
+DEFAULT_PIXEL_UM = 12.5
+DEFAULT_N_SHELLS = 24
+DEFAULT_CHUNK_SIZE = 1 << 15
+# Spectral cut-off in units of 1/corr_length; the Gaussian spectrum carries
+# < 1e-7 of the variance beyond it, so remaining modes share the last shell.
+_MAX_KL = 6.0
+
+
+@lru_cache(maxsize=32)
+def _spectral_filter(
+    grid_shape: Tuple[int, int], pixel_um: float, corr_length_um: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the ``rfft2`` amplitude filter and ``(k l)^2`` grid for a unit-variance field."""
+
+    ny, nx = grid_shape
+    ky = 2 * np.pi * np.fft.fftfreq(ny, d=pixel_um)
+    kx = 2 * np.pi * np.fft.rfftfreq(nx, d=pixel_um)
+    kl2 = (ky[:, None] ** 2 + kx[None, :] ** 2) * corr_length_um**2
+    amp = np.exp(-0.25 * kl2)
+    # Columns other than DC (and Nyquist for even nx) stand for two modes of
+    # the full spectrum; normalise so that the field variance is one.
+    weights = np.full(kx.size, 2.0)
+    weights[0] = 1.0
+    if nx % 2 == 0:
+        weights[-1] = 1.0
+    amp /= np.sqrt(np.sum(amp**2 * weights) / (ny * nx))
+    amp.flags.writeable = False
+    kl2.flags.writeable = False
+    return amp, kl2
+
+
+@lru_cache(maxsize=32)
+def _shell_spectrum(
+    grid_shape: Tuple[int, int], pixel_um: float, corr_length_um: float, n_shells: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Group modes into radial shells and return ``(mean (k l)^2, variance)`` per shell."""
+
+    amp, kl2 = _spectral_filter(grid_shape, pixel_um, corr_length_um)
+    ny, nx = grid_shape
+    weights = np.full(amp.shape[1], 2.0)
+    weights[0] = 1.0
+    if nx % 2 == 0:
+        weights[-1] = 1.0
+    var = (amp**2 * weights).ravel() / (ny * nx)
+    kl = np.sqrt(kl2).ravel()
+    edges = np.linspace(0.0, min(_MAX_KL, float(kl.max()) + 1e-12), n_shells + 1)
+    shell = np.clip(np.searchsorted(edges, kl, side="right") - 1, 0, n_shells - 1)
+    shell_var = np.bincount(shell, weights=var, minlength=n_shells)
+    shell_kl2 = np.bincount(shell, weights=var * kl2.ravel(), minlength=n_shells)
+    keep = shell_var > 0
+    shell_kl2 = shell_kl2[keep] / shell_var[keep]
+    shell_var = shell_var[keep]
+    shell_kl2.flags.writeable = False
+    shell_var.flags.writeable = False
+    return shell_kl2, shell_var
+
+
+def sample_patch_field(
+    rms_mV: float,
+    corr_length_um: float,
+    rng: np.random.Generator,
+    grid_shape: Tuple[int, int] = DEFAULT_GRID_SHAPE,
+    pixel_um: Optional[float] = None,
+) -> np.ndarray:
+    """Draw a static patch-potential map [mV] over the electrode grid."""
+
+    pixel_um = DEFAULT_PIXEL_UM if pixel_um is None else pixel_um
+    amp, _ = _spectral_filter(tuple(grid_shape), float(pixel_um), float(corr_length_um))
+    white = rng.normal(0.0, 1.0, size=grid_shape)
+    return rms_mV * np.fft.irfft2(np.fft.rfft2(white) * amp, s=grid_shape)
+
+
+class PatchPotentialField:
+    """Patch-potential map whose Fourier modes evolve as Ornstein-Uhlenbeck processes."""
+
+    def __init__(
+        self,
+        rms_mV: float,
+        corr_length_um: float,
+        corr_time_s: float,
+        rng: np.random.Generator,
+        grid_shape: Tuple[int, int] = DEFAULT_GRID_SHAPE,
+        pixel_um: Optional[float] = None,
+    ) -> None:
+        self.rms_mV = rms_mV
+        self.corr_time_s = corr_time_s
+        self.grid_shape = tuple(grid_shape)
+        self.pixel_um = DEFAULT_PIXEL_UM if pixel_um is None else pixel_um
+        self._amp, kl2 = _spectral_filter(
+            self.grid_shape, float(self.pixel_um), float(corr_length_um)
+        )
+        self._rates = (1.0 + kl2) / corr_time_s
+        self._rng = rng
+        self._modes = np.fft.rfft2(rng.normal(0.0, 1.0, size=self.grid_shape))
+
+    def advance(self, dt_s: float) -> None:
+        """Propagate every mode exactly over ``dt_s`` seconds."""
+
+        rho = np.exp(-self._rates * dt_s)
+        kick = np.fft.rfft2(self._rng.normal(0.0, 1.0, size=self.grid_shape))
+        self._modes *= rho
+        self._modes += np.sqrt(1.0 - rho**2) * kick
+
+    def field(self) -> np.ndarray:
+        """Return the current potential map [mV]."""
+
+        return self.rms_mV * np.fft.irfft2(self._modes * self._amp, s=self.grid_shape)
+
+
+def sample_ion_potential(
+    n_samples: int,
+    dt_s: float,
+    rms_mV: float,
+    corr_length_um: float,
+    corr_time_s: float,
+    rng: np.random.Generator,
+    grid_shape: Tuple[int, int] = DEFAULT_GRID_SHAPE,
+    pixel_um: Optional[float] = None,
+    n_shells: int = DEFAULT_N_SHELLS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> np.ndarray:
+    """Sample the patch potential seen at a fixed ion position as a time series.
+
+    Modes with equal ``|k|`` share a relaxation rate, so their contributions at
+    a point add up to a single OU process.  Modes are therefore grouped into
+    ``n_shells`` radial shells and one OU process per shell is integrated with
+    an exact AR(1) recursion.  Noise is drawn time-major in chunks of
+    ``chunk_size`` samples, which bounds memory and makes the output
+    independent of the chunking.
+    """
+
+    # Deferred: scipy.signal dominates the import time of the simulator.
+    from scipy import signal
+
+    pixel_um = DEFAULT_PIXEL_UM if pixel_um is None else pixel_um
+    shell_kl2, shell_var = _shell_spectrum(
+        tuple(grid_shape), float(pixel_um), float(corr_length_um), n_shells
+    )
+    rho = np.exp(-(1.0 + shell_kl2) / corr_time_s * dt_s)
+    drive = np.sqrt((1.0 - rho**2) * shell_var)
+    state = rng.normal(0.0, 1.0, size=shell_var.size) * np.sqrt(shell_var)
+
+    out = np.empty(n_samples, dtype=np.float64)
+    for start in range(0, n_samples, chunk_size):
+        stop = min(start + chunk_size, n_samples)
+        xi = rng.normal(0.0, 1.0, size=(stop - start, shell_var.size))
+        acc = out[start:stop]
+        acc[:] = 0.0
+        for g in range(shell_var.size):
+            y, _ = signal.lfilter(
+                [drive[g]], [1.0, -rho[g]], xi[:, g], zi=[rho[g] * state[g]]
+            )
+            state[g] = y[-1]
+            acc += y
+    out *= rms_mV
+    return out
+
 
 def sample_patch_potential_drift(
     n_samples: int,
@@ -9,12 +182,17 @@ def sample_patch_potential_drift(
     rms_mV: float,
     corr_length_um: float,
     rng: np.random.Generator,
+    corr_time_s: float = 1.0,
+    pixel_um: float = DEFAULT_PIXEL_UM,
 ) -> np.ndarray:
-    """Generate a slow drift trace using a normalized random walk proxy."""
-
-    _ = dt_s, corr_length_um  # Parameters reserved for more detailed models.
-    white = rng.normal(0.0, 1.0, size=n_samples)
-    drift = np.cumsum(white)
-    std = np.std(drift) or 1.0
-    drift = drift / std * rms_mV
-    return drift
+    """Generate the patch-potential drift at the ion from the correlated field model."""
+
+    return sample_ion_potential(
+        n_samples=n_samples,
+        dt_s=dt_s,
+        rms_mV=rms_mV,
+        corr_length_um=corr_length_um,
+        corr_time_s=corr_time_s,
+        rng=rng,
+        pixel_um=pixel_um,
+    )
@@ -4,10 +4,18 @@ from typing import Tuple
 
 import numpy as np
 
+from . import heating_estimators
+
 kB = 1.380649e-23
 m_YB171 = 2.84e-25  # kg (placeholder mass; replace with actual ion mass used in repo)
 
 
+def draw_phase(rng: np.random.Generator) -> float:
+    """Draw the random phase of the secular motion proxy (the only random draw)."""
+
+    return rng.uniform(0.0, 2 * np.pi)
+
+
 def sample_positions(
     n_samples: int,
     dt_s: float,
@@ -21,14 +29,24 @@ def sample_positions(
     t = np.arange(n_samples) * dt_s
     omega_mean = 2 * np.pi * freqs.mean()
     amplitude = np.sqrt(kB * T_K / m_YB171) / omega_mean
-    phase = rng.uniform(0.0, 2 * np.pi)
+    phase = draw_phase(rng)
     return amplitude * np.sin(omega_mean * t + phase)
 
 
 def estimate_heating_rate_quanta_s(position_ts: np.ndarray, dt_s: float) -> float:
     """Estimate a proxy heating rate from a position time series."""
 
-    if position_ts.size < 2:
-        return 0.0
-    velocity = np.diff(position_ts) / dt_s
-    return float(np.var(velocity))
+    return heating_estimators.velocity_variance_heating_rate(position_ts, dt_s)
+
+
+def estimate_heating_rate_from_energy(
+    position_ts: np.ndarray,
+    dt_s: float,
+    secular_freqs_khz: Tuple[float, float, float],
+) -> float:
+    """Estimate the heating rate in quanta/s from the motional energy trend."""
+
+    freq_hz = float(np.mean(secular_freqs_khz)) * 1e3
+    return heating_estimators.energy_heating_rate_quanta_s(
+        position_ts, dt_s, secular_freq_hz=freq_hz, mass_kg=m_YB171
+    )
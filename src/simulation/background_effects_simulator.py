@@ -1,7 +1,19 @@
-"""Background effects simulator used to generate Guardian validation inputs."""
+"""Background effects simulator used to generate Guardian validation inputs.
 
+``BackgroundConfig.precision`` selects the storage dtype of the channels.
+``"float64"`` (default) keeps float64 analog channels and int64 counts.
+``"compact"`` stores ``position``, ``em_pickup`` and ``surface_drift`` as
+float32 and ``detector_counts`` as int16 (int32 when a count exceeds 32767).
+The samples are drawn from the same RNG stream in float64 and rounded once,
+so every analog sample is within a relative error of ``2**-24`` (about
+6e-8) of the float64 run, and counts are exact.  ``heating_rate`` is
+estimated from the float64 position before rounding and is unchanged.
+"""
+
+import json
+from collections import OrderedDict
 from dataclasses import dataclass, asdict
-from typing import Dict, Any, Tuple
+from typing import Callable, Dict, Any, Hashable, Mapping, Optional, Tuple
 
 import numpy as np
 
@@ -19,12 +31,137 @@ class BackgroundConfig:
     rf_pickup_rms: float = 0.5  # mV equivalent at electrode
     mains_hz: float = 50.0
     em_coupling_coeff: float = 1e-3
+    mains_harmonics: Tuple[float, ...] = (1.0,)  # relative amplitude of n * mains_hz
+    em_crosstalk_lines: Tuple[Tuple[float, float], ...] = ()  # (freq_hz, relative amplitude)
+    em_amp_jitter: float = 0.0
+    em_phase_jitter_rad: float = 0.0
+    em_broadband_rel: float = 0.1  # broadband noise std relative to the coherent pickup rms
     # Surface effects
     patch_potential_rms_mV: float = 5.0
     patch_corr_length_um: float = 50.0
+    patch_corr_time_s: float = 1.0
+    patch_pixel_um: float = surface_effects.DEFAULT_PIXEL_UM  # electrode grid pitch, independent of l
     # Detection chain noise
     photon_rate_bg_cps: float = 200.0
     readout_integration_ms: float = 1.0
+    detector: Optional[detection_noise.DetectorModel] = None  # None -> bare Poisson counts
+    # Channel storage: "float64" or "compact" (float32 analog, int16/int32 counts)
+    precision: str = "float64"
+
+
+PRECISIONS = ("float64", "compact")
+ANALOG_DTYPES = {"float64": np.dtype(np.float64), "compact": np.dtype(np.float32)}
+
+
+def _store_analog(x: np.ndarray, precision: str) -> np.ndarray:
+    return x.astype(ANALOG_DTYPES[precision], copy=False)
+
+
+def _store_counts(counts: np.ndarray, precision: str) -> np.ndarray:
+    """Narrowest of int16/int32 that holds every count exactly in compact mode."""
+
+    if precision != "compact":
+        return counts
+    peak = int(counts.max()) if counts.size else 0
+    for dtype in (np.int16, np.int32):
+        if peak <= np.iinfo(dtype).max:
+            return counts.astype(dtype)
+    return counts
+
+
+# Config fields each channel depends on; a channel is recomputed only when
+# one of its fields, the sampling grid or its incoming RNG state changes.
+CHANNEL_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "position": ("T_kelvin", "secular_freqs_khz", "precision"),
+    "em_pickup": (
+        "rf_pickup_rms",
+        "mains_hz",
+        "em_coupling_coeff",
+        "mains_harmonics",
+        "em_crosstalk_lines",
+        "em_amp_jitter",
+        "em_phase_jitter_rad",
+        "em_broadband_rel",
+        "precision",
+    ),
+    "surface_drift": (
+        "patch_potential_rms_mV",
+        "patch_corr_length_um",
+        "patch_corr_time_s",
+        "patch_pixel_um",
+        "precision",
+    ),
+    "detector_counts": ("photon_rate_bg_cps", "readout_integration_ms", "detector", "precision"),
+}
+DEFAULT_MEMO_BYTES = 512 << 20
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class ChannelMemo:
+    """In-memory LRU of per-channel simulator outputs, bounded by ``max_bytes``.
+
+    Channels share one RNG stream, so each entry is keyed on the channel's
+    config fields, the sampling grid and the RNG state on entry, and stores
+    the RNG state on exit.  A hit restores that exit state, which keeps the
+    downstream channels bit-identical to an unmemoized run.  Cached arrays
+    are returned read-only.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MEMO_BYTES) -> None:
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Dict[str, Any], int]]" = OrderedDict()
+        self._bytes = 0
+
+    def run(
+        self,
+        channel: str,
+        grid: Tuple[int, float],
+        cfg: "BackgroundConfig",
+        rng: np.random.Generator,
+        compute: Callable[[], Any],
+    ) -> Any:
+        fields = tuple(_freeze(getattr(cfg, name)) for name in CHANNEL_FIELDS[channel])
+        key = (channel, grid, fields, json.dumps(rng.bit_generator.state, sort_keys=True))
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            rng.bit_generator.state = entry[1]
+            return entry[0]
+        self.misses += 1
+        value = compute()
+        arrays = value if isinstance(value, tuple) else (value,)
+        size = 0
+        for arr in arrays:
+            if isinstance(arr, np.ndarray):
+                arr.flags.writeable = False
+                size += arr.nbytes
+        self._entries[key] = (value, rng.bit_generator.state, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+
+_CHANNEL_MEMO = ChannelMemo()
+
+
+def clear_channel_memo() -> None:
+    """Drop all entries of the process-wide channel memo."""
+
+    _CHANNEL_MEMO.clear()
 
 
 def simulate_background_timeseries(
@@ -32,44 +169,134 @@ def simulate_background_timeseries(
     dt_s: float,
     cfg: BackgroundConfig,
     seed: int = 0,
+    memoize: bool = False,
+    memo: Optional[ChannelMemo] = None,
+    out: Optional[Mapping[str, np.ndarray]] = None,
 ) -> Dict[str, Any]:
-    """Generate background-only observables for Guardian validation gates."""
+    """Generate background-only observables for Guardian validation gates.
 
-    rng = np.random.default_rng(seed)
+    With ``memoize`` (or an explicit ``memo``) each channel is served from an
+    in-process :class:`ChannelMemo` when its inputs are unchanged, so e.g.
+    changing ``mains_hz`` only recomputes ``em_pickup``.  ``out`` maps channel
+    names to preallocated ``(n_samples,)`` arrays (e.g. slots of a
+    :class:`simulation.ensemble.EnsembleBuffer`); each channel is written into
+    its array as soon as it is generated and the returned dict refers to them.
+    """
 
-    position = thermal_motion.sample_positions(
-        n_samples=n_samples,
-        dt_s=dt_s,
-        T_K=cfg.T_kelvin,
-        secular_freqs_khz=cfg.secular_freqs_khz,
-        rng=rng,
-    )
+    if memo is None and memoize:
+        memo = _CHANNEL_MEMO
+    return _simulate(n_samples, dt_s, cfg, seed, memo=memo, out=out)
 
-    em_pickup = em_artifacts.sample_electrode_pickup(
-        n_samples=n_samples,
-        dt_s=dt_s,
-        rms_mV=cfg.rf_pickup_rms,
-        mains_hz=cfg.mains_hz,
-        coupling=cfg.em_coupling_coeff,
-        rng=rng,
-    )
 
-    surface_drift = surface_effects.sample_patch_potential_drift(
-        n_samples=n_samples,
-        dt_s=dt_s,
-        rms_mV=cfg.patch_potential_rms_mV,
-        corr_length_um=cfg.patch_corr_length_um,
-        rng=rng,
-    )
+def _shared_mains(n_samples: int, dt_s: float, cfg: BackgroundConfig) -> Optional[np.ndarray]:
+    """Coherent pickup lines when they are deterministic (no jitter), else *None*."""
 
-    detector_counts = detection_noise.sample_counts(
-        n_samples=n_samples,
-        bg_rate_cps=cfg.photon_rate_bg_cps,
-        tint_ms=cfg.readout_integration_ms,
-        rng=rng,
+    if cfg.em_amp_jitter > 0.0 or cfg.em_phase_jitter_rad > 0.0:
+        return None
+    lines = em_artifacts.mains_harmonic_lines(cfg.mains_hz, cfg.mains_harmonics) + tuple(
+        em_artifacts.PickupLine(freq_hz=f, amplitude=a) for f, a in cfg.em_crosstalk_lines
     )
+    mains = em_artifacts.coherent_pickup(n_samples, dt_s, lines)
+    mains.flags.writeable = False
+    return mains
+
+
+def _simulate(
+    n_samples: int,
+    dt_s: float,
+    cfg: BackgroundConfig,
+    seed: int,
+    memo: Optional[ChannelMemo] = None,
+    out: Optional[Mapping[str, np.ndarray]] = None,
+    null: bool = False,
+    mains: Optional[np.ndarray] = None,
+) -> Dict[str, Any]:
+    """Channel generation behind :func:`simulate_background_timeseries`.
+
+    ``null`` replaces the position channel by a read-only zero view and the
+    heating rate by zero; the phase draw is kept so the other channels see
+    the same random stream.  ``mains`` is a precomputed coherent pickup trace.
+    """
+
+    if cfg.precision not in PRECISIONS:
+        raise ValueError(f"precision must be one of {PRECISIONS}, got {cfg.precision!r}")
+    rng = np.random.default_rng(seed)
+    grid = (int(n_samples), float(dt_s))
+
+    def step(channel: str, compute: Callable[[], Any]) -> Any:
+        value = compute() if memo is None else memo.run(channel, grid, cfg, rng, compute)
+        if out is None or channel not in out:
+            return value
+        trace = value[0] if isinstance(value, tuple) else value
+        target = out[channel]
+        if np.issubdtype(target.dtype, np.integer) and trace.size and trace.max() > np.iinfo(target.dtype).max:
+            raise ValueError(f"{channel} exceeds the range of its {target.dtype} output array")
+        target[...] = trace
+        return (target,) + value[1:] if isinstance(value, tuple) else target
 
-    heating_rate = thermal_motion.estimate_heating_rate_quanta_s(position, dt_s)
+    def null_position():
+        thermal_motion.draw_phase(rng)
+        return np.broadcast_to(np.zeros((), dtype=ANALOG_DTYPES[cfg.precision]), (n_samples,)), 0.0
+
+    def position_and_heating():
+        position = thermal_motion.sample_positions(
+            n_samples=n_samples,
+            dt_s=dt_s,
+            T_K=cfg.T_kelvin,
+            secular_freqs_khz=cfg.secular_freqs_khz,
+            rng=rng,
+        )
+        heating_rate = thermal_motion.estimate_heating_rate_quanta_s(position, dt_s)
+        return _store_analog(position, cfg.precision), heating_rate
+
+    def pickup():
+        trace = em_artifacts.sample_electrode_pickup(
+            n_samples=n_samples,
+            dt_s=dt_s,
+            rms_mV=cfg.rf_pickup_rms,
+            mains_hz=cfg.mains_hz,
+            coupling=cfg.em_coupling_coeff,
+            rng=rng,
+            harmonics=cfg.mains_harmonics,
+            extra_lines=[
+                em_artifacts.PickupLine(freq_hz=f, amplitude=a) for f, a in cfg.em_crosstalk_lines
+            ],
+            amp_jitter=cfg.em_amp_jitter,
+            phase_jitter_rad=cfg.em_phase_jitter_rad,
+            broadband_rel=cfg.em_broadband_rel,
+            mains=mains,
+        )
+        return _store_analog(trace, cfg.precision)
+
+    def drift():
+        trace = surface_effects.sample_patch_potential_drift(
+            n_samples=n_samples,
+            dt_s=dt_s,
+            rms_mV=cfg.patch_potential_rms_mV,
+            corr_length_um=cfg.patch_corr_length_um,
+            rng=rng,
+            corr_time_s=cfg.patch_corr_time_s,
+            pixel_um=cfg.patch_pixel_um,
+        )
+        return _store_analog(trace, cfg.precision)
+
+    def counts():
+        raw = detection_noise.sample_counts(
+            n_samples=n_samples,
+            bg_rate_cps=cfg.photon_rate_bg_cps,
+            tint_ms=cfg.readout_integration_ms,
+            rng=rng,
+            detector=cfg.detector,
+        )
+        return _store_counts(raw, cfg.precision)
+
+    if null:
+        position, heating_rate = null_position()
+    else:
+        position, heating_rate = step("position", position_and_heating)
+    em_pickup = step("em_pickup", pickup)
+    surface_drift = step("surface_drift", drift)
+    detector_counts = step("detector_counts", counts)
 
     return {
         "position": position,
@@ -84,3 +311,25 @@ def simulate_background_timeseries(
             "config": asdict(cfg),
         },
     }
+
+
+def simulate_background_pair(
+    n_samples: int,
+    dt_s: float,
+    cfg: BackgroundConfig,
+    seed: int,
+    null_seed: int,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Experimental and null realisations for paired Guardian reports.
+
+    The null realisation equals ``simulate_background_timeseries`` at
+    ``null_seed`` with the physics disabled: its ``position`` is a read-only
+    zero view (no trace is generated or stored) and its ``heating_rate`` is
+    zero.  Without EM jitter the coherent mains trace is computed once and
+    shared by both realisations.
+    """
+
+    mains = _shared_mains(n_samples, dt_s, cfg)
+    experimental = _simulate(n_samples, dt_s, cfg, seed, mains=mains)
+    null = _simulate(n_samples, dt_s, cfg, null_seed, null=True, mains=mains)
+    return experimental, null
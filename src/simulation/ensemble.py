@@ -0,0 +1,183 @@
+"""Shared-memory ensemble buffers for multi-process background simulation.
+
+An :class:`EnsembleBuffer` holds ``(n_realisations, n_samples)`` arrays for
+every simulator channel, plus per-realisation ``heating_rate`` and ``seed``,
+in one :class:`multiprocessing.shared_memory.SharedMemory` block.  Workers
+attach to the block by its :attr:`EnsembleBuffer.descriptor` and pass their
+slot to ``simulate_background_timeseries(..., out=...)``, so nothing but the
+slot index travels back to the parent.  The parent reads the channels as
+zero-copy views, e.g. for :func:`guardian_check_backgrounds_batch`.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .background_effects_simulator import (
+    ANALOG_DTYPES,
+    BackgroundConfig,
+    simulate_background_timeseries,
+)
+
+ANALOG_CHANNELS = ("position", "em_pickup", "surface_drift")
+COUNTS_CHANNEL = "detector_counts"
+# Compact counts are int16 unless a count needs int32; a common slot fits both.
+COUNTS_DTYPES = {"float64": np.dtype(np.int64), "compact": np.dtype(np.int32)}
+_ALIGN = 64
+
+Descriptor = Tuple[str, int, int, str]
+Layout = Dict[str, Tuple[int, Tuple[int, ...], np.dtype]]
+
+
+def _layout(n_realisations: int, n_samples: int, precision: str) -> Tuple[Layout, int]:
+    """Aligned offsets of every array in the block and the total block size."""
+
+    fields = [(name, (n_realisations, n_samples), ANALOG_DTYPES[precision]) for name in ANALOG_CHANNELS]
+    fields.append((COUNTS_CHANNEL, (n_realisations, n_samples), COUNTS_DTYPES[precision]))
+    fields.append(("heating_rate", (n_realisations,), np.dtype(np.float64)))
+    fields.append(("seed", (n_realisations,), np.dtype(np.int64)))
+    layout: Layout = {}
+    offset = 0
+    for name, shape, dtype in fields:
+        layout[name] = (offset, shape, dtype)
+        offset += -(-max(int(np.prod(shape)) * dtype.itemsize, 1) // _ALIGN) * _ALIGN
+    return layout, max(offset, _ALIGN)
+
+
+class EnsembleBuffer:
+    """Preallocated channel slots for an ensemble of realisations in shared memory.
+
+    Use :meth:`create` in the parent (which owns and finally unlinks the
+    block) and :meth:`attach` in workers.  The buffer is a context manager;
+    drop every view obtained from it (including :meth:`as_data`) before it
+    is closed, as an exported buffer cannot be unmapped.
+    """
+
+    def __init__(
+        self,
+        shm: shared_memory.SharedMemory,
+        n_realisations: int,
+        n_samples: int,
+        precision: str,
+        owner: bool,
+    ) -> None:
+        self._shm = shm
+        self.n_realisations = int(n_realisations)
+        self.n_samples = int(n_samples)
+        self.precision = precision
+        self.owner = owner
+        layout, _ = _layout(self.n_realisations, self.n_samples, precision)
+        self.arrays: Dict[str, np.ndarray] = {
+            name: np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+            for name, (offset, shape, dtype) in layout.items()
+        }
+
+    @classmethod
+    def create(
+        cls, n_realisations: int, n_samples: int, precision: str = "float64"
+    ) -> "EnsembleBuffer":
+        if precision not in ANALOG_DTYPES:
+            raise ValueError(f"precision must be one of {tuple(ANALOG_DTYPES)}, got {precision!r}")
+        _, size = _layout(n_realisations, n_samples, precision)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        return cls(shm, n_realisations, n_samples, precision, owner=True)
+
+    @classmethod
+    def attach(cls, descriptor: Descriptor) -> "EnsembleBuffer":
+        name, n_realisations, n_samples, precision = descriptor
+        return cls(shared_memory.SharedMemory(name=name), n_realisations, n_samples, precision, owner=False)
+
+    @property
+    def descriptor(self) -> Descriptor:
+        """Picklable handle that :meth:`attach` turns back into a buffer."""
+
+        return (self._shm.name, self.n_realisations, self.n_samples, self.precision)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(arr.nbytes for arr in self.arrays.values())
+
+    def slot(self, index: int) -> Dict[str, np.ndarray]:
+        """Writable ``(n_samples,)`` views of every channel for one realisation."""
+
+        return {name: self.arrays[name][index] for name in ANALOG_CHANNELS + (COUNTS_CHANNEL,)}
+
+    def as_data(self) -> Dict[str, Any]:
+        """Zero-copy channel mapping in the batched validator layout."""
+
+        data: Dict[str, Any] = {name: self.arrays[name] for name in ANALOG_CHANNELS + (COUNTS_CHANNEL,)}
+        data["heating_rate"] = self.arrays["heating_rate"]
+        data["metadata"] = {
+            "n_realisations": self.n_realisations,
+            "n_samples": self.n_samples,
+            "seeds": self.arrays["seed"].tolist(),
+        }
+        return data
+
+    def close(self) -> None:
+        """Release the views and detach; the owner also unlinks the block."""
+
+        self.arrays = {}
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+
+    def __enter__(self) -> "EnsembleBuffer":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def simulate_into(
+    buffer: EnsembleBuffer, index: int, dt_s: float, cfg: BackgroundConfig, seed: int
+) -> None:
+    """Simulate one realisation directly into slot ``index`` of ``buffer``."""
+
+    if cfg.precision != buffer.precision:
+        raise ValueError(f"cfg.precision {cfg.precision!r} does not match the buffer's {buffer.precision!r}")
+    data = simulate_background_timeseries(
+        n_samples=buffer.n_samples, dt_s=dt_s, cfg=cfg, seed=seed, out=buffer.slot(index)
+    )
+    buffer.arrays["heating_rate"][index] = data["heating_rate"]
+    buffer.arrays["seed"][index] = seed
+
+
+def _worker(descriptor: Descriptor, index: int, dt_s: float, cfg: BackgroundConfig, seed: int) -> int:
+    buffer = EnsembleBuffer.attach(descriptor)
+    try:
+        simulate_into(buffer, index, dt_s, cfg, seed)
+    finally:
+        buffer.close()
+    return index
+
+
+def simulate_ensemble(
+    buffer: EnsembleBuffer,
+    dt_s: float,
+    cfg: BackgroundConfig,
+    seeds: Sequence[int],
+    max_workers: Optional[int] = None,
+) -> EnsembleBuffer:
+    """Fill every slot of ``buffer`` with the realisation for ``seeds[i]``.
+
+    ``max_workers=0`` simulates sequentially in this process; otherwise the
+    realisations run in a process pool whose tasks return only their index.
+    """
+
+    if len(seeds) != buffer.n_realisations:
+        raise ValueError("need exactly one seed per realisation")
+    if max_workers == 0:
+        for index, seed in enumerate(seeds):
+            simulate_into(buffer, index, dt_s, cfg, int(seed))
+        return buffer
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(_worker, buffer.descriptor, index, dt_s, cfg, int(seed))
+            for index, seed in enumerate(seeds)
+        ]
+        for future in futures:
+            future.result()
+    return buffer
@@ -1,5 +1,16 @@
 """Guardian validation helpers for background assessment."""
 
-from .guardian_background_validator import guardian_check_backgrounds
+from .background_statistics import BackgroundStats, compute_background_stats
+from .guardian_background_validator import (
+    StreamingGuardianValidator,
+    guardian_check_backgrounds,
+    guardian_check_backgrounds_batch,
+)
 
-__all__ = ["guardian_check_backgrounds"]
+__all__ = [
+    "BackgroundStats",
+    "StreamingGuardianValidator",
+    "compute_background_stats",
+    "guardian_check_backgrounds",
+    "guardian_check_backgrounds_batch",
+]
@@ -0,0 +1,186 @@
+"""Fused single-pass statistics shared by the Guardian background validators.
+
+:func:`compute_background_stats` reads every channel once.  Analog channels
+are reduced block by block (each block is cache-resident while its mean and
+sum of squared deviations are taken, and blocks are combined with Chan's
+parallel update).  Detector counts are reduced to a ``np.bincount``
+histogram, from which their moments and the Poisson null test follow without
+touching the samples again.  Compact channels (float32 analog samples,
+int16/int32 counts) are widened to float64 one block at a time, never as a
+whole-trace copy.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+
+# Samples reduced per block (512 KiB of float64).
+DEFAULT_BLOCK_SIZE = 1 << 16
+ANALOG_CHANNELS = ("em_pickup", "surface_drift")
+COUNTS_CHANNEL = "detector_counts"
+
+
+@dataclass
+class ChannelStats:
+    """Count, mean and sum of squared deviations of one channel (mergeable)."""
+
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    @property
+    def var(self) -> float:
+        """Population variance (``ddof=0``), matching ``np.var``."""
+
+        return self.m2 / self.n if self.n else float("nan")
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.var))
+
+    def merge(self, other: "ChannelStats") -> "ChannelStats":
+        """Combine with statistics of a disjoint block of samples."""
+
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.mean, self.m2 = other.n, other.mean, other.m2
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+        return self
+
+    @classmethod
+    def from_block(cls, x: np.ndarray) -> "ChannelStats":
+        x = np.asarray(x, dtype=np.float64).ravel()
+        if x.size == 0:
+            return cls()
+        mean = float(np.mean(x))
+        dev = x - mean
+        return cls(n=int(x.size), mean=mean, m2=float(np.dot(dev, dev)))
+
+    @classmethod
+    def from_array(cls, x: np.ndarray, block_size: int = DEFAULT_BLOCK_SIZE) -> "ChannelStats":
+        """Reduce ``x`` in cache-sized blocks with a single read of memory."""
+
+        x = np.asarray(x).ravel()
+        out = cls()
+        for start in range(0, x.size, block_size):
+            out.merge(cls.from_block(x[start : start + block_size]))
+        return out
+
+    @classmethod
+    def from_histogram(cls, hist: np.ndarray) -> "ChannelStats":
+        """Exact moments of integer samples from ``hist[k]`` = occurrences of ``k``."""
+
+        hist = np.asarray(hist, dtype=np.float64)
+        n = float(hist.sum())
+        if n == 0:
+            return cls()
+        k = np.arange(hist.size, dtype=np.float64)
+        mean = float(hist @ k) / n
+        dev = k - mean
+        return cls(n=int(n), mean=mean, m2=float(hist @ (dev * dev)))
+
+
+@dataclass
+class BackgroundStats:
+    """Per-channel statistics of a background dataset.
+
+    ``counts_histogram`` is *None* when detector counts are not non-negative
+    integers; validators then fall back to the raw samples.
+    """
+
+    channels: Dict[str, ChannelStats] = field(default_factory=dict)
+    counts_histogram: Optional[np.ndarray] = None
+    heating_rate_abs_mean: float = 0.0
+
+    def merge(self, other: "BackgroundStats") -> "BackgroundStats":
+        """Combine with statistics of the following samples of the same dataset."""
+
+        for name, stats in other.channels.items():
+            self.channels.setdefault(name, ChannelStats()).merge(stats)
+        if other.counts_histogram is not None:
+            if self.counts_histogram is None:
+                self.counts_histogram = other.counts_histogram.copy()
+            else:
+                width = max(self.counts_histogram.size, other.counts_histogram.size)
+                hist = np.zeros(width, dtype=np.int64)
+                hist[: self.counts_histogram.size] += self.counts_histogram
+                hist[: other.counts_histogram.size] += other.counts_histogram
+                self.counts_histogram = hist
+        return self
+
+
+class BlockedChannelReducer:
+    """Streaming :meth:`ChannelStats.from_array` with identical block boundaries.
+
+    Incoming samples are buffered until a full ``block_size`` block is
+    available, so the reduced blocks, and therefore the rounding, match a
+    single batch reduction of the concatenated samples exactly.
+    """
+
+    def __init__(self, block_size: int = DEFAULT_BLOCK_SIZE) -> None:
+        self.block_size = int(block_size)
+        self.stats = ChannelStats()
+        self._pending: List[np.ndarray] = []
+        self._n_pending = 0
+
+    def update(self, x: np.ndarray) -> None:
+        x = np.asarray(x).ravel()
+        if x.size == 0:
+            return
+        self._pending.append(x)
+        self._n_pending += x.size
+        if self._n_pending < self.block_size:
+            return
+        buf = np.concatenate(self._pending) if len(self._pending) > 1 else x
+        full = (buf.size // self.block_size) * self.block_size
+        self.stats.merge(ChannelStats.from_array(buf[:full], self.block_size))
+        rest = buf[full:].copy()
+        self._pending = [rest] if rest.size else []
+        self._n_pending = rest.size
+
+    def finalize(self) -> ChannelStats:
+        """Statistics over all samples, including the trailing partial block."""
+
+        out = ChannelStats(self.stats.n, self.stats.mean, self.stats.m2)
+        if self._n_pending:
+            out.merge(ChannelStats.from_block(np.concatenate(self._pending)))
+        return out
+
+
+def _counts_histogram(counts: np.ndarray) -> Optional[np.ndarray]:
+    counts = np.asarray(counts).ravel()
+    if not np.issubdtype(counts.dtype, np.integer):
+        return None
+    try:
+        return np.bincount(counts)
+    except (TypeError, ValueError):  # negative or unsigned 64-bit counts
+        return None
+
+
+def compute_background_stats(
+    data: Mapping, block_size: int = DEFAULT_BLOCK_SIZE
+) -> BackgroundStats:
+    """Compute all statistics the Guardian validators need in one pass per channel."""
+
+    stats = BackgroundStats()
+    for name in ANALOG_CHANNELS:
+        if name in data:
+            stats.channels[name] = ChannelStats.from_array(data[name], block_size)
+    if COUNTS_CHANNEL in data:
+        hist = _counts_histogram(data[COUNTS_CHANNEL])
+        stats.counts_histogram = hist
+        stats.channels[COUNTS_CHANNEL] = (
+            ChannelStats.from_histogram(hist)
+            if hist is not None
+            else ChannelStats.from_array(data[COUNTS_CHANNEL], block_size)
+        )
+    if "heating_rate" in data:
+        stats.heating_rate_abs_mean = float(np.mean(np.abs(np.asarray(data["heating_rate"], dtype=float))))
+    return stats
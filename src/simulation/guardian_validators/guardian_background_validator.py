@@ -1,21 +1,182 @@
 """Guardian background validation orchestration."""
 
-from typing import Dict
+from typing import Any, Dict, Mapping, Optional, Set
+
+import numpy as np
 
 from .signal_to_background_analyzer import passes_threshold
-from .null_hypothesis_tests import null_is_consistent
-from .background_characterization import background_inventory_complete
+from .null_hypothesis_tests import (
+    PoissonHistogram,
+    count_histograms,
+    histogram_p_values,
+    null_is_consistent,
+)
+from .background_characterization import REQUIRED_CHANNELS, background_inventory_complete
+from .background_statistics import (
+    ANALOG_CHANNELS,
+    COUNTS_CHANNEL,
+    DEFAULT_BLOCK_SIZE,
+    BackgroundStats,
+    BlockedChannelReducer,
+    ChannelStats,
+    compute_background_stats,
+)
 from .systematic_effect_analysis import quantify_contributions
 
 
-def guardian_check_backgrounds(data: Dict) -> Dict:
-    """Run the Guardian background validation checks and return a report."""
-
-    report = {"inventory_ok": background_inventory_complete(data)}
-    report["null_95_ok"] = null_is_consistent(counts=data["detector_counts"], alpha=0.05)
-    report["snr_10_ok"] = passes_threshold(data, threshold=10.0)
-    report["contributions"] = quantify_contributions(data)
+def _build_report(
+    inventory_ok: bool, stats: BackgroundStats, data: Optional[Dict] = None
+) -> Dict:
+    report = {"inventory_ok": inventory_ok}
+    # Streamed reports carry no raw samples: checks whose counts never arrived fail.
+    have_counts = data is not None or COUNTS_CHANNEL in stats.channels
+    counts = None if data is None else data["detector_counts"]
+    report["null_95_ok"] = have_counts and null_is_consistent(
+        counts=counts, alpha=0.05, background_stats=stats
+    )
+    report["snr_10_ok"] = have_counts and passes_threshold(data, threshold=10.0, stats=stats)
+    report["contributions"] = quantify_contributions(data, stats=stats)
     report["guardian_pass"] = all(
         [report["inventory_ok"], report["null_95_ok"], report["snr_10_ok"]]
     )
     return report
+
+
+def guardian_check_backgrounds(data: Dict, stats: Optional[BackgroundStats] = None) -> Dict:
+    """Run the Guardian background validation checks and return a report.
+
+    Channel statistics are computed once (or taken from ``stats``) and shared
+    by all checks.
+    """
+
+    if stats is None:
+        stats = compute_background_stats(data)
+    return _build_report(background_inventory_complete(data), stats, data)
+
+
+def _per_realisation_abs_mean(values: Any, n_realisations: int) -> np.ndarray:
+    rate = np.abs(np.asarray(values, dtype=float))
+    if rate.ndim == 2:
+        return rate.mean(axis=-1)
+    return np.broadcast_to(rate, (n_realisations,)).astype(float)
+
+
+def guardian_check_backgrounds_batch(data: Mapping[str, Any]) -> Dict:
+    """Vectorised Guardian checks over an ensemble of realisations.
+
+    Channel arrays have shape ``(n_realisations, n_samples)``;
+    ``heating_rate`` may be a scalar, one value per realisation, or a 2-D
+    array.  Returns a report with a ``table`` of per-realisation columns
+    (p-values, SNRs, variance contributions and pass flags, matching
+    :func:`guardian_check_backgrounds` row by row) and aggregate
+    ``pass_rates``.
+    """
+
+    counts = np.asarray(data[COUNTS_CHANNEL])
+    if counts.ndim != 2:
+        raise ValueError("batched channels must have shape (n_realisations, n_samples)")
+    n_real = counts.shape[0]
+    inventory_ok = background_inventory_complete(dict(data))
+
+    hist = count_histograms(counts)
+    if np.issubdtype(counts.dtype, np.integer):
+        k = np.arange(hist.shape[-1], dtype=np.float64)
+        n = hist.sum(axis=-1).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            counts_mean = hist @ k / n
+            counts_var = np.sum(hist * (k[None, :] - counts_mean[:, None]) ** 2, axis=-1) / n
+    else:
+        # Float counts: moments from the raw rows as in the single-dataset
+        # path; the rounded histogram is only used for the chi-square test.
+        counts_var = np.var(counts, axis=-1, dtype=np.float64)
+    p_values = histogram_p_values(hist)
+
+    counts_std = np.sqrt(counts_var)
+    denom = np.where(counts_std == 0, 1e-12, counts_std)
+    snr = _per_realisation_abs_mean(data["heating_rate"], n_real) / denom
+
+    table: Dict[str, np.ndarray] = {
+        "null_p_value": p_values,
+        "null_95_ok": p_values >= 0.05,
+        "snr": snr,
+        "snr_10_ok": snr >= 10.0,
+    }
+    for name in ANALOG_CHANNELS:
+        table[f"{name}_var"] = np.var(np.asarray(data[name]), axis=-1, dtype=np.float64)
+    table[f"{COUNTS_CHANNEL}_var"] = counts_var
+    table["guardian_pass"] = inventory_ok & table["null_95_ok"] & table["snr_10_ok"]
+
+    return {
+        "n_realisations": n_real,
+        "inventory_ok": inventory_ok,
+        "table": table,
+        "pass_rates": {
+            key: float(np.mean(table[key])) if n_real else float("nan")
+            for key in ("null_95_ok", "snr_10_ok", "guardian_pass")
+        },
+    }
+
+
+class StreamingGuardianValidator:
+    """Guardian background checks accumulated over chunks of a dataset.
+
+    Each :meth:`update` receives a mapping holding consecutive samples of some
+    or all channels; non-array entries (``heating_rate``, ``metadata``) may be
+    sent with any block.  :meth:`finalize` returns the same report that
+    :func:`guardian_check_backgrounds` gives for the concatenated channels,
+    while only one reduction block per channel is held in memory.
+    """
+
+    def __init__(self, block_size: int = DEFAULT_BLOCK_SIZE) -> None:
+        self.block_size = int(block_size)
+        self._keys: Set[str] = set()
+        self._analog = {name: BlockedChannelReducer(block_size) for name in ANALOG_CHANNELS}
+        self._counts_hist = PoissonHistogram()
+        self._counts_float: Optional[BlockedChannelReducer] = None
+        self._heating_abs_sum = 0.0
+        self._heating_n = 0
+
+    def update(self, block: Mapping[str, Any]) -> None:
+        """Accumulate the next chunk of channel samples."""
+
+        self._keys.update(block.keys())
+        for name, reducer in self._analog.items():
+            if name in block:
+                reducer.update(block[name])
+        if COUNTS_CHANNEL in block:
+            self._update_counts(np.asarray(block[COUNTS_CHANNEL]))
+        if "heating_rate" in block:
+            rate = np.abs(np.asarray(block["heating_rate"], dtype=float))
+            self._heating_abs_sum += float(np.sum(rate))
+            self._heating_n += rate.size
+
+    def _update_counts(self, counts: np.ndarray) -> None:
+        integer = np.issubdtype(counts.dtype, np.integer)
+        seen_integer = self._counts_float is None and self._counts_hist.n_samples > 0
+        if (integer and self._counts_float is not None) or (not integer and seen_integer):
+            raise ValueError("detector_counts blocks must keep a single dtype kind")
+        if not integer:
+            # Float counts: moments as in the batch path, histogram only for the null test.
+            if self._counts_float is None:
+                self._counts_float = BlockedChannelReducer(self.block_size)
+            self._counts_float.update(counts)
+        self._counts_hist.update(counts)
+
+    def finalize(self) -> Dict:
+        """Return the Guardian report over all samples seen so far."""
+
+        stats = BackgroundStats()
+        for name, reducer in self._analog.items():
+            if name in self._keys:
+                stats.channels[name] = reducer.finalize()
+        if COUNTS_CHANNEL in self._keys:
+            hist = self._counts_hist.hist
+            stats.counts_histogram = hist
+            stats.channels[COUNTS_CHANNEL] = (
+                self._counts_float.finalize()
+                if self._counts_float is not None
+                else ChannelStats.from_histogram(hist)
+            )
+        if self._heating_n:
+            stats.heating_rate_abs_mean = self._heating_abs_sum / self._heating_n
+        return _build_report(REQUIRED_CHANNELS.issubset(self._keys), stats)
@@ -1,20 +1,208 @@
-"""Null-hypothesis tests for Guardian background validation."""
+"""Null-hypothesis tests for Guardian background validation.
+
+The Poisson goodness-of-fit test works on count histograms built with
+``np.bincount``.  Cells whose expected occupancy falls below
+``MIN_EXPECTED`` are pooled into the lower and upper tails (the upper tail
+includes all probability mass beyond the histogram), which keeps the
+chi-square approximation valid.  One degree of freedom is lost to the
+estimated Poisson mean, so ``dof = n_cells - 2``.
+"""
+
+from typing import Optional, Tuple
 
 import numpy as np
 from scipy import stats
 
+from .background_statistics import BackgroundStats
+
+MIN_EXPECTED = 5.0
+
 
-def null_is_consistent(counts: np.ndarray, alpha: float = 0.05) -> bool:
-    """Perform a chi-squared goodness-of-fit test against a Poisson model."""
+def _as_counts(counts: np.ndarray) -> np.ndarray:
+    """Integer view of ``counts`` for ``np.bincount``; float counts are rounded to the nearest integer."""
 
     counts = np.asarray(counts)
-    lam = float(np.mean(counts))
-    values, observed = np.unique(counts, return_counts=True)
-    expected = stats.poisson(mu=lam).pmf(values) * len(counts)
-    mask = expected > 1e-6
-    if not np.any(mask):
-        return True
-    chi2 = np.sum((observed[mask] - expected[mask]) ** 2 / expected[mask])
-    dof = max(1, int(np.sum(mask)) - 1)
-    p_value = 1.0 - stats.chi2.cdf(chi2, dof)
-    return p_value >= alpha
+    if not np.issubdtype(counts.dtype, np.integer):
+        counts = np.rint(counts).astype(np.int64)
+    if counts.size and counts.min() < 0:
+        raise ValueError("Poisson counts must be non-negative")
+    return counts
+
+
+def _histogram_width(max_count: int, lam_max: float) -> int:
+    """Bins needed to cover the observed counts and the bulk of the fitted Poisson."""
+
+    return int(max(max_count, np.ceil(lam_max + 10.0 * np.sqrt(lam_max) + 10.0))) + 1
+
+
+def poisson_chi2_from_histograms(
+    hist: np.ndarray, min_expected: float = MIN_EXPECTED
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Chi-square statistic and degrees of freedom for rows of count histograms.
+
+    ``hist[..., k]`` is the number of samples with exactly ``k`` counts.  The
+    Poisson mean is fitted per row.  Rows with fewer than two pooled cells
+    get ``dof == 0``.
+    """
+
+    hist = np.asarray(hist, dtype=np.float64)
+    lead = hist.shape[:-1]
+    hist = hist.reshape(-1, hist.shape[-1])
+    rows = np.arange(hist.shape[0])
+    k = np.arange(hist.shape[-1])
+    n = hist.sum(axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        lam = np.where(n > 0, hist @ k / n, 0.0)
+    expected = n[:, None] * stats.poisson.pmf(k[None, :], lam[:, None])
+
+    # The pmf is unimodal, so cells with enough expected occupancy are contiguous.
+    interior = expected >= min_expected
+    has_cells = interior.any(axis=-1)
+    a = np.argmax(interior, axis=-1)
+    b = hist.shape[-1] - 1 - np.argmax(interior[:, ::-1], axis=-1)
+    below = k[None, :] < a[:, None]
+    above = k[None, :] > b[:, None]
+    obs_lo = np.sum(hist * below, axis=-1)
+    exp_lo = n * stats.poisson.cdf(a - 1, lam)
+    obs_hi = np.sum(hist * above, axis=-1)
+    exp_hi = n * stats.poisson.sf(b, lam)
+
+    # Tails too thin to stand alone are merged into the adjacent interior cell.
+    merge_lo = exp_lo < min_expected
+    merge_hi = exp_hi < min_expected
+    obs = np.where(interior, hist, 0.0)
+    exp = np.where(interior, expected, 0.0)
+    obs[rows, a] += np.where(merge_lo, obs_lo, 0.0)
+    exp[rows, a] += np.where(merge_lo, exp_lo, 0.0)
+    obs[rows, b] += np.where(merge_hi, obs_hi, 0.0)
+    exp[rows, b] += np.where(merge_hi, exp_hi, 0.0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cells = np.where(interior, (obs - exp) ** 2 / exp, 0.0).sum(axis=-1)
+        cells += np.where(merge_lo, 0.0, (obs_lo - exp_lo) ** 2 / exp_lo)
+        cells += np.where(merge_hi, 0.0, (obs_hi - exp_hi) ** 2 / exp_hi)
+    n_cells = interior.sum(axis=-1) + (~merge_lo) + (~merge_hi)
+    dof = np.where(has_cells, np.maximum(n_cells - 2, 0), 0)
+    statistic = np.where(dof > 0, cells, 0.0)
+    return statistic.reshape(lead), dof.reshape(lead)
+
+
+def _p_values(hist: np.ndarray) -> np.ndarray:
+    statistic, dof = poisson_chi2_from_histograms(hist)
+    return np.where(dof > 0, stats.chi2.sf(statistic, np.maximum(dof, 1)), 1.0)
+
+
+def histogram_p_value(hist: np.ndarray) -> float:
+    """p-value of the pooled test from a histogram (``hist[k]`` samples with ``k`` counts)."""
+
+    hist = np.asarray(hist)
+    n = hist.sum()
+    if n == 0:
+        return 1.0
+    lam = float(hist @ np.arange(hist.size)) / n
+    padded = np.zeros(_histogram_width(hist.size - 1, lam), dtype=np.int64)
+    padded[: hist.size] = hist
+    return float(_p_values(padded))
+
+
+def poisson_p_value(counts: np.ndarray) -> float:
+    """p-value of the pooled chi-square Poisson goodness-of-fit test."""
+
+    counts = _as_counts(counts).ravel()
+    if counts.size == 0:
+        return 1.0
+    width = _histogram_width(int(counts.max()), float(counts.mean()))
+    return float(_p_values(np.bincount(counts, minlength=width)))
+
+
+def count_histograms(counts: np.ndarray) -> np.ndarray:
+    """Histograms of every row of a ``(..., n_samples)`` count array.
+
+    All rows are histogrammed with a single ``np.bincount`` over row-offset
+    indices; the common width also covers the bulk of each row's fitted
+    Poisson distribution.
+    """
+
+    counts = _as_counts(counts)
+    lead = counts.shape[:-1]
+    flat = counts.reshape(-1, counts.shape[-1])
+    if flat.shape[-1] == 0:
+        return np.zeros(lead + (1,), dtype=np.int64)
+    width = _histogram_width(int(flat.max()), float(flat.mean(axis=-1).max()))
+    offsets = np.arange(flat.shape[0], dtype=np.int64)[:, None] * width
+    hist = np.bincount((flat + offsets).ravel(), minlength=flat.shape[0] * width)
+    return hist.reshape(lead + (width,))
+
+
+def histogram_p_values(hist: np.ndarray) -> np.ndarray:
+    """p-values for each row of padded histograms from :func:`count_histograms`."""
+
+    return _p_values(hist)
+
+
+def poisson_p_values_batch(counts: np.ndarray) -> np.ndarray:
+    """p-values for every row of a ``(..., n_samples)`` count array."""
+
+    return histogram_p_values(count_histograms(counts))
+
+
+def null_is_consistent(
+    counts: np.ndarray, alpha: float = 0.05, background_stats: Optional[BackgroundStats] = None
+) -> bool:
+    """Perform a chi-squared goodness-of-fit test against a Poisson model.
+
+    When ``background_stats`` carries a counts histogram the samples are not
+    read again.
+    """
+
+    if background_stats is not None and background_stats.counts_histogram is not None:
+        return histogram_p_value(background_stats.counts_histogram) >= alpha
+    return poisson_p_value(counts) >= alpha
+
+
+def null_is_consistent_batch(counts: np.ndarray, alpha: float = 0.05) -> np.ndarray:
+    """Vectorised :func:`null_is_consistent` over the rows of ``counts``."""
+
+    return poisson_p_values_batch(counts) >= alpha
+
+
+class PoissonHistogram:
+    """Count histogram accumulated block by block for the Poisson null test."""
+
+    def __init__(self) -> None:
+        self.hist = np.zeros(0, dtype=np.int64)
+
+    @property
+    def n_samples(self) -> int:
+        return int(self.hist.sum())
+
+    def update(self, counts: np.ndarray) -> None:
+        """Add a block of counts to the histogram."""
+
+        counts = _as_counts(counts).ravel()
+        if counts.size:
+            self.update_histogram(np.bincount(counts))
+
+    def update_histogram(self, hist: np.ndarray) -> None:
+        """Add precomputed histogram counts (``hist[k]`` samples with ``k`` counts)."""
+
+        hist = np.asarray(hist, dtype=np.int64)
+        if hist.size > self.hist.size:
+            grown = np.zeros(hist.size, dtype=np.int64)
+            grown[: self.hist.size] = self.hist
+            self.hist = grown
+        self.hist[: hist.size] += hist
+
+    def merge(self, other: "PoissonHistogram") -> "PoissonHistogram":
+        """Add another histogram (e.g. from a worker) into this one."""
+
+        self.update_histogram(other.hist)
+        return self
+
+    def p_value(self) -> float:
+        """p-value of the pooled chi-square test over all samples seen so far."""
+
+        return histogram_p_value(self.hist)
+
+    def is_consistent(self, alpha: float = 0.05) -> bool:
+        return self.p_value() >= alpha
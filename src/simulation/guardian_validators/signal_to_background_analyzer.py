@@ -1,20 +1,31 @@
 """Signal-to-background estimators used by the Guardian background validator."""
 
-from typing import Dict
+from typing import Dict, Optional
 
 import numpy as np
 
+from .background_statistics import COUNTS_CHANNEL, BackgroundStats
 
-def estimate_snr(data: Dict) -> float:
-    """Compute a simple SNR proxy for a claimed background signature."""
 
+def estimate_snr(data: Dict, stats: Optional[BackgroundStats] = None) -> float:
+    """Compute a simple SNR proxy for a claimed background signature.
+
+    Precomputed ``stats`` (see :func:`compute_background_stats`) avoid
+    re-reading the detector counts.
+    """
+
+    if stats is not None and COUNTS_CHANNEL in stats.channels:
+        signal = stats.heating_rate_abs_mean
+        denom = stats.channels[COUNTS_CHANNEL].std or 1e-12
+        return float(signal / denom)
     heating_rate = np.asarray(data["heating_rate"], dtype=float)
-    counts = np.asarray(data["detector_counts"], dtype=float)
-    denom = np.std(counts) or 1e-12
+    denom = np.std(data["detector_counts"], dtype=np.float64) or 1e-12
     return float(np.mean(np.abs(heating_rate)) / denom)
 
 
-def passes_threshold(data: Dict, threshold: float = 10.0) -> bool:
+def passes_threshold(
+    data: Dict, threshold: float = 10.0, stats: Optional[BackgroundStats] = None
+) -> bool:
     """Return whether the dataset satisfies the Guardian SNR threshold."""
 
-    return estimate_snr(data) >= threshold
+    return estimate_snr(data, stats=stats) >= threshold
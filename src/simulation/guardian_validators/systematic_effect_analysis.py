@@ -1,15 +1,27 @@
 """Systematic effect quantification utilities for Guardian validations."""
 
-from typing import Dict
+from typing import Dict, Optional
 
 import numpy as np
 
+from .background_statistics import BackgroundStats
 
-def quantify_contributions(data: Dict) -> Dict[str, float]:
-    """Return simple variance-based contribution metrics for background channels."""
+CONTRIBUTION_CHANNELS = ("em_pickup", "surface_drift", "detector_counts")
 
+
+def quantify_contributions(data: Dict, stats: Optional[BackgroundStats] = None) -> Dict[str, float]:
+    """Return simple variance-based contribution metrics for background channels.
+
+    With ``stats``, channels that were never seen report ``nan``.
+    """
+
+    if stats is not None:
+        return {
+            f"{name}_var": float(stats.channels[name].var) if name in stats.channels else float("nan")
+            for name in CONTRIBUTION_CHANNELS
+        }
     return {
-        "em_pickup_var": float(np.var(data["em_pickup"])),
-        "surface_drift_var": float(np.var(data["surface_drift"])),
-        "detector_counts_var": float(np.var(data["detector_counts"])),
+        "em_pickup_var": float(np.var(data["em_pickup"], dtype=np.float64)),
+        "surface_drift_var": float(np.var(data["surface_drift"], dtype=np.float64)),
+        "detector_counts_var": float(np.var(data["detector_counts"], dtype=np.float64)),
     }
@@ -0,0 +1,199 @@
+"""Content-addressed on-disk cache for background simulation outputs.
+
+:func:`simulate_background_timeseries` is deterministic in ``(n_samples,
+dt_s, cfg, seed)``.  Entries are keyed by the SHA-256 of those inputs plus a
+hash of the simulator source code, so editing a noise model invalidates old
+entries automatically.  Each entry is a directory of ``<channel>.npy`` files
+(opened read-only with ``mmap_mode="r"``) and an ``entry.json`` holding the
+scalar outputs.
+
+Writers build an entry in a private temporary directory and publish it with
+a single ``os.rename``; a concurrent writer that loses the race discards its
+copy.  The cache is bounded by ``max_bytes`` and evicts least recently used
+entries (use refreshes the ``entry.json`` modification time).
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from dataclasses import asdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .background_effects_simulator import BackgroundConfig, simulate_background_timeseries
+
+DEFAULT_CACHE_DIR = Path("artifacts/cache/simulations")
+DEFAULT_MAX_BYTES = 4 << 30
+ENTRY_FILE = "entry.json"
+ARRAY_CHANNELS = ("position", "em_pickup", "surface_drift", "detector_counts")
+_TMP_PREFIX = ".tmp-"
+
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    """SHA-256 over the simulator sources that determine the cached outputs."""
+
+    package = Path(__file__).resolve().parent
+    sources = [package / "background_effects_simulator.py"]
+    sources += sorted((package / "background_effects").glob("*.py"))
+    digest = hashlib.sha256()
+    for path in sources:
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def cache_key(n_samples: int, dt_s: float, cfg: BackgroundConfig, seed: int) -> str:
+    """Stable hex key for a simulation call (floats are hashed by exact repr)."""
+
+    payload = json.dumps(
+        {
+            "n_samples": int(n_samples),
+            "dt_s": float(dt_s),
+            "seed": int(seed),
+            "config": asdict(cfg),
+            "code": code_version(),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SimulationCache:
+    """Size-bounded LRU cache of simulation outputs below ``root``."""
+
+    def __init__(self, root: Union[str, Path] = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached outputs for ``key`` with memory-mapped arrays, or *None*."""
+
+        entry = self._entry_dir(key)
+        try:
+            meta = json.loads((entry / ENTRY_FILE).read_text(encoding="utf-8"))
+            data: Dict[str, Any] = {
+                name: np.load(entry / f"{name}.npy", mmap_mode="r") for name in meta["arrays"]
+            }
+            os.utime(entry / ENTRY_FILE)
+        except (FileNotFoundError, json.JSONDecodeError):
+            # Missing, or evicted by another process between the reads.
+            return None
+        data.update(meta["scalars"])
+        return data
+
+    def put(self, key: str, data: Dict[str, Any]) -> Path:
+        """Store ``data`` atomically under ``key`` and enforce the size bound."""
+
+        entry = self._entry_dir(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp = entry.parent / f"{_TMP_PREFIX}{uuid.uuid4().hex}"
+        tmp.mkdir()
+        try:
+            arrays = [name for name in ARRAY_CHANNELS if name in data]
+            for name in arrays:
+                np.save(tmp / f"{name}.npy", np.asarray(data[name]), allow_pickle=False)
+            scalars = {k: v for k, v in data.items() if k not in arrays}
+            (tmp / ENTRY_FILE).write_text(
+                json.dumps({"arrays": arrays, "scalars": scalars}, default=_json_default),
+                encoding="utf-8",
+            )
+            try:
+                os.rename(tmp, entry)
+            except OSError:
+                if not (entry / ENTRY_FILE).exists():
+                    raise
+                # Another writer published the same key first; keep theirs.
+        finally:
+            if tmp.exists():
+                shutil.rmtree(tmp, ignore_errors=True)
+        self.evict()
+        return entry
+
+    def entries(self) -> List[Tuple[float, int, Path]]:
+        """``(last_used, size_bytes, path)`` for every published entry."""
+
+        out = []
+        if not self.root.exists():
+            return out
+        for shard in self.root.iterdir():
+            if not shard.is_dir():
+                continue
+            for entry in shard.iterdir():
+                if entry.name.startswith(_TMP_PREFIX):
+                    continue
+                try:
+                    used = (entry / ENTRY_FILE).stat().st_mtime
+                    size = sum(f.stat().st_size for f in entry.iterdir())
+                except FileNotFoundError:
+                    continue
+                out.append((used, size, entry))
+        return out
+
+    def size_bytes(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits ``max_bytes``."""
+
+        entries = sorted(self.entries(), key=lambda item: item[0])
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            # Rename first so readers never observe a partially deleted entry;
+            # open memory maps stay valid after the files are unlinked.
+            doomed = entry.parent / f"{_TMP_PREFIX}{uuid.uuid4().hex}"
+            try:
+                os.rename(entry, doomed)
+            except FileNotFoundError:
+                continue
+            shutil.rmtree(doomed, ignore_errors=True)
+            total -= size
+
+    def clear(self) -> None:
+        if self.root.exists():
+            shutil.rmtree(self.root)
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Cannot serialise {type(obj).__name__} in a cache entry")
+
+
+def cached_simulate_background_timeseries(
+    n_samples: int,
+    dt_s: float,
+    cfg: BackgroundConfig,
+    seed: int = 0,
+    cache: Optional[SimulationCache] = None,
+) -> Dict[str, Any]:
+    """:func:`simulate_background_timeseries` backed by a :class:`SimulationCache`.
+
+    Cached channel arrays are read-only memory maps; copy before modifying
+    them.  The ``metadata`` entry round-trips through JSON, so tuples in the
+    configuration come back as lists.
+    """
+
+    cache = cache if cache is not None else SimulationCache()
+    key = cache_key(n_samples, dt_s, cfg, seed)
+    data = cache.get(key)
+    if data is not None:
+        return data
+    fresh = simulate_background_timeseries(n_samples=n_samples, dt_s=dt_s, cfg=cfg, seed=seed)
+    cache.put(key, fresh)
+    # Re-read so hits and misses return the same read-only arrays; fall back
+    # to the fresh result if the entry alone exceeds the size bound.
+    data = cache.get(key)
+    return fresh if data is None else data
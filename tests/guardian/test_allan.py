@@ -0,0 +1,77 @@
+import numpy as np
+
+from simulation.analysis.allan import (
+    StreamingAllan,
+    allan_variance,
+    averaging_factors,
+    default_taus,
+)
+
+
+def _block_mean_avar(x, dt_s, taus):
+    out = []
+    for m in averaging_factors(taus, dt_s):
+        blocks = len(x) // m
+        if blocks < 2:
+            out.append(np.nan)
+            continue
+        means = np.mean(x[: blocks * m].reshape(blocks, m), axis=1)
+        out.append(0.5 * np.mean(np.diff(means) ** 2))
+    return np.array(out)
+
+
+def _overlapping_avar(x, m):
+    means = np.convolve(x, np.ones(m) / m, mode="valid")
+    return 0.5 * np.mean((means[m:] - means[:-m]) ** 2)
+
+
+def _mvar(x, m):
+    phase = np.concatenate([[0.0], np.cumsum(x)])
+    second = phase[2 * m :] - 2 * phase[m:-m] + phase[: -2 * m]
+    inner = np.convolve(second, np.ones(m), mode="valid")
+    return np.mean(inner**2) / (2 * m**4)
+
+
+def test_estimators_match_direct_definitions():
+    rng = np.random.default_rng(11)
+    x = 3.0 + rng.normal(size=1500)
+    dt = 1e-3
+    taus = default_taus(x.size, dt)
+    classic = allan_variance(x, dt, overlapping=False, chunk_terms=17)
+    np.testing.assert_allclose(classic.variance, _block_mean_avar(x, dt, taus), rtol=1e-10)
+
+    chosen = [1e-3, 4e-3, 0.03]
+    ov = allan_variance(x, dt, chosen, chunk_terms=100)
+    np.testing.assert_allclose(ov.variance, [_overlapping_avar(x, m) for m in ov.m], rtol=1e-10)
+    mod = allan_variance(x, dt, chosen, modified=True)
+    np.testing.assert_allclose(mod.variance, [_mvar(x, m) for m in mod.m], rtol=1e-10)
+    # White frequency noise: AVAR(m) ~ sigma^2 / m.
+    np.testing.assert_allclose(ov.variance * ov.m, 1.0, rtol=0.3)
+
+
+def test_short_records_and_batches():
+    assert np.isnan(allan_variance(np.ones(1), 1e-3, overlapping=False).variance).all()
+    rng = np.random.default_rng(2)
+    batch = rng.normal(size=(4, 800))
+    result = allan_variance(batch, 1e-3, modified=True)
+    assert result.variance.shape == (4, result.taus.size)
+    np.testing.assert_allclose(result.variance[2], allan_variance(batch[2], 1e-3, modified=True).variance)
+    lo, hi = allan_variance(batch[0], 1e-3).confidence_interval(0.95)
+    dev = allan_variance(batch[0], 1e-3).deviation
+    finite = np.isfinite(dev)
+    assert np.all(lo[finite] < dev[finite]) and np.all(dev[finite] < hi[finite])
+
+
+def test_streaming_matches_batch():
+    rng = np.random.default_rng(5)
+    x = rng.normal(size=(2, 3000)) + 1e3
+    dt = 1e-4
+    taus = default_taus(x.shape[-1], dt)
+    cuts = [1, 13, 400, 401, 2500]
+    for overlapping, modified in [(True, False), (False, False), (True, True)]:
+        stream = StreamingAllan(dt, taus, overlapping=overlapping, modified=modified)
+        for block in np.array_split(x, cuts, axis=-1):
+            stream.update(block)
+        batch = allan_variance(x, dt, taus, overlapping=overlapping, modified=modified)
+        np.testing.assert_allclose(stream.result().variance, batch.variance, rtol=1e-9)
+        np.testing.assert_allclose(stream.result().edf, batch.edf)
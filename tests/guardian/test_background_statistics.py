@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from simulation.guardian_validators.background_statistics import (
+    ChannelStats,
+    compute_background_stats,
+)
+from simulation.guardian_validators.guardian_background_validator import (
+    guardian_check_backgrounds,
+)
+from simulation.guardian_validators.null_hypothesis_tests import null_is_consistent
+from simulation.guardian_validators.signal_to_background_analyzer import estimate_snr
+from simulation.guardian_validators.systematic_effect_analysis import quantify_contributions
+
+
+def _dataset(rng, n=50_000):
+    return {
+        "position": rng.normal(size=n),
+        "em_pickup": 1e3 + rng.normal(size=n),
+        "surface_drift": rng.normal(scale=1e-3, size=n),
+        "detector_counts": rng.poisson(0.3, size=n),
+        "heating_rate": 2.5,
+        "metadata": {},
+    }
+
+
+def test_fused_stats_match_numpy():
+    rng = np.random.default_rng(1)
+    data = _dataset(rng)
+    stats = compute_background_stats(data, block_size=1000)
+    for name in ("em_pickup", "surface_drift", "detector_counts"):
+        assert stats.channels[name].n == data[name].size
+        assert stats.channels[name].mean == pytest.approx(np.mean(data[name]), rel=1e-12)
+        assert stats.channels[name].var == pytest.approx(np.var(data[name]), rel=1e-10)
+    np.testing.assert_array_equal(stats.counts_histogram, np.bincount(data["detector_counts"]))
+
+    assert quantify_contributions(data, stats=stats) == pytest.approx(quantify_contributions(data), rel=1e-10)
+    assert estimate_snr(data, stats=stats) == pytest.approx(estimate_snr(data), rel=1e-10)
+    assert null_is_consistent(data["detector_counts"], background_stats=stats) == null_is_consistent(data["detector_counts"])
+
+
+def test_stats_merge_and_float_counts():
+    rng = np.random.default_rng(2)
+    head, tail = _dataset(rng, 3000), _dataset(rng, 5000)
+    merged = compute_background_stats(head).merge(compute_background_stats(tail))
+    whole = np.concatenate([head["em_pickup"], tail["em_pickup"]])
+    assert merged.channels["em_pickup"].var == pytest.approx(np.var(whole), rel=1e-10)
+    counts = np.concatenate([head["detector_counts"], tail["detector_counts"]])
+    np.testing.assert_array_equal(merged.counts_histogram, np.bincount(counts))
+    assert ChannelStats().merge(ChannelStats.from_block(whole)).n == whole.size
+
+    head["detector_counts"] = head["detector_counts"].astype(float)
+    stats = compute_background_stats(head)
+    assert stats.counts_histogram is None
+    report = guardian_check_backgrounds(head, stats=stats)
+    assert report == guardian_check_backgrounds(head)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from simulation.guardian_validators import (
+    guardian_check_backgrounds,
+    guardian_check_backgrounds_batch,
+)
+
+
+def _ensemble(rng, n_real=40, n_samples=3000):
+    counts = rng.poisson(2.0, size=(n_real, n_samples))
+    counts[:5] = rng.negative_binomial(2, 0.5, size=(5, n_samples))  # overdispersed rows
+    return {
+        "position": rng.normal(size=(n_real, n_samples)),
+        "em_pickup": rng.normal(size=(n_real, n_samples)),
+        "surface_drift": rng.normal(scale=2.0, size=(n_real, n_samples)),
+        "detector_counts": counts,
+        "heating_rate": np.linspace(0.0, 30.0, n_real),
+        "metadata": {},
+    }
+
+
+@pytest.mark.parametrize("float_counts", [False, True])
+def test_batch_rows_match_single_reports(float_counts):
+    data = _ensemble(np.random.default_rng(0))
+    if float_counts:
+        # Non-integer values: the variance must come from the raw samples, not the rounded histogram.
+        data["detector_counts"] = data["detector_counts"] + np.random.default_rng(1).uniform(
+            -0.45, 0.45, size=data["detector_counts"].shape
+        )
+    report = guardian_check_backgrounds_batch(data)
+    table = report["table"]
+    assert report["n_realisations"] == 40 and report["inventory_ok"]
+    for i in (0, 3, 17, 39):
+        single = guardian_check_backgrounds(
+            {key: (value[i] if key != "metadata" else value) for key, value in data.items()}
+        )
+        assert bool(table["null_95_ok"][i]) == single["null_95_ok"]
+        assert bool(table["snr_10_ok"][i]) == single["snr_10_ok"]
+        assert bool(table["guardian_pass"][i]) == single["guardian_pass"]
+        for key, value in single["contributions"].items():
+            assert table[key][i] == pytest.approx(value, rel=1e-10)
+    assert not table["null_95_ok"][:5].any()
+    assert report["pass_rates"]["guardian_pass"] == pytest.approx(np.mean(table["guardian_pass"]))
+
+
+def test_batch_requires_two_dimensional_channels():
+    data = _ensemble(np.random.default_rng(1), n_real=6, n_samples=100)
+    data["detector_counts"] = data["detector_counts"][0]
+    with pytest.raises(ValueError):
+        guardian_check_backgrounds_batch(data)
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from simulation.background_effects_simulator import (
+    BackgroundConfig,
+    ChannelMemo,
+    simulate_background_timeseries,
+)
+
+CHANNELS = ("position", "em_pickup", "surface_drift", "detector_counts")
+
+
+def _run(cfg, memo, seed=3):
+    return simulate_background_timeseries(2000, 1e-4, cfg, seed=seed, memo=memo)
+
+
+def _misses(memo, cfg, seed=3):
+    before = memo.misses
+    _run(cfg, memo, seed)
+    return memo.misses - before
+
+
+def test_memoized_output_matches_direct_simulation():
+    memo = ChannelMemo()
+    cfg = BackgroundConfig(em_amp_jitter=0.1, mains_harmonics=(1.0, 0.3))
+    direct = simulate_background_timeseries(2000, 1e-4, cfg, seed=3)
+    first = _run(cfg, memo)
+    again = _run(cfg, memo)
+    assert memo.misses == 4 and memo.hits == 4
+    for name in CHANNELS:
+        np.testing.assert_array_equal(first[name], direct[name])
+        np.testing.assert_array_equal(again[name], direct[name])
+        assert not again[name].flags.writeable
+    assert again["heating_rate"] == direct["heating_rate"]
+
+
+def test_only_dependent_channels_are_recomputed():
+    memo = ChannelMemo()
+    base = BackgroundConfig()
+    _run(base, memo)
+    assert _misses(memo, BackgroundConfig(mains_hz=60.0)) == 1
+    assert _misses(memo, BackgroundConfig(photon_rate_bg_cps=500.0)) == 1
+    assert _misses(memo, BackgroundConfig(patch_corr_time_s=2.0)) == 1
+    assert _misses(memo, BackgroundConfig(em_broadband_rel=0.0)) == 1
+    assert _misses(memo, base, seed=4) == 4
+
+    changed = BackgroundConfig(mains_hz=60.0)
+    np.testing.assert_array_equal(
+        _run(changed, memo)["surface_drift"],
+        simulate_background_timeseries(2000, 1e-4, changed, seed=3)["surface_drift"],
+    )
+
+
+def test_changed_draw_count_invalidates_downstream_channels():
+    memo = ChannelMemo()
+    _run(BackgroundConfig(), memo)
+    jittered = BackgroundConfig(em_amp_jitter=0.2)
+    # Jitter consumes extra draws, so surface and detector see a new RNG state.
+    assert _misses(memo, jittered) == 3
+    direct = simulate_background_timeseries(2000, 1e-4, jittered, seed=3)
+    np.testing.assert_array_equal(_run(jittered, memo)["detector_counts"], direct["detector_counts"])
+
+
+def test_memo_is_bounded():
+    memo = ChannelMemo(max_bytes=2000 * 8 * 4)
+    for seed in range(5):
+        _run(BackgroundConfig(), memo, seed=seed)
+    assert memo._bytes <= memo.max_bytes
+    with pytest.raises(ValueError):
+        _run(BackgroundConfig(), memo, seed=4)["em_pickup"][0] = 1.0
+
+
+def test_broadband_level_is_configurable():
+    quiet = simulate_background_timeseries(20_000, 1e-4, BackgroundConfig(em_broadband_rel=0.0), seed=3)
+    noisy = simulate_background_timeseries(20_000, 1e-4, BackgroundConfig(em_broadband_rel=1.0), seed=3)
+    assert np.std(noisy["em_pickup"]) > 1.3 * np.std(quiet["em_pickup"])
+    np.testing.assert_array_equal(noisy["detector_counts"], quiet["detector_counts"])
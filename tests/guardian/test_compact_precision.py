@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from simulation.analysis.allan import StreamingAllan, allan_variance
+from simulation.analysis.spectral import welch_psd, welch_psd_batch
+from simulation.background_effects.detection_noise import DetectorModel
+from simulation.background_effects_simulator import BackgroundConfig, simulate_background_timeseries
+from simulation.guardian_validators import guardian_check_backgrounds
+from simulation.guardian_validators.signal_to_background_analyzer import estimate_snr
+
+ANALOG = ("position", "em_pickup", "surface_drift")
+
+
+def _pair(**overrides):
+    full = simulate_background_timeseries(20000, 1e-4, BackgroundConfig(**overrides), seed=5)
+    compact = simulate_background_timeseries(
+        20000, 1e-4, BackgroundConfig(precision="compact", **overrides), seed=5
+    )
+    return full, compact
+
+
+def test_compact_channels_are_rounded_float64_channels():
+    full, compact = _pair(em_amp_jitter=0.1)
+    for name in ANALOG:
+        assert compact[name].dtype == np.float32
+        err = np.abs(compact[name].astype(np.float64) - full[name])
+        assert np.all(err <= 2.0**-24 * np.abs(full[name]))
+    assert compact["detector_counts"].dtype == np.int16
+    np.testing.assert_array_equal(compact["detector_counts"], full["detector_counts"])
+    assert compact["heating_rate"] == full["heating_rate"]
+
+
+def test_counts_widen_to_int32_when_rate_requires():
+    _, compact = _pair(photon_rate_bg_cps=5e7, detector=DetectorModel(dark_cps=1.0))
+    assert compact["detector_counts"].dtype == np.int32
+
+
+def test_unknown_precision_is_rejected():
+    with pytest.raises(ValueError):
+        simulate_background_timeseries(10, 1e-4, BackgroundConfig(precision="half"))
+
+
+def test_validators_and_analysis_accept_compact_channels():
+    full, compact = _pair()
+    report_full = guardian_check_backgrounds(full)
+    report_compact = guardian_check_backgrounds(compact)
+    for key in ("null_95_ok", "snr_10_ok", "guardian_pass"):
+        assert report_compact[key] == report_full[key]
+    for key, value in report_full["contributions"].items():
+        assert report_compact["contributions"][key] == pytest.approx(value, rel=1e-6)
+    # Without precomputed statistics the estimators read the compact arrays directly.
+    assert estimate_snr(compact) == pytest.approx(estimate_snr(full), rel=1e-12)
+
+    x32, x64 = compact["surface_drift"], full["surface_drift"]
+    taus = [1e-3, 1e-2, 1e-1]
+    np.testing.assert_allclose(
+        allan_variance(x32, 1e-4, taus).variance, allan_variance(x64, 1e-4, taus).variance, rtol=1e-5
+    )
+    stream = StreamingAllan(1e-4, taus)
+    for start in range(0, x32.size, 3000):
+        stream.update(x32[start : start + 3000])
+    np.testing.assert_allclose(stream.result().variance, allan_variance(x32, 1e-4, taus).variance, rtol=1e-9)
+
+    freqs, psd32 = welch_psd(compact["em_pickup"], 1e4, 1024, block_size=3000)
+    _, psd64 = welch_psd(full["em_pickup"], 1e4, 1024)
+    assert psd32.dtype == np.float64
+    np.testing.assert_allclose(psd32, psd64, rtol=1e-4)
+    _, batch = welch_psd_batch(np.stack([compact["detector_counts"]] * 2), 1e-4, nperseg=1024)
+    _, direct = welch_psd(full["detector_counts"], 1e4, 1024)
+    np.testing.assert_allclose(batch[1], direct, rtol=1e-12)
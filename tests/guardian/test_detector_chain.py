@@ -0,0 +1,37 @@
+"""Tests for the photon-arrival level detector chain model."""
+
+import numpy as np
+import pytest
+
+from simulation.background_effects import detection_noise
+
+
+@pytest.mark.parametrize("paralyzable", [False, True])
+def test_dead_time_matches_analytic_rate(paralyzable):
+    model = detection_noise.DetectorModel(
+        dead_time_s=50e-9, paralyzable=paralyzable, dark_cps=500.0
+    )
+    counts = detection_noise.simulate_detector_counts(
+        2_000, 1e-3, 2e6, model, np.random.default_rng(11), chunk_arrivals=50_000
+    )
+    rate = counts.sum() / (counts.size * 1e-3)
+    assert rate == pytest.approx(detection_noise.expected_count_rate(2e6, model), rel=5e-3)
+
+
+def test_afterpulsing_adds_expected_fraction():
+    model = detection_noise.DetectorModel(afterpulse_prob=0.1, afterpulse_delay_s=1e-5)
+    counts = detection_noise.simulate_detector_counts(
+        5_000, 1e-3, 1e5, model, np.random.default_rng(12)
+    )
+    assert counts.mean() == pytest.approx(110.0, rel=0.01)
+    # Afterpulses correlate neighbouring arrivals, pushing the Fano factor above 1.
+    assert counts.var() / counts.mean() > 1.05
+
+
+def test_ideal_detector_is_poissonian():
+    counts = detection_noise.sample_counts(
+        50_000, 200.0, 1.0, np.random.default_rng(13),
+        detector=detection_noise.DetectorModel(),
+    )
+    assert counts.mean() == pytest.approx(0.2, rel=0.03)
+    assert counts.var() == pytest.approx(0.2, rel=0.05)
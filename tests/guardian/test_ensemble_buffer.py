@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from simulation.background_effects_simulator import BackgroundConfig, simulate_background_timeseries
+from simulation.ensemble import EnsembleBuffer, simulate_ensemble
+from simulation.guardian_validators import guardian_check_backgrounds, guardian_check_backgrounds_batch
+
+CHANNELS = ("position", "em_pickup", "surface_drift", "detector_counts")
+
+
+@pytest.mark.parametrize("max_workers", [0, 2])
+def test_workers_fill_shared_slots(max_workers):
+    cfg = BackgroundConfig(em_amp_jitter=0.05)
+    seeds = [11, 12, 13]
+    with EnsembleBuffer.create(len(seeds), 1500) as buffer:
+        simulate_ensemble(buffer, 1e-4, cfg, seeds, max_workers=max_workers)
+        data = buffer.as_data()
+        for i, seed in enumerate(seeds):
+            direct = simulate_background_timeseries(1500, 1e-4, cfg, seed=seed)
+            for name in CHANNELS:
+                np.testing.assert_array_equal(data[name][i], direct[name])
+            assert data["heating_rate"][i] == direct["heating_rate"]
+            assert guardian_check_backgrounds_batch(data)["table"]["guardian_pass"][i] == (
+                guardian_check_backgrounds(direct)["guardian_pass"]
+            )
+        assert data["metadata"]["seeds"] == seeds
+        del data
+
+
+def test_out_arrays_receive_channels_and_compact_slots():
+    cfg = BackgroundConfig(precision="compact")
+    with EnsembleBuffer.create(1, 800, precision="compact") as buffer:
+        slot = buffer.slot(0)
+        data = simulate_background_timeseries(800, 1e-4, cfg, seed=2, out=slot)
+        assert data["em_pickup"] is slot["em_pickup"]
+        assert buffer.arrays["em_pickup"].dtype == np.float32
+        assert buffer.arrays["detector_counts"].dtype == np.int32
+        np.testing.assert_array_equal(
+            slot["detector_counts"], simulate_background_timeseries(800, 1e-4, cfg, seed=2)["detector_counts"]
+        )
+        with pytest.raises(ValueError):
+            simulate_ensemble(buffer, 1e-4, BackgroundConfig(), [1], max_workers=0)
+        del slot, data
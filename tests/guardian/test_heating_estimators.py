@@ -0,0 +1,51 @@
+"""Tests for the fused heating-rate estimators."""
+
+import numpy as np
+
+from simulation.background_effects import heating_estimators, thermal_motion
+
+
+def test_fused_variance_matches_diff_reference():
+    rng = np.random.default_rng(3)
+    x = np.cumsum(rng.normal(size=10_001)) + 1e3
+    ref = np.var(np.diff(x))
+    assert np.isclose(heating_estimators.finite_difference_variance(x, block_size=997), ref)
+    assert np.isclose(
+        thermal_motion.estimate_heating_rate_quanta_s(x, 1e-3), ref / 1e-6
+    )
+
+
+def test_batched_and_streaming_agree_with_reference():
+    rng = np.random.default_rng(4)
+    x = rng.normal(size=(5, 2_000))
+    ref = np.var(np.diff(x, axis=1), axis=1)
+    batched = heating_estimators.finite_difference_variance_batch(x, block_size=300)
+    assert np.allclose(batched, ref)
+
+    acc = heating_estimators.StreamingDifferenceVariance()
+    for block in np.array_split(x[0], 7):
+        acc.update(block)
+    assert np.isclose(acc.variance, ref[0])
+
+
+def test_rolling_trace_matches_windowed_variance():
+    rng = np.random.default_rng(5)
+    x = rng.normal(size=500)
+    trace = heating_estimators.rolling_heating_rate(x, dt_s=1.0, window=50)
+    d = np.diff(x)
+    assert trace.shape == (d.size - 49,)
+    assert np.isclose(trace[10], np.var(d[10:60]))
+
+
+def test_energy_estimator_recovers_linear_heating():
+    dt_s = 1e-6
+    freq_hz = 1e5
+    mass = thermal_motion.m_YB171
+    omega = 2 * np.pi * freq_hz
+    t = np.arange(200_000) * dt_s
+    rate = 5e3  # quanta/s
+    n_t = 10.0 + rate * t
+    amp = np.sqrt(2 * n_t * heating_estimators.HBAR / (mass * omega))
+    x = amp * np.sin(omega * t)
+    est = heating_estimators.energy_heating_rate_quanta_s(x, dt_s, freq_hz, mass)
+    assert np.isclose(est, rate, rtol=0.05)
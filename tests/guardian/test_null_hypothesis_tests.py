@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from simulation.guardian_validators.null_hypothesis_tests import (
+    PoissonHistogram,
+    null_is_consistent,
+    null_is_consistent_batch,
+    poisson_chi2_from_histograms,
+    poisson_p_value,
+    poisson_p_values_batch,
+)
+
+
+@pytest.mark.parametrize("lam", [0.3, 4.0, 150.0])
+def test_pooled_test_has_nominal_size(lam):
+    rng = np.random.default_rng(int(lam * 10))
+    counts = rng.poisson(lam, size=(1000, 1500))
+    p = poisson_p_values_batch(counts)
+    assert 0.03 < np.mean(p < 0.05) < 0.07
+    assert p[7] == poisson_p_value(counts[7])
+
+
+def test_overdispersed_counts_are_rejected():
+    rng = np.random.default_rng(3)
+    counts = rng.negative_binomial(10, 10 / (10 + 50.0), size=(20, 2000))
+    assert not null_is_consistent_batch(counts).any()
+    assert not null_is_consistent(counts[0])
+
+
+def test_pooled_cells_and_degenerate_inputs():
+    hist = np.zeros(40)
+    hist[:4] = [50, 30, 15, 5]  # mean 0.75: only k <= 2 have >= 5 expected
+    statistic, dof = poisson_chi2_from_histograms(hist)
+    assert dof == 1  # cells {0}, {1}, {>=2} minus two
+    assert statistic >= 0
+    assert null_is_consistent(np.zeros(100, dtype=int))
+    assert null_is_consistent(np.array([3]))
+    assert null_is_consistent(np.array([1.0, 2.0, 3.0] * 10))
+    with pytest.raises(ValueError):
+        poisson_p_value(np.array([-1, 2]))
+
+
+def test_float_counts_are_rounded_like_before():
+    rng = np.random.default_rng(5)
+    counts = rng.poisson(6.0, size=3000)
+    noisy = counts + rng.uniform(-0.4, 0.4, size=counts.size)
+    assert poisson_p_value(noisy) == poisson_p_value(counts)
+    assert null_is_consistent(noisy) == null_is_consistent(counts)
+
+
+def test_streaming_histogram_matches_batch():
+    rng = np.random.default_rng(9)
+    counts = rng.poisson(20.0, size=50000)
+    left, right = PoissonHistogram(), PoissonHistogram()
+    for block in np.array_split(counts[:30000], 5):
+        left.update(block)
+    right.update(counts[30000:])
+    merged = left.merge(right)
+    assert merged.n_samples == counts.size
+    assert merged.p_value() == pytest.approx(poisson_p_value(counts), rel=1e-12)
+    assert merged.is_consistent() == null_is_consistent(counts)
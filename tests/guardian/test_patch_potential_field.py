@@ -0,0 +1,65 @@
+"""Tests for the correlated patch-potential field model."""
+
+import numpy as np
+
+from simulation.background_effects import surface_effects
+
+
+def test_ion_potential_is_chunk_invariant_and_has_target_rms():
+    kwargs = dict(
+        n_samples=20_000, dt_s=1e-2, rms_mV=5.0, corr_length_um=50.0, corr_time_s=0.5
+    )
+    a = surface_effects.sample_ion_potential(
+        rng=np.random.default_rng(1), chunk_size=20_000, **kwargs
+    )
+    b = surface_effects.sample_ion_potential(
+        rng=np.random.default_rng(1), chunk_size=777, **kwargs
+    )
+    assert np.allclose(a, b)
+    assert 4.0 < np.std(a) < 6.0
+
+
+def test_field_correlation_length_controls_smoothness():
+    rng = np.random.default_rng(2)
+    smooth = surface_effects.sample_patch_field(1.0, 200.0, rng, pixel_um=10.0)
+    rough = surface_effects.sample_patch_field(1.0, 20.0, rng, pixel_um=10.0)
+
+    def lag1(field):
+        return np.corrcoef(field[:, :-1].ravel(), field[:, 1:].ravel())[0, 1]
+
+    assert lag1(smooth) > lag1(rough)
+
+
+def test_field_modes_relax_towards_independence():
+    field = surface_effects.PatchPotentialField(
+        1.0, 50.0, corr_time_s=1.0, rng=np.random.default_rng(3)
+    )
+    before = field.field()
+    field.advance(1e-3)
+    close = field.field()
+    field.advance(50.0)
+    far = field.field()
+    assert np.corrcoef(before.ravel(), close.ravel())[0, 1] > 0.9
+    assert abs(np.corrcoef(before.ravel(), far.ravel())[0, 1]) < 0.3
+
+
+def _autocorr(x, lag):
+    x = x - x.mean()
+    return float(np.dot(x[:-lag], x[lag:]) / np.dot(x, x))
+
+
+def test_correlation_length_changes_simulated_drift():
+    from simulation.background_effects_simulator import (
+        BackgroundConfig,
+        simulate_background_timeseries,
+    )
+
+    drift = {
+        corr: simulate_background_timeseries(
+            50_000, 1e-2, BackgroundConfig(patch_corr_length_um=corr), seed=4
+        )["surface_drift"]
+        for corr in (50.0, 500.0)
+    }
+    # Longer patches put the variance into slow long-wavelength modes.
+    assert _autocorr(drift[500.0], 50) > _autocorr(drift[50.0], 50) + 0.2
+    assert np.max(np.abs(drift[500.0] - drift[50.0])) > 1.0
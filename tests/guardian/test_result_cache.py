@@ -0,0 +1,60 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from simulation.background_effects_simulator import BackgroundConfig, simulate_background_timeseries
+from simulation.result_cache import (
+    SimulationCache,
+    cache_key,
+    cached_simulate_background_timeseries,
+)
+
+
+def test_cache_hit_matches_direct_simulation(tmp_path):
+    cache = SimulationCache(tmp_path)
+    cfg = BackgroundConfig(mains_hz=60.0, mains_harmonics=(1.0, 0.2))
+    first = cached_simulate_background_timeseries(3000, 1e-4, cfg, seed=7, cache=cache)
+    again = cached_simulate_background_timeseries(3000, 1e-4, cfg, seed=7, cache=cache)
+    direct = simulate_background_timeseries(3000, 1e-4, cfg, seed=7)
+    for name in ("position", "em_pickup", "surface_drift", "detector_counts"):
+        np.testing.assert_array_equal(again[name], direct[name])
+        assert isinstance(again[name], np.memmap) and not again[name].flags.writeable
+    assert again["heating_rate"] == direct["heating_rate"]
+    assert first["metadata"]["config"]["mains_harmonics"] == [1.0, 0.2]
+    assert len(cache.entries()) == 1
+
+
+def test_key_depends_on_every_input():
+    cfg = BackgroundConfig()
+    base = cache_key(100, 1e-4, cfg, 1)
+    assert base == cache_key(100, 1e-4, BackgroundConfig(), 1)
+    assert base != cache_key(101, 1e-4, cfg, 1)
+    assert base != cache_key(100, 1e-4 + 1e-19, cfg, 1)
+    assert base != cache_key(100, 1e-4, cfg, 2)
+    assert base != cache_key(100, 1e-4, BackgroundConfig(patch_corr_time_s=2.0), 1)
+
+
+def test_lru_eviction_and_concurrent_writers(tmp_path):
+    cache = SimulationCache(tmp_path, max_bytes=10**9)
+    data = simulate_background_timeseries(2000, 1e-4, BackgroundConfig(), seed=0)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda _: cache.put("ab" * 32, data), range(8)))
+    assert [entry.name for _, _, entry in cache.entries()] == ["ab" * 32]
+    entry_size = cache.size_bytes()
+
+    cache.put("cd" * 32, data)
+    os.utime(cache._entry_dir("ab" * 32) / "entry.json", (1, 1))  # make it least recently used
+    cache.max_bytes = int(2.5 * entry_size)
+    cache.put("ef" * 32, data)
+    names = sorted(entry.name for _, _, entry in cache.entries())
+    assert names == ["cd" * 32, "ef" * 32]
+    assert cache.get("ab" * 32) is None
+    assert cache.get("cd" * 32) is not None
+
+
+def test_oversized_entry_still_returns_result(tmp_path):
+    cache = SimulationCache(tmp_path, max_bytes=1)
+    data = cached_simulate_background_timeseries(500, 1e-4, BackgroundConfig(), seed=1, cache=cache)
+    assert data["position"].shape == (500,)
+    assert cache.size_bytes() == 0
@@ -25,3 +25,41 @@ def test_run_and_save_generates_plots(tmp_path: Path):
     assert Path(files["allan_png"]).exists()
     # HTML overview generated for quick visualization
     assert Path(files["overview_html"]).exists()
+
+
+def _kwargs(tmp_path: Path):
+    return dict(
+        T=300, rf_rms=0.5, mains=50, em_coupling=1e-3,
+        patch=5, corr=50, cps=200, tint_ms=1.0,
+        n_samples=2000, dt_s=1e-4, seed=3, outdir=str(tmp_path),
+    )
+
+
+def test_render_none_skips_figures(tmp_path: Path):
+    _, files = run_and_save(render="none", **_kwargs(tmp_path))
+    assert Path(files["report"]).exists()
+    assert not list(tmp_path.glob("*.png"))
+    assert "overview_html" not in files
+
+
+def test_deferred_render_queue_renders_later(tmp_path: Path):
+    from scripts.run_background_sim import DeferredRenderQueue, render_pending
+
+    queue = DeferredRenderQueue()
+    _, files = run_and_save(render="summary", render_queue=queue, **_kwargs(tmp_path))
+    assert Path(files["channels"]).is_dir()
+    assert Path(files["render_job"]).exists()
+    assert not Path(files["time_series_png"]).exists()
+
+    rendered = render_pending(str(tmp_path), max_workers=0)
+    assert len(rendered) == 1
+    assert Path(files["time_series_png"]).exists()
+    assert Path(rendered[0]["overview_html"]).exists()
+    assert not Path(files["render_job"]).exists()
+
+
+def test_runs_in_the_same_second_do_not_collide(tmp_path: Path):
+    _, first = run_and_save(render="none", **_kwargs(tmp_path))
+    _, second = run_and_save(render="none", **_kwargs(tmp_path))
+    assert first["report"] != second["report"]
+    assert Path(first["report"]).exists() and Path(second["report"]).exists()
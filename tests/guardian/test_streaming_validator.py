@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from simulation.background_effects_simulator import BackgroundConfig, simulate_background_timeseries
+from simulation.guardian_validators.background_statistics import compute_background_stats
+from simulation.guardian_validators.guardian_background_validator import (
+    StreamingGuardianValidator,
+    guardian_check_backgrounds,
+)
+
+ARRAY_CHANNELS = ("position", "em_pickup", "surface_drift", "detector_counts")
+
+
+def _stream(data, cuts, block_size=1000):
+    validator = StreamingGuardianValidator(block_size=block_size)
+    pieces = {name: np.split(data[name], cuts) for name in ARRAY_CHANNELS}
+    for i in range(len(cuts) + 1):
+        block = {name: pieces[name][i] for name in ARRAY_CHANNELS}
+        if i == 0:
+            block.update(heating_rate=data["heating_rate"], metadata=data["metadata"])
+        validator.update(block)
+    return validator.finalize()
+
+
+def test_streaming_report_is_identical_to_batch():
+    data = simulate_background_timeseries(n_samples=12_345, dt_s=1e-4, cfg=BackgroundConfig(), seed=3)
+    batch = guardian_check_backgrounds(data)
+    assert _stream(data, [1, 999, 1000, 5000, 12_000], block_size=1 << 16) == batch
+
+    stats = compute_background_stats(data, block_size=1000)
+    assert _stream(data, [7, 3001, 3002], block_size=1000) == guardian_check_backgrounds(data, stats=stats)
+
+    data["detector_counts"] = data["detector_counts"].astype(float)
+    assert _stream(data, [4000], block_size=1 << 16) == guardian_check_backgrounds(data)
+
+
+def test_streaming_inventory_and_dtype_checks():
+    validator = StreamingGuardianValidator()
+    validator.update({"em_pickup": np.zeros(10), "surface_drift": np.zeros(10), "detector_counts": np.ones(10, dtype=int)})
+    validator.update({"heating_rate": 0.0})
+    assert validator.finalize()["inventory_ok"] is False
+    with pytest.raises(ValueError):
+        validator.update({"detector_counts": np.ones(3)})
+
+
+def test_streaming_reports_missing_counts_and_heating_as_failures():
+    empty = StreamingGuardianValidator().finalize()
+    assert empty["inventory_ok"] is False
+    assert empty["null_95_ok"] is False and empty["snr_10_ok"] is False
+    assert empty["guardian_pass"] is False
+    assert np.isnan(empty["contributions"]["detector_counts_var"])
+
+    data = simulate_background_timeseries(n_samples=5000, dt_s=1e-4, cfg=BackgroundConfig(), seed=5)
+    no_counts = StreamingGuardianValidator()
+    no_counts.update({name: data[name] for name in ("position", "em_pickup", "surface_drift")})
+    no_counts.update({"heating_rate": data["heating_rate"]})
+    report = no_counts.finalize()
+    assert report["null_95_ok"] is False and report["snr_10_ok"] is False
+
+    no_heating = StreamingGuardianValidator()
+    no_heating.update({name: data[name] for name in ARRAY_CHANNELS})
+    assert no_heating.finalize()["snr_10_ok"] is False
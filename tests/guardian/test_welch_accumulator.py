@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from scipy import signal
+
+from simulation.analysis.spectral import (
+    WelchAccumulator,
+    mains_line_summary,
+    segment_aligned_splits,
+    welch_psd,
+    welch_psd_batch,
+)
+
+
+@pytest.mark.parametrize("nperseg", [256, 255])
+def test_blockwise_welch_matches_scipy(nperseg):
+    rng = np.random.default_rng(4)
+    x = rng.normal(size=(3, 20011)) + 2.0
+    ref_f, ref_psd = signal.welch(x, fs=5e3, nperseg=nperseg)
+    for block_size in (None, 1, 100, 4097):
+        freqs, psd = welch_psd(x, 5e3, nperseg, block_size=block_size)
+        np.testing.assert_array_equal(freqs, ref_f)
+        np.testing.assert_allclose(psd, ref_psd, rtol=1e-12)
+
+
+def test_merged_workers_match_single_pass():
+    rng = np.random.default_rng(8)
+    x = rng.normal(size=30000)
+    _, ref_psd = signal.welch(x, fs=1.0, nperseg=512, noverlap=100)
+    parts = []
+    for start, stop in segment_aligned_splits(x.size, 512, 4, noverlap=100):
+        acc = WelchAccumulator(1.0, 512, noverlap=100)
+        acc.update(x[start:stop])
+        parts.append(acc)
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    np.testing.assert_allclose(merged.result()[1], ref_psd, rtol=1e-12)
+
+    with pytest.raises(ValueError):
+        merged.merge(WelchAccumulator(1.0, 256))
+    with pytest.raises(ValueError):
+        WelchAccumulator(1.0, 64).result()
+
+
+def test_batched_psd_and_mains_summary():
+    rng = np.random.default_rng(1)
+    dt = 1e-4
+    t = np.arange(20000) * dt
+    amps = np.array([0.0, 0.5, 1.0])
+    traces = 0.1 * rng.normal(size=(3, t.size)) + amps[:, None] * np.sin(2 * np.pi * 50.0 * t)
+    freqs, psd = welch_psd_batch(traces, dt, nperseg=4096, max_chunk_bytes=1)
+    _, ref = signal.welch(traces[2], fs=1.0 / dt, nperseg=4096)
+    np.testing.assert_allclose(psd[2], ref, rtol=1e-12)
+    assert psd.shape == (3, freqs.size)
+
+    line_power, floor = mains_line_summary(freqs, psd, 50.0, n_harmonics=2)
+    np.testing.assert_allclose(line_power[:, 0], amps**2 / 2, atol=2e-3, rtol=0.05)
+    np.testing.assert_allclose(floor, 2 * 0.1**2 * dt, rtol=0.15)
+    assert line_power.shape == (3, 2)
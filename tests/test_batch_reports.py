@@ -0,0 +1,47 @@
+"""Tests for batch report generation."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts import batch_reports as br
+from scripts import generate_report as gr
+
+
+def test_expand_jobs_is_a_cartesian_product():
+    jobs = br.expand_jobs(["default", "mains60"], [1, 2], [{}, {"cps": 300.0}])
+    assert len(jobs) == 8
+    assert len({job.label for job in jobs}) == 8
+    with pytest.raises(ValueError):
+        br.expand_jobs(["nope"], [1])
+
+
+@pytest.mark.parametrize("max_workers", [0, 2])
+def test_batch_writes_unique_reports_and_index(tmp_path: Path, monkeypatch, max_workers):
+    calls = []
+    real_git_state = gr._git_state
+    monkeypatch.setattr(gr, "_git_state", lambda repo: calls.append(repo) or real_git_state(repo))
+    jobs = br.expand_jobs(["default", "mains60"], [3], [{"n_samples": 2000}, {"n_samples": 2000, "cps": 0.0}])
+    index_path = br.run_batch(jobs, tmp_path, max_workers=max_workers, results_format="none")
+    assert len(calls) == 1
+
+    index = json.loads(index_path.read_text(encoding="utf-8"))
+    assert index["n_reports"] == 4 and index["n_failed"] == 0
+    dirs = {entry["report_dir"] for entry in index["reports"]}
+    assert len(dirs) == 4
+    for entry in index["reports"]:
+        report_dir = Path(entry["report_dir"])
+        assert report_dir.name.endswith(entry["label"])
+        metadata = json.loads((report_dir / "metadata.json").read_text(encoding="utf-8"))
+        assert metadata["seeds"] == {"experimental": entry["seed"], "null": entry["seed"] + 1}
+        assert metadata["params"]["n_samples"] == 2000
+        assert metadata["git"]["sha"] == index["git"]["sha"]
+        assert (report_dir / "report.pdf").exists()
+    variant = next(entry for entry in index["reports"] if entry["variant"] == 1)
+    assert json.loads((Path(variant["report_dir"]) / "metadata.json").read_text())["params"]["cps"] == 0.0
@@ -0,0 +1,47 @@
+"""Startup budget for the report and simulation CLIs.
+
+The entry points are invoked thousands of times by cron and CI jobs, so
+importing them and printing ``--help`` must not load plotting or statistics
+stacks that only the actual run needs.
+"""
+
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS = ("generate_report", "run_background_sim", "batch_reports")
+HEAVY_MODULES = ("matplotlib", "scipy.stats", "scipy.signal", "pandas")
+# About ten times the measured --help time of ~0.2 s, to stay robust on busy CI runners.
+STARTUP_BUDGET_S = 2.0
+
+
+@pytest.mark.parametrize("script", SCRIPTS)
+def test_import_does_not_load_heavy_modules(script):
+    code = (
+        f"import json, sys; import scripts.{script}; "
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    assert json.loads(out) == []
+
+
+@pytest.mark.parametrize("script", SCRIPTS)
+def test_help_fits_startup_budget(script):
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, str(ROOT / "scripts" / f"{script}.py"), "--help"],
+            cwd=ROOT,
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+        timings.append(time.perf_counter() - start)
+    assert min(timings) < STARTUP_BUDGET_S
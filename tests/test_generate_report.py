@@ -0,0 +1,74 @@
+"""End-to-end tests for the Guardian report generator."""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts import generate_report as gr
+from scripts.results_io import LazyResults, open_report_results
+
+
+def _run(tmp_path: Path, *extra: str) -> Path:
+    args = gr._build_parser().parse_args(
+        ["--n_samples", "2000", "--outdir", str(tmp_path), "--results_format", "none", *extra]
+    )
+    return gr.generate_report(args)
+
+
+def test_report_arrays_are_lazily_loadable(tmp_path: Path):
+    report_dir = _run(tmp_path)
+    summary = json.loads((report_dir / "summary.json").read_text(encoding="utf-8"))
+    assert summary["report_dir"] == str(report_dir)
+
+    results = open_report_results(report_dir)
+    assert isinstance(results, LazyResults)
+    with np.load(report_dir / "results.npz") as npz:
+        assert sorted(results.files) == sorted(npz.files)
+        assert np.array_equal(results["experimental_counts"], npz["experimental_counts"])
+
+
+def test_report_figures_render_in_process(tmp_path: Path):
+    report_dir = _run(tmp_path, "--render_workers", "0")
+    for name in ("detector_time_series.png", "detector_psd.png", "detector_allan.png", "report.pdf"):
+        assert (report_dir / name).stat().st_size > 0
+
+
+def test_summary_reports_mains_line_power(tmp_path: Path):
+    summary = json.loads((_run(tmp_path) / "summary.json").read_text(encoding="utf-8"))
+    for label in ("experimental", "null"):
+        spectral = summary["spectral"][label]
+        assert len(spectral["mains_line_power"]) == 3
+        assert spectral["broadband_floor_per_hz"] > 0
+
+
+def test_cached_rerun_reproduces_results(tmp_path: Path):
+    cache_dir = tmp_path / "cache"
+    first = _run(tmp_path / "a", "--cache_dir", str(cache_dir))
+    second = _run(tmp_path / "b", "--cache_dir", str(cache_dir))
+    assert any(cache_dir.rglob("entry.json"))
+    with np.load(first / "results.npz") as a, np.load(second / "results.npz") as b:
+        for key in a.files:
+            assert np.array_equal(a[key], b[key])
+
+
+def test_columnar_results_copy_is_opt_in():
+    assert gr._build_parser().parse_args([]).results_format == "none"
+
+
+def _reject_constant(name: str):
+    raise ValueError(f"non-standard JSON constant {name}")
+
+
+def test_summary_is_strict_json_when_harmonics_exceed_nyquist(tmp_path: Path):
+    # dt = 1e-4 s puts Nyquist at 5 kHz, so the third harmonic of 2 kHz is above it.
+    report_dir = _run(tmp_path, "--mains", "2000")
+    text = (report_dir / "summary.json").read_text(encoding="utf-8")
+    summary = json.loads(text, parse_constant=_reject_constant)
+    for label in ("experimental", "null"):
+        assert summary["spectral"][label]["mains_line_power"][2] is None
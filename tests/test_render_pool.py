@@ -0,0 +1,48 @@
+"""Tests for envelope decimation and the shared-memory figure pool."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.render_pool import FigureTask, minmax_envelope, render_tasks
+
+
+def _write_stats(path: Path, values: np.ndarray, scale: float = 1.0) -> None:
+    path.write_text(f"{values.size} {values.min() * scale} {values.max() * scale}", encoding="utf-8")
+
+
+def test_minmax_envelope_preserves_extremes_per_bin():
+    rng = np.random.default_rng(3)
+    n = 1_000_003
+    x = np.arange(n) * 1e-4
+    y = rng.normal(size=n)
+    y[777_777] = 50.0
+    xd, yd = minmax_envelope(x, y, max_points=1000)
+    assert yd.size <= 1002 and xd.size == yd.size
+    assert yd.max() == y.max() and yd.min() == y.min()
+    assert np.all(np.diff(xd) >= 0)
+    assert xd[0] == x[0]
+
+    head = y[:100]
+    assert minmax_envelope(x[:100], head, max_points=1000)[1] is head
+
+
+def test_render_tasks_pool_matches_in_process(tmp_path: Path):
+    arrays = {"a": np.arange(10.0), "b": np.linspace(-1.0, 1.0, 7).astype(np.float32)}
+    for workers in (0, 2):
+        out = tmp_path / f"w{workers}"
+        out.mkdir()
+        tasks = [
+            FigureTask(_write_stats, out / "a.txt", arrays={"values": "a"}),
+            FigureTask(_write_stats, out / "b.txt", arrays={"values": "b"}, kwargs={"scale": 2.0}),
+        ]
+        written = render_tasks(tasks, arrays, max_workers=workers)
+        assert written == [str(out / "a.txt"), str(out / "b.txt")]
+    for name in ("a.txt", "b.txt"):
+        assert (tmp_path / "w0" / name).read_text() == (tmp_path / "w2" / name).read_text()
+    assert (tmp_path / "w2" / "b.txt").read_text() == "7 -2.0 2.0"
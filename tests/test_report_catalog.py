@@ -0,0 +1,106 @@
+"""Tests for the SQLite report catalogue and catalogue-backed validation."""
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts import generate_report as gr
+from scripts import validate_statistics as vs
+from scripts.report_catalog import CATALOG_NAME, ReportCatalog
+
+
+def _fake_report(root: Path, name: str, preset: str, passing: bool) -> Path:
+    report_dir = root / name
+    report_dir.mkdir(parents=True)
+    metadata = {
+        "timestamp": name[:15],
+        "preset": preset,
+        "params": {"cps": 200.0},
+        "git": {"sha": "abc", "short": "abc", "clean": True},
+        "seeds": {"experimental": 1, "null": 2},
+    }
+    guardian = {
+        "null_control_present": True,
+        "metrics": {
+            "null": {"p_value": 0.5 if passing else 0.01, "pass": passing},
+            "effect": {"p_value": 1e-6, "pass": True, "effect_claimed": True, "cohens_d": 1.0},
+            "snr": {"value": 20.0, "pass": True},
+        },
+    }
+    (report_dir / "metadata.json").write_text(json.dumps(metadata), encoding="utf-8")
+    (report_dir / "guardian.json").write_text(json.dumps(guardian), encoding="utf-8")
+    return report_dir
+
+
+def _fake_tree(root: Path):
+    return (
+        _fake_report(root, "20250101_000000_abc", "default", True),
+        _fake_report(root, "20250102_000000_abc", "mains60", True),
+        _fake_report(root, "20250103_000000_abc", "default", False),
+    )
+
+
+def test_generate_report_records_catalogue_entry(tmp_path: Path):
+    args = gr._build_parser().parse_args(
+        ["--n_samples", "2000", "--outdir", str(tmp_path), "--results_format", "none", "--render_workers", "0"]
+    )
+    report_dir = gr.generate_report(args)
+    with ReportCatalog(tmp_path) as catalog:
+        (row,) = catalog.query()
+        assert row["path"] == report_dir
+        assert row["preset"] == "default"
+        assert row["seed"] == 42
+    assert CATALOG_NAME not in (report_dir / "sha256sum.txt").read_text(encoding="utf-8")
+    assert vs._find_latest_report(tmp_path) == report_dir
+
+
+def test_indexed_queries(tmp_path: Path):
+    first, second, third = _fake_tree(tmp_path)
+    with ReportCatalog(tmp_path) as catalog:
+        assert catalog.rebuild() == 3
+        assert catalog.latest() == third
+        assert catalog.latest(passed=True) == second
+        assert [row["path"] for row in catalog.query(preset="default")] == [third, first]
+        assert catalog.query(preset="default", passed=True)[0]["p_null"] == 0.5
+
+
+def test_validation_uses_catalogue_when_present(tmp_path: Path):
+    first, second, third = _fake_tree(tmp_path)
+    assert vs._find_latest_report(tmp_path) == third
+    assert vs._find_latest_report(tmp_path, preset="mains60") == second
+    assert vs._validate_all(tmp_path) == 1
+    assert vs._validate_all(tmp_path, preset="mains60") == 0
+
+    # The first catalogued report backfills every older folder, failing ones included.
+    with ReportCatalog(tmp_path) as catalog:
+        metadata = json.loads((first / "metadata.json").read_text(encoding="utf-8"))
+        guardian = json.loads((first / "guardian.json").read_text(encoding="utf-8"))
+        catalog.add(first, metadata, guardian)
+    assert vs._find_reports(tmp_path) == [first, second, third]
+    assert vs._find_latest_report(tmp_path) == third
+    assert vs._validate_all(tmp_path) == 1
+
+    # Once the catalogue exists, queries no longer scan the folders.
+    late = _fake_report(tmp_path, "20250104_000000_abc", "default", True)
+    assert vs._find_latest_report(tmp_path) == third
+    with ReportCatalog(tmp_path) as catalog:
+        assert catalog.rebuild() == 4
+    assert vs._find_latest_report(tmp_path) == late
+
+
+def test_deleted_report_folders_are_skipped_and_pruned(tmp_path: Path):
+    first, second, third = _fake_tree(tmp_path)
+    with ReportCatalog(tmp_path) as catalog:
+        assert catalog.latest() == third
+    shutil.rmtree(third)
+    assert vs._find_latest_report(tmp_path) == second
+    assert vs._validate_all(tmp_path) == 0
+    with ReportCatalog(tmp_path) as catalog:
+        assert [row["path"] for row in catalog.query()] == [second, first]
+        count = catalog._conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+    assert count == 2
@@ -0,0 +1,78 @@
+"""Tests for the columnar results writer."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts import results_io
+
+
+def _columns():
+    rng = np.random.default_rng(0)
+    return {
+        "time_s": np.arange(1000) * 1e-4,
+        "experimental_counts": rng.poisson(3.0, size=1000).astype(float),
+        "null_counts": rng.poisson(3.0, size=1000).astype(float),
+    }
+
+
+def test_npy_layout_prunes_and_memory_maps(tmp_path: Path):
+    cols = _columns()
+    path = results_io.write_results(tmp_path / "results", cols, {"preset": "default"}, fmt="npy")
+    assert path.is_dir()
+    loaded = results_io.read_results(path, columns=["experimental_counts"])
+    assert list(loaded) == ["experimental_counts"]
+    assert isinstance(loaded["experimental_counts"], np.memmap)
+    assert np.array_equal(loaded["experimental_counts"], cols["experimental_counts"])
+    assert results_io.read_metadata(path) == {"preset": "default"}
+    assert set(results_io.read_schema(path)) == set(cols)
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_arrow_layouts_round_trip(tmp_path: Path, fmt: str):
+    pytest.importorskip("pyarrow")
+    cols = _columns()
+    path = results_io.write_results(tmp_path / "results", cols, {"seed": 1}, fmt=fmt)
+    assert path.suffix == f".{fmt}"
+    loaded = results_io.read_results(path, columns=["null_counts", "time_s"])
+    assert set(loaded) == {"null_counts", "time_s"}
+    assert np.array_equal(loaded["null_counts"], cols["null_counts"])
+    assert results_io.read_metadata(path) == {"seed": 1}
+    assert results_io.read_schema(path)["time_s"] == "<f8"
+
+
+def test_rewriting_npy_results_drops_stale_columns(tmp_path: Path):
+    base = tmp_path / "results"
+    results_io.write_results(base, _columns(), fmt="npy")
+    subset = {"time_s": np.arange(10) * 1.0}
+    path = results_io.write_results(base, subset, fmt="npy")
+    assert sorted(p.name for p in path.iterdir()) == ["_metadata.json", "time_s.npy"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["results"]
+    assert np.array_equal(results_io.read_results(path)["time_s"], subset["time_s"])
+
+
+def test_mismatched_column_lengths_rejected(tmp_path: Path):
+    with pytest.raises(ValueError):
+        results_io.write_results(
+            tmp_path / "bad", {"a": np.zeros(3), "b": np.zeros(4)}, fmt="npy"
+        )
+
+
+def test_lazy_results_open_arrays_on_demand(tmp_path: Path):
+    cols = _columns()
+    path = results_io.write_results(tmp_path / results_io.NPY_DIRNAME, cols, fmt="npy")
+    with results_io.LazyResults(path) as lazy:
+        assert sorted(lazy.files) == sorted(cols)
+        assert lazy._arrays == {}
+        counts = lazy["null_counts"]
+        assert isinstance(counts, np.memmap)
+        assert list(lazy._arrays) == ["null_counts"]
+        assert np.array_equal(counts, cols["null_counts"])
+        with pytest.raises(KeyError):
+            lazy["missing"]
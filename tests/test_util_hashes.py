@@ -0,0 +1,79 @@
+"""Tests for the parallel, incremental SHA-256 manifest helper."""
+
+import hashlib
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts import util_hashes as uh
+
+
+def _tree(root: Path) -> None:
+    (root / "sub").mkdir()
+    (root / "a.bin").write_bytes(os.urandom(3 * uh.DEFAULT_CHUNK_SIZE // 2))
+    (root / "sub" / "b.txt").write_text("hello\n", encoding="utf-8")
+    (root / "empty").write_bytes(b"")
+
+
+def _age(path: Path, seconds: float = 10.0) -> None:
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - int(seconds * 1e9)))
+
+
+def test_manifest_matches_hashlib_and_leaves_tree_untouched(tmp_path: Path):
+    _tree(tmp_path)
+    manifest = uh.write_manifest(tmp_path, max_workers=4)
+    lines = manifest.read_text(encoding="utf-8").splitlines()
+    expected = [
+        f"{hashlib.sha256((tmp_path / rel).read_bytes()).hexdigest()}  {rel}"
+        for rel in ("a.bin", "empty", "sub/b.txt")
+    ]
+    assert lines == expected
+    assert uh.verify_manifest(manifest)
+    # The index is opt-in: plain write and verify never add files to the tree.
+    assert not (tmp_path / uh.INDEX_NAME).exists()
+    assert uh.verify_manifest(manifest, fast=True)
+    assert (tmp_path / uh.INDEX_NAME).exists()
+    assert uh.INDEX_NAME not in manifest.read_text(encoding="utf-8")
+
+
+def test_unchanged_files_are_not_rehashed(tmp_path: Path, monkeypatch):
+    _tree(tmp_path)
+    for path in uh.iter_files(tmp_path):
+        _age(path)
+    manifest = uh.write_manifest(tmp_path, use_index=True)
+
+    hashed = []
+    real = uh.sha256_file
+    monkeypatch.setattr(uh, "sha256_file", lambda path, *a: hashed.append(path.name) or real(path, *a))
+    uh.write_manifest(tmp_path, use_index=True)
+    assert hashed == []
+    assert uh.verify_manifest(manifest, fast=True)
+    assert hashed == []
+
+    (tmp_path / "sub" / "b.txt").write_text("changed\n", encoding="utf-8")
+    assert not uh.verify_manifest(manifest, fast=True)
+    assert hashed == ["b.txt"]
+    assert not uh.verify_manifest(manifest)
+
+
+def test_fast_verify_rehashes_files_as_new_as_the_index(tmp_path: Path):
+    _tree(tmp_path)
+    manifest = uh.write_manifest(tmp_path, use_index=True)
+    written_ns = uh.HashIndex(tmp_path / uh.INDEX_NAME)._written_ns
+    target = tmp_path / "sub" / "b.txt"
+    # A same-size rewrite within the index's timestamp tick keeps size and inode.
+    target.write_text("HELLO\n", encoding="utf-8")
+    os.utime(target, ns=(written_ns, written_ns))
+    assert not uh.verify_manifest(manifest, fast=True)
+
+
+def test_missing_file_fails_verification(tmp_path: Path):
+    _tree(tmp_path)
+    manifest = uh.write_manifest(tmp_path)
+    (tmp_path / "empty").unlink()
+    assert not uh.verify_manifest(manifest, fast=True)